@@ -13,4 +13,10 @@
 """qiskit-neko integration test suite."""
 
 
-from qiskit_neko.version import __version__ as __version__
+def __getattr__(name):
+    # Resolve the version lazily to avoid running git subprocesses on import
+    if name == "__version__":
+        from qiskit_neko import version
+
+        return version.__version__
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
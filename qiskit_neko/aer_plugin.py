@@ -12,54 +12,244 @@
 
 """Qiskit Aer default backend plugin."""
 
+import importlib.metadata
+import logging
+import os
+
 from qiskit_neko import backend_plugin
+from qiskit_neko import cache
+from qiskit_neko import thread_budget
+
+LOG = logging.getLogger(__name__)
+
+FAKE_BACKEND_INDEX_FILENAME = "aer_plugin_fake_backends.json"
+
+# AerSimulator accepts any precision but only runs with these
+AER_PRECISIONS = ("single", "double")
+
+
+def _runtime_version():
+    try:
+        return importlib.metadata.version("qiskit-ibm-runtime")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def _build_fake_backend_index():
+    """Build a mapping of fake backend names to class names in qiskit-ibm-runtime."""
+    from qiskit_ibm_runtime import fake_provider
+    from qiskit_ibm_runtime.fake_provider.fake_backend import FakeBackendV2
+
+    index = {}
+    for class_name, obj in vars(fake_provider).items():
+        if isinstance(obj, type) and issubclass(obj, FakeBackendV2):
+            backend_name = getattr(obj, "backend_name", None)
+            if backend_name:
+                index[backend_name] = class_name
+    return index
+
+
+def _coerce_option(value):
+    lowered = value.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    if lowered in ("none", "null"):
+        return None
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except ValueError:
+            pass
+    return value
+
+
+def parse_selection(backend_selection):
+    """Split an Aer plugin selection string into a fake backend name and options.
+
+    :param str backend_selection: A selection string of the form
+        ``fake_backend``, ``key=value[,key=value...]`` or
+        ``fake_backend+key=value[,key=value...]``. Values of ``true`` and
+        ``false`` are converted to booleans, ``none`` and ``null`` to
+        ``None`` and numbers to integers or floats, other values are strings.
+    :returns: A tuple of the fake backend name (or ``None``) and a dictionary
+        of simulator options
+    :rtype: tuple
+    :raises ValueError: If an option isn't of the form ``key=value``
+    """
+    if not backend_selection:
+        return None, {}
+    if "+" in backend_selection:
+        backend_name, _, option_string = backend_selection.partition("+")
+    elif "=" in backend_selection:
+        backend_name, option_string = None, backend_selection
+    else:
+        return backend_selection, {}
+    options = {}
+    for item in filter(None, option_string.split(",")):
+        key, sep, value = item.partition("=")
+        key = key.strip()
+        if not sep or not key:
+            raise ValueError(f"Invalid option {item!r} in selection string {backend_selection}.")
+        options[key] = _coerce_option(value.strip())
+    return backend_name or None, options
+
+
+def _check_type(value, default):
+    if isinstance(default, bool) or isinstance(value, bool):
+        return isinstance(value, bool) and isinstance(default, bool)
+    if isinstance(default, float):
+        return isinstance(value, (int, float))
+    return isinstance(value, type(default))
+
+
+def validate_options(simulator, options):
+    """Check the values of options set on an Aer simulator.
+
+    :class:`~qiskit_aer.AerSimulator` rejects unknown options and methods but
+    only fails on most invalid values when circuits are run, so the options
+    are checked here instead: values must have the type of the option's
+    default value (if it has one which isn't ``None``) and ``method``,
+    ``device`` and ``precision`` must be ones the simulator supports.
+
+    :param AerSimulator simulator: The simulator the options were set on
+    :param dict options: The options to check
+    :raises ValueError: If an option has an invalid value
+    """
+    defaults = type(simulator)._default_options()  # pylint: disable=protected-access
+    allowed = {
+        "method": simulator.available_methods(),
+        "device": simulator.available_devices(),
+        "precision": AER_PRECISIONS,
+    }
+    for key, value in options.items():
+        if key in allowed and value not in allowed[key]:
+            raise ValueError(
+                f"Invalid value {value!r} for option {key}, valid values are {list(allowed[key])}."
+            )
+        default = getattr(defaults, key, None)
+        if default is not None and not _check_type(value, default):
+            raise ValueError(
+                f"Invalid value {value!r} for option {key}, "
+                f"expected a {type(default).__name__}."
+            )
 
 
 class AerBackendPlugin(backend_plugin.BackendPlugin):
-    """A backend plugin for using qiskit-aer as the backend."""
+    """A backend plugin for using qiskit-aer as the backend.
+
+    The names of the fake backends available from ``qiskit-ibm-runtime`` are
+    stored in an index file in the qiskit-neko cache directory (see
+    :func:`qiskit_neko.cache.get_cache_dir`) which is rebuilt whenever the
+    installed version of ``qiskit-ibm-runtime`` changes. This avoids having to
+    load every fake backend just to find their names, and only the selected
+    fake backend is constructed by :meth:`get_backend`.
+
+    When the number of test worker processes is known (see
+    :mod:`qiskit_neko.thread_budget`) the returned backends are limited to
+    their worker's share of the CPUs with the ``max_parallel_*`` options.
+    """
 
     def __init__(self):
-        try:
+        super().__init__()
+        self._fake_backend_index = None
+        self._mock_provider = None
+
+    @property
+    def mock_provider(self):
+        """The ``FakeProviderForBackendV2`` from ``qiskit-ibm-runtime`` if installed."""
+        if self._mock_provider is None and _runtime_version() is not None:
             from qiskit_ibm_runtime.fake_provider import FakeProviderForBackendV2
-        except ImportError:
-            FakeProviderForBackendV2 = None
 
-        super().__init__()
-        if FakeProviderForBackendV2 is not None:
-            self.mock_provider = FakeProviderForBackendV2()
-            self.mock_provider_backend_names = set()
-            for backend in self.mock_provider.backends():
-                if backend.version == 1:
-                    self.mock_provider_backend_names.add(backend.name())
-                elif backend.version == 2:
-                    self.mock_provider_backend_names.add(backend.name)
-        else:
-            self.mock_provider = None
+            self._mock_provider = FakeProviderForBackendV2()
+        return self._mock_provider
+
+    @property
+    def mock_provider_backend_names(self):
+        """The set of fake backend names which can be used as a selection string."""
+        return set(self._get_fake_backend_index())
+
+    def _get_fake_backend_index(self, refresh=False):
+        if self._fake_backend_index is not None and not refresh:
+            return self._fake_backend_index
+        version = _runtime_version()
+        if version is None:
+            self._fake_backend_index = {}
+            return self._fake_backend_index
+        try:
+            index_path = os.path.join(cache.get_cache_dir(), FAKE_BACKEND_INDEX_FILENAME)
+        except OSError as err:
+            LOG.warning("Unable to use cache directory for fake backend index: %s", err)
+            index_path = None
+        cached = cache.read_json(index_path) if index_path and not refresh else None
+        if isinstance(cached, dict) and cached.get("qiskit_ibm_runtime_version") == version:
+            self._fake_backend_index = cached["backends"]
+            return self._fake_backend_index
+        self._fake_backend_index = _build_fake_backend_index()
+        if index_path:
+            try:
+                cache.write_json(
+                    index_path,
+                    {
+                        "qiskit_ibm_runtime_version": version,
+                        "backends": self._fake_backend_index,
+                    },
+                )
+            except OSError as err:
+                LOG.warning("Unable to write fake backend index %s: %s", index_path, err)
+        return self._fake_backend_index
+
+    def _get_fake_backend(self, backend_name):
+        from qiskit_ibm_runtime import fake_provider
+
+        backend_class = getattr(fake_provider, self._fake_backend_index[backend_name], None)
+        if backend_class is None:
+            # The cached index is stale, rebuild it and try again
+            index = self._get_fake_backend_index(refresh=True)
+            if backend_name not in index:
+                raise ValueError(f"Invalid selection string {backend_name}.")
+            backend_class = getattr(fake_provider, index[backend_name])
+        return backend_class()
 
     def get_backend(self, backend_selection=None):
         """Return the Backend object to run tests on.
 
         :param str backend_selection: An optional selection string to specify
             the backend object returned from this method. This can be used
-            in two different ways. Either it can be used to specify a fake
-            backend name from ``qiskit.test.mock`` in ``qiskit-terra`` such
-            as ``fake_quito`` which will return that fake backend object or
-            alternatively if the string starts with ``method=`` an ideal
-            :class:`~qiskit.providers.aer.AerSimulator` object with that method
-            will be set. If this is not specified a
-            :class:`~qiskit.providers.aer.AerSimulator` will be returned with
-            the defailt settings.
+            in three different ways. It can be a fake backend name from
+            ``qiskit_ibm_runtime.fake_provider`` such as ``fake_quito``
+            which will return that fake backend object, a comma separated
+            list of :class:`~qiskit_aer.AerSimulator` options such as
+            ``method=matrix_product_state,precision=single,max_memory_mb=4096``
+            which will return an ideal simulator with those options, or a
+            fake backend name and options joined by ``+`` such as
+            ``fake_sherbrooke+method=density_matrix`` which will return a
+            simulator with the fake backend's target and noise model (from
+            :meth:`~qiskit_aer.AerSimulator.from_backend`) and those options.
+            See :func:`parse_selection` for how option values are converted
+            and :func:`validate_options` for how they're checked.
+            If this is not specified a :class:`~qiskit_aer.AerSimulator` will
+            be returned with the default settings.
         :raises ValueError: If an invalid backend selection string is passed in
         """
+        backend = self._get_backend(backend_selection)
+        thread_budget.apply_to_backend(backend, thread_budget.worker_threads())
+        return backend
+
+    def _get_backend(self, backend_selection):
         import qiskit_aer as aer
 
-        if backend_selection is None:
-            return aer.AerSimulator()
-        if backend_selection.startswith("method="):
-            method = backend_selection.split("=")[1]
-            return aer.AerSimulator(method=method)
-        if backend_selection in self.mock_provider_backend_names:
-            if self.mock_provider is None:
-                raise ValueError(f"Invalid selection string {backend_selection}.")
-            return self.mock_provider.backend(backend_selection)
-        raise ValueError(f"Invalid selection string {backend_selection}.")
+        backend_name, options = parse_selection(backend_selection)
+        if backend_name is not None and backend_name not in self._get_fake_backend_index():
+            raise ValueError(f"Invalid selection string {backend_selection}.")
+        backend = self._get_fake_backend(backend_name) if backend_name is not None else None
+        if backend is not None and not options:
+            return backend
+        try:
+            if backend is None:
+                simulator = aer.AerSimulator(**options)
+            else:
+                simulator = aer.AerSimulator.from_backend(backend, **options)
+            validate_options(simulator, options)
+        except (aer.AerError, ValueError) as err:
+            raise ValueError(f"Invalid selection string {backend_selection}: {err}") from err
+        return simulator
@@ -0,0 +1,205 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Concurrent job submission and result polling with asyncio."""
+
+import asyncio
+import concurrent.futures
+import dataclasses
+import functools
+import logging
+import time
+
+LOG = logging.getLogger(__name__)
+
+# Job status names are used instead of importing qiskit's JobStatus enum so
+# this works with any provider's status objects that have a matching ``name``
+QUEUED_STATUSES = frozenset({"INITIALIZING", "QUEUED", "VALIDATING"})
+FINAL_STATUSES = frozenset({"DONE", "CANCELLED", "ERROR"})
+
+
+@dataclasses.dataclass
+class PollingConfig:
+    """Settings for polling the status of a job.
+
+    :param float interval: The initial time in seconds between status checks
+    :param float max_interval: The maximum time in seconds between status checks
+    :param float backoff: The factor the interval is multiplied by after each
+        status check until it reaches ``max_interval``
+    :param float timeout: An optional maximum time in seconds to wait for a job
+        to finish
+    """
+
+    interval: float = 0.05
+    max_interval: float = 5.0
+    backoff: float = 1.5
+    timeout: float = None
+
+
+@dataclasses.dataclass
+class JobTiming:
+    """The time spent in each phase of a job's execution.
+
+    The queue and execution times are measured by polling the job status so
+    their resolution is limited by the polling interval. If a job is never
+    observed in the ``RUNNING`` state the execution time is reported as 0.
+
+    :param float submit_time: Seconds spent in ``backend.run()``
+    :param float queue_time: Seconds between submission and the job being
+        observed as running
+    :param float execution_time: Seconds between the job being observed as
+        running and being observed in a final state
+    :param float result_time: Seconds spent in ``job.result()`` once the job
+        finished
+    """
+
+    submit_time: float = 0.0
+    queue_time: float = 0.0
+    execution_time: float = 0.0
+    result_time: float = 0.0
+
+    @property
+    def total_time(self):
+        """The total time in seconds for the job."""
+        return self.submit_time + self.queue_time + self.execution_time + self.result_time
+
+
+@dataclasses.dataclass
+class JobOutcome:
+    """The outcome of a job submitted with :func:`submit_and_wait`.
+
+    :param job: The job object returned by ``backend.run()``
+    :param result: The :class:`~qiskit.result.Result` of the job
+    :param JobTiming timing: The timing of the job
+    """
+
+    job: object
+    result: object
+    timing: JobTiming
+
+
+async def wait_for_job(job, polling=None, executor=None, submitted_at=None):
+    """Wait for a job to finish and return its result.
+
+    :param job: The job to wait for
+    :param PollingConfig polling: The polling settings to use
+    :param executor: The executor to run blocking job methods in, if not set the
+        event loop's default executor is used
+    :param float submitted_at: The :func:`time.monotonic` time the job was
+        submitted at, defaults to now
+    :returns: A tuple of the job's result and a :class:`JobTiming`
+    :raises TimeoutError: If the job doesn't finish within ``polling.timeout``
+    """
+    polling = polling or PollingConfig()
+    loop = asyncio.get_running_loop()
+    start = submitted_at if submitted_at is not None else time.monotonic()
+    running_at = None
+    interval = polling.interval
+    while True:
+        status = await loop.run_in_executor(executor, job.status)
+        now = time.monotonic()
+        name = getattr(status, "name", str(status))
+        if running_at is None and name not in QUEUED_STATUSES:
+            running_at = now
+        if name in FINAL_STATUSES:
+            break
+        if polling.timeout is not None and now - start > polling.timeout:
+            raise TimeoutError(f"Job {job.job_id()} did not finish in {polling.timeout} seconds")
+        await asyncio.sleep(interval)
+        interval = min(interval * polling.backoff, polling.max_interval)
+    result = await loop.run_in_executor(executor, job.result)
+    timing = JobTiming(
+        queue_time=running_at - start,
+        execution_time=now - running_at,
+        result_time=time.monotonic() - now,
+    )
+    return result, timing
+
+
+async def submit_and_wait(backend, circuits, polling=None, executor=None, **run_kwargs):
+    """Submit circuits to a backend and wait for the result.
+
+    :param backend: The backend to run the circuits on
+    :param circuits: The circuit or list of circuits to run
+    :param PollingConfig polling: The polling settings to use
+    :param executor: The executor to run blocking calls in
+    :param run_kwargs: Keyword arguments to pass to ``backend.run()``
+    :rtype: JobOutcome
+    """
+    loop = asyncio.get_running_loop()
+    start = time.monotonic()
+    job = await loop.run_in_executor(
+        executor, functools.partial(backend.run, circuits, **run_kwargs)
+    )
+    submitted_at = time.monotonic()
+    result, timing = await wait_for_job(
+        job, polling=polling, executor=executor, submitted_at=submitted_at
+    )
+    timing.submit_time = submitted_at - start
+    LOG.debug(
+        "Job %s finished: submit %.3fs, queue %.3fs, execution %.3fs, result %.3fs",
+        job.job_id(),
+        timing.submit_time,
+        timing.queue_time,
+        timing.execution_time,
+        timing.result_time,
+    )
+    return JobOutcome(job, result, timing)
+
+
+def run_concurrently(backend, circuit_sets, polling=None, max_workers=None, **run_kwargs):
+    """Run several jobs on a backend concurrently and wait for all of them.
+
+    Each entry in ``circuit_sets`` is submitted as a separate job and all the
+    jobs are submitted and polled concurrently, so the time spent waiting in
+    a queue overlaps between jobs.
+
+    This is a blocking call which runs its own event loop. If it's called
+    from a thread which already has a running event loop (for example from a
+    coroutine) the jobs are run on a new event loop in a separate thread, and
+    the calling thread's event loop is blocked until they finish. Coroutines
+    should await :func:`submit_and_wait` directly instead.
+
+    :param backend: The backend to run the circuits on
+    :param list circuit_sets: A list of circuits or lists of circuits, each
+        of which is submitted as a single job
+    :param PollingConfig polling: The polling settings to use
+    :param int max_workers: The maximum number of threads to use for blocking
+        calls, defaults to one per job
+    :param run_kwargs: Keyword arguments to pass to ``backend.run()``
+    :returns: A list of :class:`JobOutcome` objects in the same order as
+        ``circuit_sets``
+    """
+    if not circuit_sets:
+        return []
+
+    async def _run_all(executor):
+        return await asyncio.gather(
+            *(
+                submit_and_wait(backend, circuits, polling, executor, **run_kwargs)
+                for circuits in circuit_sets
+            )
+        )
+
+    def _run():
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers or len(circuit_sets)
+        ) as executor:
+            return asyncio.run(_run_all(executor))
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return _run()
+    # asyncio.run() can't be called from a thread with a running event loop
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as runner:
+        return runner.submit(_run).result()
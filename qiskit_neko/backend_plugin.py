@@ -16,7 +16,9 @@
 
 
 import abc
+import importlib.util
 import logging
+import threading
 
 import stevedore
 
@@ -33,8 +35,52 @@ class BackendPlugin(abc.ABC):
     qiskit-neko provides the backend plugin interface to enable a standard
     interface to return backend objects and leave the specifics of
     authentication or initialization of providers.
+
+    Besides :meth:`get_backend` plugins can optionally implement the
+    lifecycle methods :meth:`warmup`, :meth:`is_reusable` and :meth:`close`.
+    When used through a :class:`BackendPool` (as the test suite does) they're
+    called once per test worker process: :meth:`warmup` before the plugin's
+    first backend is created, :meth:`is_reusable` whenever a pooled backend is
+    about to be reused and :meth:`close` when the pool is closed at exit. This
+    is the place for expensive one-time setup such as establishing a session
+    with a service.
     """
 
+    #: Whether the plugin's backends wrap the backends of another plugin. These
+    #: plugins take a selection string in their own format, so they're left
+    #: out when a backend is requested from every installed plugin with
+    #: :meth:`BackendPluginManager.get_plugin_backends`.
+    wraps_plugins = False
+
+    def warmup(self):
+        """Prepare the plugin before its first backend is created.
+
+        By default this does nothing. An exception raised here is raised from
+        the request for the backend.
+        """
+        pass
+
+    def is_reusable(self, backend):
+        """Return whether a backend returned by :meth:`get_backend` can be reused.
+
+        This is called before a pooled backend is handed out to another test,
+        if it returns ``False`` (for example because a session it uses has
+        expired) a new backend is requested with :meth:`get_backend`
+        instead. By default backends are always reusable.
+
+        :param backend: The backend object to check
+        :rtype: bool
+        """
+        return True
+
+    def close(self):
+        """Release any resources held by the plugin.
+
+        By default this does nothing. After it's called the plugin may be
+        warmed up again with :meth:`warmup` and used.
+        """
+        pass
+
     @abc.abstractmethod
     def get_backend(self, backend_selection=None):
         """Return the Backend object to run tests on.
@@ -51,15 +97,21 @@ class BackendPlugin(abc.ABC):
 
 
 class BackendPluginManager:
-    """Class to manage installed backend plugins"""
+    """Class to manage installed backend plugins
 
-    def __init__(self):
-        self.ext_plugins = stevedore.ExtensionManager(
-            "qiskit_neko.backend_plugins",
-            invoke_on_load=True,
-            propagate_map_exceptions=True,
-            on_load_failure_callback=self.failure_hook,
-        )
+    :param bool lazy: If set to ``True`` no plugins will be loaded on
+        initialization. Instead each plugin is only imported and instantiated
+        the first time it is requested via :meth:`get_plugin`, and all the
+        installed plugins will only be loaded if :attr:`ext_plugins` or
+        :meth:`get_plugin_backends` are used. If ``False`` (the default) all
+        installed plugins are loaded on initialization.
+    """
+
+    def __init__(self, lazy=False):
+        self._plugins = {}
+        self._ext_plugins = None
+        if not lazy:
+            self._load_all_plugins()
 
     @staticmethod
     def failure_hook(_, ep, err):
@@ -67,9 +119,251 @@ class BackendPluginManager:
         LOG.error("Could not load %r: %s", ep.name, err)
         raise err
 
+    def _load_all_plugins(self):
+        ext_plugins = stevedore.ExtensionManager(
+            "qiskit_neko.backend_plugins",
+            invoke_on_load=False,
+            propagate_map_exceptions=True,
+            on_load_failure_callback=self.failure_hook,
+        )
+        # Reuse any plugin objects which were already loaded individually
+        for ext in ext_plugins:
+            if ext.name not in self._plugins:
+                try:
+                    self._plugins[ext.name] = ext.plugin()
+                except Exception as err:  # pylint: disable=broad-except
+                    self.failure_hook(ext_plugins, ext.entry_point, err)
+            ext.obj = self._plugins[ext.name]
+        self._ext_plugins = ext_plugins
+
+    @property
+    def ext_plugins(self):
+        """The :class:`stevedore.extension.ExtensionManager` for all installed plugins."""
+        if self._ext_plugins is None:
+            self._load_all_plugins()
+        return self._ext_plugins
+
+    def get_plugin(self, name):
+        """Return the plugin object for a single installed plugin.
+
+        Only the requested plugin is imported and instantiated (if it hasn't
+        been already).
+
+        :param str name: The name of the plugin to return
+        :raises KeyError: If there is no plugin installed with the given name
+        """
+        plugin = self._plugins.get(name)
+        if plugin is None:
+            ext_plugins = stevedore.NamedExtensionManager(
+                "qiskit_neko.backend_plugins",
+                names=[name],
+                invoke_on_load=False,
+                on_load_failure_callback=self.failure_hook,
+            )
+            if name not in ext_plugins.names():
+                raise KeyError(f"No backend plugin named {name!r} is installed")
+            ext = ext_plugins[name]
+            try:
+                plugin = ext.plugin()
+            except Exception as err:  # pylint: disable=broad-except
+                self.failure_hook(ext_plugins, ext.entry_point, err)
+            self._plugins[name] = plugin
+        return plugin
+
+    def get_plugin_backend(self, name, backend_selection=None):
+        """Return the backend object from a single installed plugin.
+
+        :param str name: The name of the plugin to get the backend from
+        :param str backend_selection: The selection string to pass to the plugin
+        """
+        return self.get_plugin(name).get_backend(backend_selection=backend_selection)
+
+    def get_plugin_names(self, include_wrappers=False):
+        """Return the names of the installed plugins.
+
+        :param bool include_wrappers: If set the plugins which wrap the
+            backends of other plugins (see :attr:`BackendPlugin.wraps_plugins`)
+            are included
+        :rtype: list
+        """
+        return [
+            plug.name
+            for plug in self.ext_plugins
+            if include_wrappers or not getattr(plug.obj, "wraps_plugins", False)
+        ]
+
     def get_plugin_backends(self, backend_selection=None):
-        """Return a dictionary of plugin names to backend objects."""
+        """Return a dictionary of plugin names to backend objects.
+
+        Plugins which wrap the backends of other plugins are skipped.
+        """
         return {
-            plug.name: plug.obj.get_backend(backend_selection=backend_selection)
-            for plug in self.ext_plugins
+            name: self.get_plugin(name).get_backend(backend_selection=backend_selection)
+            for name in self.get_plugin_names()
+        }
+
+
+def load_plugin_script(path):
+    """Load a backend plugin from a user specified script file.
+
+    :param str path: The path to the script file to load. The script must
+        contain a function named ``main()`` which returns a
+        :class:`~.BackendPlugin` object.
+    :returns: The plugin object returned by the script's ``main()`` function.
+    :rtype: BackendPlugin
+    """
+    spec = importlib.util.spec_from_file_location("backend_script", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.main()
+
+
+def _snapshot_options(backend):
+    """Return a copy of the current options of a backend or ``None``."""
+    try:
+        return dict(backend.options.items())
+    except (AttributeError, TypeError):
+        return None
+
+
+class BackendPool:
+    """Process wide pool of backend objects.
+
+    Building backend objects can be expensive (for example loading a fake
+    backend's configuration or authenticating with a remote service) and the
+    same backend is typically used by every test run in a single test worker.
+    This class caches the backend objects created for each combination of
+    plugin name, backend selection string and backend script path so they only
+    get built once per process. Every time a cached backend is handed out its
+    options are reset to the values it had when it was first created so that
+    a test calling ``set_options()`` does not influence subsequent tests.
+
+    The pool also calls the lifecycle methods of the plugins: each plugin's
+    :meth:`~.BackendPlugin.warmup` is called the first time it's requested,
+    pooled backends are only reused if :meth:`~.BackendPlugin.is_reusable`
+    returns ``True`` and :meth:`close` calls :meth:`~.BackendPlugin.close`
+    on every plugin which was warmed up.
+
+    The pool can be used from several threads, and every thread requesting
+    the same backend gets the same backend object.
+    """
+
+    def __init__(self):
+        self._plugin_manager = None
+        self._script_plugins = {}
+        self._backends = {}
+        self._warm_plugins = {}
+        self._lock = threading.RLock()
+
+    @property
+    def plugin_manager(self):
+        """The :class:`~.BackendPluginManager` used for loading plugins."""
+        if self._plugin_manager is None:
+            self._plugin_manager = BackendPluginManager(lazy=True)
+        return self._plugin_manager
+
+    def _get_script_plugin(self, script_path):
+        plugin = self._script_plugins.get(script_path)
+        if plugin is None:
+            plugin = load_plugin_script(script_path)
+            self._script_plugins[script_path] = plugin
+        return plugin
+
+    def _checkout(self, key):
+        backend, options = self._backends[key]
+        if options is not None:
+            try:
+                backend.set_options(**options)
+            except Exception as err:  # pylint: disable=broad-except
+                LOG.warning("Unable to reset options for pooled backend %s: %s", key, err)
+                del self._backends[key]
+                return None
+        return backend
+
+    def _checkin(self, key, backend):
+        self._backends[key] = (backend, _snapshot_options(backend))
+
+    def get_plugin(self, plugin_name="aer", script_path=None):
+        """Return a plugin object from the pool.
+
+        :param str plugin_name: The name of the installed plugin to return.
+            This is ignored if ``script_path`` is set.
+        :param str script_path: An optional path to a backend script to load
+            the plugin from instead of an installed plugin.
+        :returns: The plugin object
+        :rtype: BackendPlugin
+        """
+        with self._lock:
+            if script_path is not None:
+                plugin = self._get_script_plugin(script_path)
+            else:
+                plugin = self.plugin_manager.get_plugin(plugin_name)
+            if id(plugin) not in self._warm_plugins:
+                plugin.warmup()
+                self._warm_plugins[id(plugin)] = plugin
+            return plugin
+
+    def get_backend(self, plugin_name="aer", backend_selection=None, script_path=None):
+        """Return a backend object from the pool.
+
+        :param str plugin_name: The name of the installed plugin to get the
+            backend from. This is ignored if ``script_path`` is set.
+        :param str backend_selection: The selection string to pass to the
+            plugin's :meth:`~.BackendPlugin.get_backend` method.
+        :param str script_path: An optional path to a backend script to load
+            the plugin from instead of an installed plugin.
+        :returns: The backend object for the given combination of arguments.
+        """
+        if script_path is not None:
+            plugin_name = None
+        key = (plugin_name, backend_selection, script_path)
+        with self._lock:
+            plugin = self.get_plugin(plugin_name, script_path)
+            if key in self._backends:
+                if plugin.is_reusable(self._backends[key][0]):
+                    backend = self._checkout(key)
+                    if backend is not None:
+                        return backend
+                else:
+                    LOG.info("Pooled backend %s is not reusable, creating a new one", key)
+                    del self._backends[key]
+            backend = plugin.get_backend(backend_selection)
+            self._checkin(key, backend)
+            return backend
+
+    def get_plugin_backends(self, backend_selection=None):
+        """Return a dictionary of plugin names to pooled backend objects.
+
+        Plugins which wrap the backends of other plugins are skipped.
+
+        :param str backend_selection: The selection string to pass to every
+            installed plugin.
+        """
+        return {
+            name: self.get_backend(name, backend_selection)
+            for name in self.plugin_manager.get_plugin_names()
         }
+
+    def close(self):
+        """Close every plugin which was warmed up and remove all backends from the pool.
+
+        Errors raised by a plugin's :meth:`~.BackendPlugin.close` are logged
+        and don't prevent the other plugins from being closed. The plugins
+        are warmed up again if they're requested after this.
+        """
+        with self._lock:
+            plugins = list(self._warm_plugins.values())
+            self._warm_plugins.clear()
+            self._backends.clear()
+        for plugin in reversed(plugins):
+            try:
+                plugin.close()
+            except Exception as err:  # pylint: disable=broad-except
+                LOG.warning("Error closing backend plugin %r: %s", plugin, err)
+
+    def clear(self):
+        """Close and remove all backends and plugins from the pool."""
+        with self._lock:
+            self.close()
+            self._script_plugins.clear()
+            self._plugin_manager = None
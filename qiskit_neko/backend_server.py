@@ -0,0 +1,329 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""A server process which owns backends and runs circuits for test workers.
+
+The server listens on a Unix socket and loads backends from the installed
+backend plugins on request, so several test worker processes can share one
+instance of each backend (and of any noise model it builds) instead of each
+building their own. Circuits are sent as QPY and run on a thread pool.
+
+Every message is a JSON header and an optional binary body, each prefixed by
+its length. Results and backend targets are sent as pickles, so the socket is
+created in a directory only accessible by the current user.
+
+Run the server with::
+
+    python -m qiskit_neko.backend_server --socket /path/to/socket
+
+or let :class:`~qiskit_neko.server_plugin.ServerBackendPlugin` start it
+on demand.
+"""
+
+import argparse
+import concurrent.futures
+import importlib
+import io
+import itertools
+import json
+import logging
+import os
+import pickle
+import socketserver
+import struct
+import threading
+import time
+
+from qiskit_neko import backend_plugin
+from qiskit_neko import cache
+from qiskit_neko import thread_budget
+
+LOG = logging.getLogger(__name__)
+
+SOCKET_ENV = "NEKO_BACKEND_SERVER"
+SOCKET_NAME = "backend.sock"
+
+_LENGTHS = struct.Struct(">II")
+
+
+def default_socket_path():
+    """Return the path of the server's socket.
+
+    This is the value of the ``NEKO_BACKEND_SERVER`` environment variable if
+    set and otherwise ``backend.sock`` in the ``server`` subdirectory of the
+    qiskit-neko cache directory, which is made only accessible by the current
+    user.
+    """
+    path = os.getenv(SOCKET_ENV)
+    if path:
+        return path
+    directory = cache.get_cache_dir("server")
+    # The cache directory is created with the default permissions
+    os.chmod(directory, 0o700)
+    return os.path.join(directory, SOCKET_NAME)
+
+
+def _recv_exactly(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(min(size - len(data), 1 << 20))
+        if not chunk:
+            raise ConnectionError("Connection closed by peer")
+        data += chunk
+    return bytes(data)
+
+
+def send_message(sock, header, body=b""):
+    """Send a message over a socket.
+
+    :param socket.socket sock: The connected socket
+    :param dict header: The JSON serializable header of the message
+    :param bytes body: The binary body of the message
+    """
+    header = json.dumps(header).encode("utf8")
+    sock.sendall(_LENGTHS.pack(len(header), len(body)) + header + body)
+
+
+def recv_message(sock):
+    """Receive a message sent with :func:`send_message`.
+
+    :param socket.socket sock: The connected socket
+    :returns: A tuple of the header and the body of the message
+    :rtype: tuple
+    """
+    header_length, body_length = _LENGTHS.unpack(_recv_exactly(sock, _LENGTHS.size))
+    header = json.loads(_recv_exactly(sock, header_length))
+    return header, _recv_exactly(sock, body_length)
+
+
+def _jsonable_options(options):
+    jsonable = {}
+    for key, value in options.items():
+        try:
+            json.dumps(value)
+        except TypeError:
+            continue
+        jsonable[key] = value
+    return jsonable
+
+
+class _Job:
+    def __init__(self, future):
+        self.future = future
+        self.started = threading.Event()
+
+
+class BackendServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """A server which runs circuits on backends from the installed plugins.
+
+    :param str path: The path of the Unix socket to listen on
+    :param int max_workers: The number of circuits run at the same time,
+        defaults to the number of CPUs. The CPUs are split between them by
+        limiting the threads used by each Aer simulator the server loads.
+    :param float idle_timeout: Shut down after no requests were received and
+        no jobs ran for this many seconds, ``None`` to run until shut down
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path, max_workers=None, idle_timeout=None):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if os.path.exists(path):
+            os.unlink(path)
+        # Loading qiskit for the first time in a request handler thread makes
+        # QPY loading crash in the other handler threads
+        importlib.import_module("qiskit.qpy")
+
+        # Create the socket without access for other users, so it can't be
+        # connected to before its permissions are set
+        umask = os.umask(0o077)
+        try:
+            super().__init__(path, _RequestHandler)
+        finally:
+            os.umask(umask)
+        os.chmod(path, 0o600)
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self.max_workers = max_workers or thread_budget.available_cpus()
+        self.job_threads = max(1, thread_budget.available_cpus() // self.max_workers)
+        self.plugin_manager = backend_plugin.BackendPluginManager(lazy=True)
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="neko-backend-server"
+        )
+        self._lock = threading.Lock()
+        self._backends = {}
+        self._backend_locks = {}
+        self._jobs = {}
+        self._job_ids = itertools.count()
+        self._last_request = time.monotonic()
+
+    def get_backend(self, plugin, selection):
+        """Return the shared backend for a plugin and selection string."""
+        if plugin == "server":
+            raise ValueError("The backend server can't load backends from the server plugin")
+        key = (plugin, selection)
+        with self._lock:
+            backend_lock = self._backend_locks.setdefault(key, threading.Lock())
+        # Build each backend once, without blocking requests for other backends
+        with backend_lock:
+            if key not in self._backends:
+                LOG.info("Loading backend %r from plugin %r", selection, plugin)
+                backend = self.plugin_manager.get_plugin(plugin).get_backend(selection)
+                thread_budget.apply_to_backend(backend, self.job_threads)
+                with self._lock:
+                    self._backends[key] = backend
+        return self._backends[key]
+
+    def submit(self, backend, circuits, options):
+        """Run circuits on a backend in the thread pool and return the job id."""
+
+        def _run():
+            job.started.set()
+            return backend.run(circuits, **options).result()
+
+        with self._lock:
+            job_id = str(next(self._job_ids))
+            job = _Job(None)
+            job.future = self.executor.submit(_run)
+            self._jobs[job_id] = job
+        return job_id
+
+    def get_job(self, job_id, remove=False):
+        """Return a job submitted with :meth:`submit`."""
+        with self._lock:
+            job = self._jobs.pop(job_id, None) if remove else self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"Unknown job {job_id}")
+        return job
+
+    def touch(self):
+        """Record that a request was received."""
+        self._last_request = time.monotonic()
+
+    def service_actions(self):
+        if self.idle_timeout is None:
+            return
+        with self._lock:
+            busy = any(not job.future.done() for job in self._jobs.values())
+        if busy:
+            self.touch()
+        elif time.monotonic() - self._last_request > self.idle_timeout:
+            LOG.info("Shutting down after %s idle seconds", self.idle_timeout)
+            self.idle_timeout = None
+            threading.Thread(target=self.shutdown, daemon=True).start()
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False)
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server = self.server
+        while True:
+            try:
+                header, body = recv_message(self.request)
+            except (ConnectionError, struct.error):
+                return
+            server.touch()
+            try:
+                response, response_body = self.dispatch(header, body)
+                response["ok"] = True
+            except Exception as err:  # pylint: disable=broad-except
+                LOG.debug("Request %s failed", header.get("op"), exc_info=True)
+                response = {"ok": False, "error": f"{type(err).__name__}: {err}"}
+                response_body = b""
+            send_message(self.request, response, response_body)
+            if header.get("op") == "shutdown":
+                threading.Thread(target=server.shutdown, daemon=True).start()
+                return
+
+    def dispatch(self, header, body):
+        """Handle a request and return the response header and body."""
+        server = self.server
+        op = header.get("op")
+        if op in ("ping", "shutdown"):
+            return {"pid": os.getpid()}, b""
+        if op == "backend":
+            backend = server.get_backend(header["plugin"], header.get("selection"))
+            info = {
+                "name": backend.name,
+                "description": getattr(backend, "description", None),
+                "backend_version": getattr(backend, "backend_version", None),
+                "max_circuits": backend.max_circuits,
+                "options": _jsonable_options(backend.options),
+            }
+            return info, pickle.dumps(backend.target, protocol=4)
+        if op == "run":
+            from qiskit import qpy
+
+            backend = server.get_backend(header["plugin"], header.get("selection"))
+            circuits = qpy.load(io.BytesIO(body))
+            return {"job_id": server.submit(backend, circuits, header.get("options", {}))}, b""
+        if op == "status":
+            job = server.get_job(header["job_id"])
+            if job.future.done():
+                status = "ERROR" if job.future.exception() else "DONE"
+            else:
+                status = "RUNNING" if job.started.is_set() else "QUEUED"
+            return {"status": status}, b""
+        if op == "result":
+            job = server.get_job(header["job_id"])
+            try:
+                result = job.future.result(timeout=header.get("timeout"))
+            finally:
+                # Jobs which timed out are kept so their result can be requested again
+                if job.future.done():
+                    server.get_job(header["job_id"], remove=True)
+            return {}, pickle.dumps(result.to_dict(), protocol=4)
+        raise ValueError(f"Unknown request {op!r}")
+
+
+def main(argv=None):
+    """Run a backend server until it's shut down or idle."""
+    parser = argparse.ArgumentParser(
+        prog="python -m qiskit_neko.backend_server", description=main.__doc__
+    )
+    parser.add_argument("--socket", default=None, help="The path of the Unix socket")
+    parser.add_argument(
+        "--max-workers", type=int, default=None, help="The number of circuits run at a time"
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=None,
+        help="Shut down after this many seconds without requests",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(format="%(asctime)s %(levelname)s %(message)s")
+    LOG.setLevel(logging.INFO)
+    server = BackendServer(
+        args.socket or default_socket_path(),
+        max_workers=args.max_workers,
+        idle_timeout=args.idle_timeout,
+    )
+    LOG.info("Listening on %s", server.path)
+    try:
+        server.serve_forever(poll_interval=1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
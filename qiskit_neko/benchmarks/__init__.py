@@ -0,0 +1,21 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Performance benchmarks for qiskit-neko workloads.
+
+The benchmarks in this package follow the conventions of
+`airspeed velocity <https://asv.readthedocs.io/>`__ (classes with
+``params``, ``param_names``, ``setup()`` and ``time_*`` methods) so they
+can be run with ``asv`` using the ``asv.conf.json`` in the repository root,
+or without any extra dependencies with ``python -m qiskit_neko.benchmarks``
+which appends the results to a JSON lines history file.
+"""
@@ -0,0 +1,66 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Shared helpers for the benchmarks."""
+
+import os
+
+from qiskit_neko import backend_plugin
+
+# Backends are shared between benchmarks run in the same process
+_POOL = backend_plugin.BackendPool()
+
+
+def benchmark_backends():
+    """Return the backend specifications to parametrize benchmarks over.
+
+    The specifications are read from the comma separated
+    ``NEKO_BENCHMARK_BACKENDS`` environment variable, where each entry is a
+    backend plugin name optionally followed by ``:`` and a backend selection
+    string, for example ``aer,aer:fake_sherbrooke``. Selection strings can
+    contain commas between ``key=value`` options (such as
+    ``aer:method=statevector,precision=single``) since plugin names can't
+    contain ``=``. Defaults to ``aer``.
+    """
+    specs = []
+    for part in os.getenv("NEKO_BENCHMARK_BACKENDS", "aer").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if specs and "=" in part.partition(":")[0]:
+            specs[-1] = f"{specs[-1]},{part}"
+        else:
+            specs.append(part)
+    return specs
+
+
+def get_backend(spec):
+    """Return the backend for a backend specification string."""
+    plugin, _, selection = spec.partition(":")
+    return _POOL.get_backend(plugin, selection or None)
+
+
+def require_qubits(backend, num_qubits):
+    """Skip a benchmark if the backend has fewer than ``num_qubits`` qubits."""
+    backend_qubits = getattr(backend, "num_qubits", None)
+    if backend_qubits is not None and backend_qubits < num_qubits:
+        raise NotImplementedError(f"Backend only has {backend_qubits} qubits")
+
+
+def run_kwargs(backend, shots):
+    """Return the keyword arguments to run a benchmark job with."""
+    kwargs = {}
+    if hasattr(backend.options, "shots"):
+        kwargs["shots"] = shots
+    if hasattr(backend.options, "seed_simulator"):
+        kwargs["seed_simulator"] = 42
+    return kwargs
@@ -0,0 +1,82 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+# pylint: disable=attribute-defined-outside-init
+
+"""Benchmarks for running basic circuits."""
+
+from qiskit import QuantumCircuit, transpile
+
+from qiskit_neko.benchmarks import _common
+
+
+def ghz_circuit(num_qubits):
+    """Return a GHZ circuit with measurements."""
+    circuit = QuantumCircuit(num_qubits)
+    circuit.h(0)
+    for qubit in range(1, num_qubits):
+        circuit.cx(0, qubit)
+    circuit.measure_all()
+    return circuit
+
+
+def bell_pairs_circuit(num_qubits):
+    """Return a circuit preparing ``num_qubits // 2`` Bell pairs with measurements."""
+    circuit = QuantumCircuit(num_qubits)
+    for qubit in range(0, num_qubits - 1, 2):
+        circuit.h(qubit)
+        circuit.cx(qubit, qubit + 1)
+    circuit.measure_all()
+    return circuit
+
+
+class GHZ:
+    """Transpile and run GHZ circuits."""
+
+    params = ([2, 5, 10, 20], [1024, 8192], _common.benchmark_backends())
+    param_names = ["num_qubits", "shots", "backend"]
+    timeout = 300
+
+    def setup(self, num_qubits, shots, backend):
+        self.backend = _common.get_backend(backend)
+        _common.require_qubits(self.backend, num_qubits)
+        self.circuit = ghz_circuit(num_qubits)
+        self.transpiled = transpile(self.circuit, self.backend, seed_transpiler=42)
+        self.run_kwargs = _common.run_kwargs(self.backend, shots)
+
+    def time_transpile(self, *_):
+        """Time transpiling the circuit at the default optimization level."""
+        transpile(self.circuit, self.backend, seed_transpiler=42)
+
+    def time_run(self, *_):
+        """Time running the transpiled circuit."""
+        self.backend.run(self.transpiled, **self.run_kwargs).result()
+
+
+class Bell:
+    """Run circuits of independent Bell pairs."""
+
+    params = ([2, 10, 20], [1024, 8192], _common.benchmark_backends())
+    param_names = ["num_qubits", "shots", "backend"]
+    timeout = 300
+
+    def setup(self, num_qubits, shots, backend):
+        self.backend = _common.get_backend(backend)
+        _common.require_qubits(self.backend, num_qubits)
+        self.transpiled = transpile(
+            bell_pairs_circuit(num_qubits), self.backend, seed_transpiler=42
+        )
+        self.run_kwargs = _common.run_kwargs(self.backend, shots)
+
+    def time_run(self, *_):
+        """Time running the transpiled circuit."""
+        self.backend.run(self.transpiled, **self.run_kwargs).result()
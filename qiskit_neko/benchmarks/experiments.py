@@ -0,0 +1,44 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+# pylint: disable=attribute-defined-outside-init
+
+"""Benchmarks for qiskit-experiments workloads."""
+
+from qiskit import QuantumCircuit
+
+from qiskit_neko.benchmarks import _common
+
+
+class StateTomography:
+    """Run state tomography of a GHZ state."""
+
+    params = ([2, 3, 4], [1024], _common.benchmark_backends())
+    param_names = ["num_qubits", "shots", "backend"]
+    timeout = 600
+
+    def setup(self, num_qubits, shots, backend):
+        from qiskit_experiments.library import StateTomography as StateTomographyExperiment
+
+        self.backend = _common.get_backend(backend)
+        _common.require_qubits(self.backend, num_qubits)
+        circuit = QuantumCircuit(num_qubits)
+        circuit.h(0)
+        circuit.s(0)
+        for qubit in range(1, num_qubits):
+            circuit.cx(0, qubit)
+        self.experiment = StateTomographyExperiment(circuit)
+        self.experiment.set_run_options(shots=shots)
+
+    def time_state_tomography(self, *_):
+        """Time running the experiment and its analysis."""
+        self.experiment.run(self.backend, seed_simulation=42).block_for_results()
@@ -0,0 +1,64 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+# pylint: disable=attribute-defined-outside-init
+
+"""Benchmarks for qiskit-machine-learning workloads."""
+
+import numpy as np
+from qiskit import transpile
+from qiskit.circuit.library import real_amplitudes, zz_feature_map
+from qiskit.primitives import BackendSamplerV2
+
+from qiskit_neko.benchmarks import _common
+
+
+class SamplerQNN:
+    """Forward and backward passes of a sampler based quantum neural network."""
+
+    params = ([2, 4, 6], [1024], _common.benchmark_backends())
+    param_names = ["num_qubits", "shots", "backend"]
+    timeout = 600
+
+    def setup(self, num_qubits, shots, backend):
+        from qiskit_machine_learning.gradients import ParamShiftSamplerGradient
+        from qiskit_machine_learning.neural_networks import SamplerQNN as SamplerQNNImpl
+
+        self.backend = _common.get_backend(backend)
+        _common.require_qubits(self.backend, num_qubits)
+        feature_map = zz_feature_map(num_qubits)
+        ansatz = real_amplitudes(num_qubits, reps=1)
+        circuit = feature_map.compose(ansatz)
+        circuit.measure_all()
+        circuit = transpile(circuit, self.backend, seed_transpiler=42)
+        options = {"default_shots": shots}
+        if hasattr(self.backend.options, "seed_simulator"):
+            options["seed_simulator"] = 42
+        sampler = BackendSamplerV2(backend=self.backend, options=options)
+        self.qnn = SamplerQNNImpl(
+            circuit=circuit,
+            input_params=feature_map.parameters,
+            weight_params=ansatz.parameters,
+            sampler=sampler,
+            gradient=ParamShiftSamplerGradient(sampler),
+            input_gradients=True,
+        )
+        self.inputs = np.ones(num_qubits)
+        self.weights = np.ones(ansatz.num_parameters)
+
+    def time_forward(self, *_):
+        """Time a forward pass."""
+        self.qnn.forward(self.inputs, self.weights)
+
+    def time_backward(self, *_):
+        """Time a backward pass."""
+        self.qnn.backward(self.inputs, self.weights)
@@ -0,0 +1,80 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+# pylint: disable=attribute-defined-outside-init
+
+"""Benchmarks for the per test overhead of the base test class."""
+
+import unittest
+
+import testtools
+
+from qiskit_neko.tests import base
+
+
+@base.enforce_subclasses_call(["setUp", "setUpClass", "tearDown", "tearDownClass"])
+class _EnforcedBase(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+
+
+class _EnforcedCase(_EnforcedBase):
+    def setUp(self):
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+
+    def test_noop(self):
+        pass
+
+
+class _NekoCase(base.BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+    def test_noop(self):
+        pass
+
+
+class EnforceSubclassesCall:
+    """Time the overhead of ``enforce_subclasses_call`` on test setup and teardown."""
+
+    params = [1000, 10000]
+    param_names = ["num_tests"]
+
+    def time_setup_teardown(self, num_tests):
+        """Time creating test cases and calling their setUp and tearDown."""
+        for _ in range(num_tests):
+            case = _EnforcedCase("test_noop")
+            case.setUp()
+            case.tearDown()
+
+
+class BaseTestCaseRun:
+    """Time running trivial tests with the base test class."""
+
+    params = [100, 1000]
+    param_names = ["num_tests"]
+
+    def setup(self, _):
+        # Load the backend plugin and build the backend outside the timing
+        _NekoCase("test_noop").run(testtools.TestResult())
+
+    def time_run(self, num_tests):
+        """Time running trivial tests including the base class setUp."""
+        result = testtools.TestResult()
+        for _ in range(num_tests):
+            _NekoCase("test_noop").run(result)
@@ -0,0 +1,213 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""A minimal runner for the asv style benchmarks in this package.
+
+This discovers the benchmark classes in the benchmark modules, times each of
+their ``time_*`` methods for every combination of parameters and appends one
+JSON record per benchmark and parameter combination to a history file. Each
+record contains the timestamp, the benchmark name, the parameters, the
+measured times in seconds and the versions of the installed Qiskit packages, so
+the history can be compared across different Qiskit builds.
+"""
+
+import argparse
+import datetime
+import importlib
+import importlib.metadata
+import inspect
+import itertools
+import json
+import logging
+import platform
+import re
+import statistics
+import sys
+import time
+import timeit
+
+LOG = logging.getLogger(__name__)
+
+BENCHMARK_MODULES = [
+    "qiskit_neko.benchmarks.circuits",
+    "qiskit_neko.benchmarks.experiments",
+    "qiskit_neko.benchmarks.machine_learning",
+    "qiskit_neko.benchmarks.overhead",
+]
+
+PACKAGES = [
+    "qiskit",
+    "qiskit-aer",
+    "qiskit-ibm-runtime",
+    "qiskit-experiments",
+    "qiskit-machine-learning",
+    "qiskit-neko",
+]
+
+
+def environment():
+    """Return a description of the environment the benchmarks run in."""
+    versions = {}
+    for package in PACKAGES:
+        try:
+            versions[package] = importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError:
+            versions[package] = None
+    return {
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "platform": platform.platform(),
+        "packages": versions,
+    }
+
+
+def discover(module_names=None, pattern=None):
+    """Find the benchmarks in the benchmark modules.
+
+    :param list module_names: The modules to search, defaults to all of the
+        benchmark modules. Modules which can't be imported (for example because
+        an optional Qiskit package isn't installed) are skipped.
+    :param str pattern: An optional regex which the full benchmark name
+        (``module.Class.method``) must match
+    :returns: A list of ``(name, class, method name)`` tuples
+    """
+    benchmarks = []
+    for module_name in module_names or BENCHMARK_MODULES:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError as err:
+            LOG.warning("Skipping benchmark module %s: %s", module_name, err)
+            continue
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__ or class_name.startswith("_"):
+                continue
+            for method_name in sorted(vars(cls)):
+                if not method_name.startswith("time_"):
+                    continue
+                name = f"{module_name.rsplit('.', 1)[-1]}.{class_name}.{method_name}"
+                if pattern is None or re.search(pattern, name):
+                    benchmarks.append((name, cls, method_name))
+    return benchmarks
+
+
+def _param_combinations(cls):
+    params = getattr(cls, "params", [])
+    if params and not isinstance(params[0], (list, tuple)):
+        params = [params]
+    names = list(getattr(cls, "param_names", []))
+    names.extend(f"param{index}" for index in range(len(names), len(params)))
+    for combination in itertools.product(*params):
+        yield dict(zip(names, combination)), combination
+
+
+def run_benchmark(cls, method_name, args, repeat=3, number=1):
+    """Time a single benchmark method for one combination of parameters.
+
+    :param cls: The benchmark class
+    :param str method_name: The name of the ``time_*`` method
+    :param tuple args: The parameter values
+    :param int repeat: The number of timing samples to take
+    :param int number: The number of calls per sample
+    :returns: A list of the time per call in seconds for each sample, or
+        ``None`` if the benchmark was skipped by raising
+        ``NotImplementedError`` in ``setup()``
+    """
+    instance = cls()
+    setup = getattr(instance, "setup", None)
+    teardown = getattr(instance, "teardown", None)
+    try:
+        if setup is not None:
+            setup(*args)
+    except NotImplementedError:
+        return None
+    try:
+        method = getattr(instance, method_name)
+        timer = timeit.Timer(lambda: method(*args), timer=time.perf_counter)
+        return [total / number for total in timer.repeat(repeat=repeat, number=number)]
+    finally:
+        if teardown is not None:
+            teardown(*args)
+
+
+def run(benchmarks, history_file, repeat=3, number=1):
+    """Run benchmarks and append the results to a history file.
+
+    :param list benchmarks: The benchmarks to run as returned by :func:`discover`
+    :param str history_file: The path of the JSON lines file to append to
+    :param int repeat: The number of timing samples to take per benchmark
+    :param int number: The number of calls per sample
+    :returns: The list of records written to the history file
+    """
+    env = environment()
+    timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    records = []
+    with open(history_file, "a", encoding="utf8") as fd:
+        for name, cls, method_name in benchmarks:
+            for params, args in _param_combinations(cls):
+                try:
+                    times = run_benchmark(cls, method_name, args, repeat=repeat, number=number)
+                except Exception as err:  # pylint: disable=broad-except
+                    LOG.error("Benchmark %s %s failed: %s", name, params, err)
+                    times = None
+                    status = "failed"
+                else:
+                    status = "skipped" if times is None else "ok"
+                record = {
+                    "timestamp": timestamp,
+                    "benchmark": name,
+                    "params": params,
+                    "status": status,
+                    "times": times,
+                    "min": min(times) if times else None,
+                    "median": statistics.median(times) if times else None,
+                    "environment": env,
+                }
+                fd.write(json.dumps(record) + "\n")
+                fd.flush()
+                records.append(record)
+    return records
+
+
+def main(argv=None):
+    """Entry point for ``python -m qiskit_neko.benchmarks``."""
+    parser = argparse.ArgumentParser(description="Run the qiskit-neko benchmarks.")
+    parser.add_argument(
+        "-b", "--bench", default=None, help="Regex for the names of the benchmarks to run"
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="neko_benchmarks.jsonl",
+        help="JSON lines file to append the results to",
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Timing samples to take")
+    parser.add_argument("-n", "--number", type=int, default=1, help="Calls per timing sample")
+    parser.add_argument("-l", "--list", action="store_true", help="Only list the benchmarks")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    benchmarks = discover(pattern=args.bench)
+    if args.list:
+        for name, _, _ in benchmarks:
+            print(name)
+        return 0
+    records = run(benchmarks, args.output, repeat=args.repeat, number=args.number)
+    for record in records:
+        params = ", ".join(f"{key}={value}" for key, value in record["params"].items())
+        if record["status"] == "ok":
+            print(f"{record['benchmark']}({params}): {record['min']:.6f}s")
+        else:
+            print(f"{record['benchmark']}({params}): {record['status']}")
+    return 1 if any(record["status"] == "failed" for record in records) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""On-disk cache helpers."""
+
+import json
+import os
+import tempfile
+
+
+def get_cache_dir(*parts):
+    """Return the path to a qiskit-neko cache directory, creating it if needed.
+
+    The root cache directory can be set with the ``NEKO_CACHE_DIR``
+    environment variable, otherwise it defaults to ``qiskit-neko`` in
+    ``$XDG_CACHE_HOME`` (or ``~/.cache`` if that isn't set).
+
+    :param str parts: Optional path components of a subdirectory in the
+        cache directory to return.
+    :returns: The absolute path to the cache directory
+    :rtype: str
+    """
+    root = os.getenv("NEKO_CACHE_DIR")
+    if not root:
+        xdg_cache = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        root = os.path.join(xdg_cache, "qiskit-neko")
+    path = os.path.abspath(os.path.join(root, *parts))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def read_json(path):
+    """Read a json file from the cache returning ``None`` if it's missing or invalid."""
+    try:
+        with open(path, "r", encoding="utf8") as fd:
+            return json.load(fd)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path, data):
+    """Atomically write a json file to the cache.
+
+    The data is written to a temporary file which is then renamed over
+    ``path`` so that concurrent test workers never observe a partially
+    written file.
+    """
+    write_bytes(path, json.dumps(data).encode("utf8"))
+
+
+def write_bytes(path, data):
+    """Atomically write a binary file to the cache.
+
+    The data is written to a temporary file which is then renamed over
+    ``path`` so that concurrent test workers never observe a partially
+    written file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -14,6 +14,7 @@
 
 
 import logging
+import os
 
 import voluptuous as vol
 import yaml
@@ -30,10 +31,36 @@ schema = vol.Schema(
         vol.Optional("backend_plugin", default="aer"): str,
         vol.Optional("backend_selection"): str,
         vol.Optional("backend_script"): str,
+        vol.Optional("reuse_backends"): bool,
+        vol.Optional("fanout_backends"): {str: str},
+        vol.Optional("test_workers"): vol.All(int, vol.Range(min=1)),
+        vol.Optional("worker_threads"): vol.All(int, vol.Range(min=1)),
+        vol.Optional("transpile_cache_size"): vol.All(int, vol.Range(min=0)),
+        vol.Optional("transpile_cache_dir"): str,
+        vol.Optional("job_poll_interval"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional("job_poll_max_interval"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional("job_poll_backoff"): vol.All(vol.Coerce(float), vol.Range(min=1)),
+        vol.Optional("job_timeout"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional("time_budget"): {
+            vol.Optional("tests"): {str: vol.All(vol.Coerce(float), vol.Range(min=0))},
+            vol.Optional("components"): {str: vol.All(vol.Coerce(float), vol.Range(min=0))},
+        },
+        vol.Optional("timing_db"): str,
+        vol.Optional("track_memory"): bool,
+        vol.Optional("memory_budget"): {
+            vol.Optional("tests"): {str: vol.All(vol.Coerce(float), vol.Range(min=0))},
+            vol.Optional("components"): {str: vol.All(vol.Coerce(float), vol.Range(min=0))},
+        },
+        vol.Optional("baseline_file"): str,
+        vol.Optional("baseline_tolerance"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional("baseline_grace"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional("record_baseline"): bool,
+        vol.Optional("performance_action"): vol.Any("fail", "warn"),
         vol.Optional("default_log_level", default="INFO"): LOG_LEVEL_VALIDATOR,
         vol.Optional("module_log_level"): {vol.Extra: LOG_LEVEL_VALIDATOR},
         vol.Optional("log_format"): str,
         vol.Optional("log_file"): str,
+        vol.Optional("log_file_json"): bool,
     }
 )
 
@@ -57,3 +84,84 @@ class NekoConfig:
         with open(self.filename, "r", encoding="utf8") as fd:
             raw_config = yaml.safe_load(fd.read())
         self.config = schema(raw_config)
+
+
+# Map of resolved config file paths to (stat key, NekoConfig) tuples
+_CONFIG_CACHE = {}
+# Map of (NekoConfigPath, cwd, home dir) to the config file path found for them
+_CONFIG_PATH_CACHE = {}
+
+DEFAULT_CONFIG_FILENAME = "neko_config.yml"
+
+
+def _search_config_path():
+    env_var = os.getenv("NekoConfigPath", None)
+    if env_var is not None:
+        if not os.path.isfile(env_var):
+            LOG.warning(
+                "NekoConfigPath environment variable set to %s, however no file "
+                "exists at this path. This value is being ignored.",
+                env_var,
+            )
+        else:
+            return env_var
+    home_dir = os.path.expanduser("~")
+    search_locations = [
+        os.path.join(os.getcwd(), DEFAULT_CONFIG_FILENAME),
+        os.path.join(home_dir, ".qiskit", DEFAULT_CONFIG_FILENAME),
+        os.path.join(home_dir, ".config", "qiskit-neko", DEFAULT_CONFIG_FILENAME),
+        os.path.join("/etc", DEFAULT_CONFIG_FILENAME),
+    ]
+    found = None
+    for path in search_locations:
+        if os.path.isfile(path):
+            LOG.info("Loading configuration file from %s", path)
+            found = path
+    return found
+
+
+def find_config_path():
+    """Find the path of the configuration file to use.
+
+    The search locations are only checked the first time this is called in a
+    process (for the current ``NekoConfigPath`` environment variable, working
+    directory and home directory), subsequent calls reuse the result. Use
+    :func:`clear_config_cache` to force a new search.
+
+    :returns: The path to the configuration file or ``None`` if no
+        configuration file could be found.
+    :rtype: str
+    """
+    key = (os.getenv("NekoConfigPath", None), os.getcwd(), os.path.expanduser("~"))
+    if key not in _CONFIG_PATH_CACHE:
+        _CONFIG_PATH_CACHE[key] = _search_config_path()
+    return _CONFIG_PATH_CACHE[key]
+
+
+def load_config(filename):
+    """Return a configuration object for a configuration file.
+
+    The parsed configuration is cached for the life of the process and is
+    reused as long as the resolved path, modification time and size of the
+    file are unchanged.
+
+    :param str filename: The path to the configuration file to load
+    :returns: The configuration object for the file
+    :rtype: NekoConfig
+    :raises OSError: If the file can't be accessed
+    """
+    path = os.path.realpath(filename)
+    stat = os.stat(path)
+    stat_key = (stat.st_mtime_ns, stat.st_size)
+    cached = _CONFIG_CACHE.get(path)
+    if cached is not None and cached[0] == stat_key:
+        return cached[1]
+    config_obj = NekoConfig(path)
+    _CONFIG_CACHE[path] = (stat_key, config_obj)
+    return config_obj
+
+
+def clear_config_cache():
+    """Clear all cached configuration objects and configuration file paths."""
+    _CONFIG_CACHE.clear()
+    _CONFIG_PATH_CACHE.clear()
@@ -0,0 +1,253 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""A backend plugin which simulates the latency and failures of a remote service."""
+
+import collections
+import dataclasses
+import logging
+import random
+import threading
+import time
+import uuid
+
+from qiskit.providers import JobError, JobStatus, JobV1
+
+from qiskit_neko import aer_plugin
+from qiskit_neko import backend_plugin
+from qiskit_neko import wrapper_backend
+
+LOG = logging.getLogger(__name__)
+
+
+class RateLimitError(JobError):
+    """Raised when a job is submitted faster than the backend's rate limit.
+
+    :param str message: The error message
+    :param float retry_after: The number of seconds until a job can be submitted
+    """
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TransientJobError(JobError):
+    """Raised by :meth:`LatencyJob.result` for jobs which were made to fail."""
+
+
+@dataclasses.dataclass
+class LatencySettings:
+    """The simulated behavior of a :class:`LatencyBackend`.
+
+    :param float queue: The mean time in seconds a job waits in the queue
+    :param float run: The minimum time in seconds a job spends running
+    :param float jitter: The fraction the queue and run times randomly vary by
+    :param float fail: The probability of a job ending in the ``ERROR`` state
+    :param int rate: The maximum number of jobs which can be submitted in
+        ``window`` seconds, 0 for no limit
+    :param float window: The length in seconds of the rate limit window
+    :param int max_jobs: The maximum number of unfinished jobs, 0 for no limit
+    :param int seed: The seed for the random delays and failures
+    """
+
+    queue: float = 0.0
+    run: float = 0.0
+    jitter: float = 0.0
+    fail: float = 0.0
+    rate: int = 0
+    window: float = 1.0
+    max_jobs: int = 0
+    seed: int = None
+
+    @classmethod
+    def from_string(cls, settings):
+        """Create the settings from a ``key=value`` comma separated string.
+
+        :param str settings: The settings, for example ``queue=2,fail=0.1``
+        :raises ValueError: If a key is unknown or a value is invalid
+        """
+        types = {field.name: field.type for field in dataclasses.fields(cls)}
+        kwargs = {}
+        for item in filter(None, (settings or "").split(",")):
+            key, sep, value = item.partition("=")
+            key = key.strip()
+            if not sep or key not in types:
+                raise ValueError(f"Invalid latency setting {item!r}, valid keys are {list(types)}")
+            try:
+                kwargs[key] = int(value) if types[key] is int else float(value)
+            except ValueError:
+                raise ValueError(f"Invalid value for latency setting {item!r}") from None
+        return cls(**kwargs)
+
+
+class LatencyJob(JobV1):
+    """A job which reports queued and running states before the wrapped job's.
+
+    The status is derived from the time since submission so no threads are
+    used: the job is ``QUEUED`` for its queue delay, then ``RUNNING`` until
+    both its run delay has passed and the wrapped job has finished, and then
+    ``DONE`` (or ``ERROR`` if it was chosen to fail).
+    """
+
+    def __init__(self, backend, job, queue_delay, run_delay, fail):
+        super().__init__(backend, str(uuid.uuid4()))
+        self._job = job
+        self._submitted = time.monotonic()
+        self._queue_delay = queue_delay
+        self._run_delay = run_delay
+        self._fail = fail
+        self._cancelled = False
+
+    def submit(self):
+        pass
+
+    def _elapsed(self):
+        return time.monotonic() - self._submitted
+
+    def status(self):
+        if self._cancelled:
+            return JobStatus.CANCELLED
+        elapsed = self._elapsed()
+        if elapsed < self._queue_delay:
+            return JobStatus.QUEUED
+        if elapsed < self._queue_delay + self._run_delay or not self._job.in_final_state():
+            return JobStatus.RUNNING
+        return JobStatus.ERROR if self._fail else JobStatus.DONE
+
+    def result(self, timeout=None):  # pylint: disable=arguments-differ
+        if self._cancelled:
+            raise JobError(f"Job {self.job_id()} was cancelled")
+        remaining = self._queue_delay + self._run_delay - self._elapsed()
+        if timeout is not None and remaining > timeout:
+            time.sleep(timeout)
+            raise JobError(f"Timed out waiting for job {self.job_id()}")
+        if remaining > 0:
+            time.sleep(remaining)
+        result = self._job.result()
+        if self._fail:
+            raise TransientJobError(f"Job {self.job_id()} failed with a simulated transient error")
+        result.job_id = self.job_id()
+        return result
+
+    def cancel(self):
+        if self.status() in (JobStatus.QUEUED, JobStatus.RUNNING):
+            self._cancelled = True
+            self._job.cancel()
+            return True
+        return False
+
+
+class LatencyBackend(wrapper_backend.WrappedBackend):
+    """A backend which adds the latency and failures of a remote service.
+
+    Circuits are run on the wrapped backend as soon as they're submitted and
+    the returned :class:`LatencyJob` delays reporting their results. Submitting
+    a job raises :class:`RateLimitError` when more than ``settings.rate`` jobs
+    were submitted in the last ``settings.window`` seconds or when
+    ``settings.max_jobs`` jobs haven't finished yet. It's safe to submit jobs
+    from several threads.
+
+    :param backend: The backend to wrap
+    :param LatencySettings settings: The simulated behavior
+    """
+
+    def __init__(self, backend, settings=None):
+        super().__init__(backend)
+        self.settings = settings or LatencySettings()
+        self._random = random.Random(self.settings.seed)
+        self._lock = threading.Lock()
+        self._submissions = collections.deque()
+        self._jobs = []
+
+    def __getstate__(self):
+        # Copies (qiskit-experiments deep copies backends) get their own limits
+        state = self.__dict__.copy()
+        del state["_lock"], state["_submissions"], state["_jobs"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._submissions = collections.deque()
+        self._jobs = []
+
+    def _delay(self, mean):
+        jitter = self.settings.jitter
+        return max(0.0, mean * (1 + self._random.uniform(-jitter, jitter)))
+
+    def _check_limits(self, now):
+        settings = self.settings
+        if settings.rate:
+            while self._submissions and now - self._submissions[0] >= settings.window:
+                self._submissions.popleft()
+            if len(self._submissions) >= settings.rate:
+                retry_after = settings.window - (now - self._submissions[0])
+                raise RateLimitError(
+                    f"Rate limit of {settings.rate} jobs per {settings.window}s exceeded",
+                    retry_after,
+                )
+        if settings.max_jobs:
+            self._jobs = [job for job in self._jobs if not job.in_final_state()]
+            if len(self._jobs) >= settings.max_jobs:
+                raise RateLimitError(
+                    f"Limit of {settings.max_jobs} unfinished jobs exceeded", settings.window
+                )
+
+    def run(self, run_input, **options):
+        with self._lock:
+            now = time.monotonic()
+            self._check_limits(now)
+            queue_delay = self._delay(self.settings.queue)
+            run_delay = self._delay(self.settings.run)
+            fail = self._random.random() < self.settings.fail
+            job = LatencyJob(
+                self, self._backend.run(run_input, **options), queue_delay, run_delay, fail
+            )
+            if self.settings.rate:
+                self._submissions.append(now)
+            if self.settings.max_jobs:
+                self._jobs.append(job)
+        LOG.debug(
+            "Submitted job %s: queue %.3fs, run %.3fs, fail %s",
+            job.job_id(),
+            queue_delay,
+            run_delay,
+            fail,
+        )
+        return job
+
+
+class LatencyBackendPlugin(backend_plugin.BackendPlugin):
+    """A backend plugin for an Aer backend which behaves like a remote service.
+
+    The backend selection string has the form ``settings[:selection]`` where
+    ``settings`` is a comma separated list of ``key=value`` pairs for the
+    fields of :class:`LatencySettings` and ``selection`` is the selection
+    string for :class:`~qiskit_neko.aer_plugin.AerBackendPlugin`. For example
+    ``queue=2,jitter=0.5,fail=0.05,rate=10:fake_sherbrooke`` returns the
+    ``fake_sherbrooke`` backend where jobs wait around 2 seconds in the queue,
+    5% of them fail and at most 10 jobs can be submitted per second.
+    """
+
+    wraps_plugins = True
+
+    def __init__(self):
+        super().__init__()
+        self._aer_plugin = None
+
+    def get_backend(self, backend_selection=None):
+        settings, _, selection = (backend_selection or "").partition(":")
+        settings = LatencySettings.from_string(settings)
+        if self._aer_plugin is None:
+            self._aer_plugin = aer_plugin.AerBackendPlugin()
+        return LatencyBackend(self._aer_plugin.get_backend(selection or None), settings)
@@ -0,0 +1,103 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Queued log file handlers shared by all the tests in a process."""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+
+# Map of resolved log file paths to (settings, queue handler, queue listener)
+_LOG_FILES = {}
+_LOCK = threading.Lock()
+
+
+class JSONFormatter(logging.Formatter):
+    """Format log records as single line JSON objects."""
+
+    def format(self, record):
+        data = {
+            "time": record.created,
+            "level": record.levelname,
+            "name": record.name,
+            "process": record.process,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            data["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(data)
+
+
+def _close(path):
+    _, queue_handler, listener = _LOG_FILES.pop(path)
+    logging.getLogger("").removeHandler(queue_handler)
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+def configure_log_file(path, log_format, level=None, json_lines=False):
+    """Write all log messages in this process to a file.
+
+    The file is written by a single :class:`~logging.FileHandler` per file
+    which is run by a :class:`~logging.handlers.QueueListener` in a background
+    thread, so writing log messages doesn't block the test. A
+    :class:`~logging.handlers.QueueHandler` is added to the root logger to put
+    the log messages on the queue. Calling this again with the same path
+    reuses the existing handler, unless the settings changed in which case
+    the existing handler is closed and replaced.
+
+    :param str path: The path of the log file, messages are appended to it
+    :param str log_format: The log format string for the messages
+    :param str level: The minimum level of messages to write to the file
+    :param bool json_lines: If set messages are written as JSON lines (see
+        :class:`JSONFormatter`) instead of with ``log_format``
+    :returns: The queue handler added to the root logger
+    :rtype: logging.handlers.QueueHandler
+    """
+    path = os.path.realpath(path)
+    settings = (log_format, level, json_lines)
+    with _LOCK:
+        existing = _LOG_FILES.get(path)
+        if existing is not None:
+            if existing[0] == settings:
+                return existing[1]
+            _close(path)
+        file_handler = logging.FileHandler(path)
+        file_handler.setFormatter(JSONFormatter() if json_lines else logging.Formatter(log_format))
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        if level:
+            file_handler.setLevel(level)
+            queue_handler.setLevel(level)
+        listener = logging.handlers.QueueListener(
+            log_queue, file_handler, respect_handler_level=True
+        )
+        listener.start()
+        logging.getLogger("").addHandler(queue_handler)
+        _LOG_FILES[path] = (settings, queue_handler, listener)
+        return queue_handler
+
+
+@atexit.register
+def close_log_files():
+    """Flush and close all the log files opened by :func:`configure_log_file`."""
+    with _LOCK:
+        for path in list(_LOG_FILES):
+            _close(path)
@@ -0,0 +1,412 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""A static manifest of the tests in the test suite.
+
+Listing the tests with ``stestr list`` (and running a subset of them with
+``stestr run``) imports every test module, and through them qiskit and the
+other Qiskit projects being tested. The manifest is built by parsing the test
+modules with :mod:`ast` instead, so tests can be selected by their id and the
+component attributes set with :func:`qiskit_neko.decorators.component_attr`
+without importing anything. Running::
+
+    python -m qiskit_neko.manifest run --exclude-attr machine_learning
+
+then only imports the test modules of the selected tests.
+"""
+
+import argparse
+import ast
+import hashlib
+import importlib
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import ddt
+
+from qiskit_neko import cache
+from qiskit_neko import thread_budget
+
+LOG = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 2
+MANIFEST_CACHE_FILENAME = "test_manifest.json"
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests")
+
+
+class _DynamicTests(Exception):
+    """Raised when the tests in a module can't be determined statically."""
+
+
+def _decorator_name(node):
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    return None
+
+
+def _module_constants(tree):
+    constants = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target = node.targets[0]
+            if isinstance(target, ast.Name):
+                try:
+                    constants[target.id] = ast.literal_eval(node.value)
+                except (TypeError, ValueError):
+                    constants.pop(target.id, None)
+    return constants
+
+
+def _evaluate(node, constants):
+    if isinstance(node, ast.Name):
+        if node.id not in constants:
+            raise _DynamicTests(f"Can't resolve {node.id!r}")
+        return constants[node.id]
+    try:
+        return ast.literal_eval(node)
+    except (TypeError, ValueError) as err:
+        raise _DynamicTests(f"Can't evaluate {ast.dump(node)}") from err
+
+
+def _data_values(call, constants):
+    values = []
+    for arg in call.args:
+        if isinstance(arg, ast.Starred):
+            values.extend(_evaluate(arg.value, constants))
+        else:
+            values.append(_evaluate(arg, constants))
+    return values
+
+
+def _ddt_name_format(decorator):
+    if isinstance(decorator, ast.Call):
+        for keyword in decorator.keywords:
+            if keyword.arg == "testNameFormat":
+                if _decorator_name(keyword.value) == "INDEX_ONLY":
+                    return ddt.TestNameFormat.INDEX_ONLY
+    return ddt.TestNameFormat.DEFAULT
+
+
+def _scan_method(node, constants):
+    attrs = set()
+    data = None
+    index_len = None
+    for decorator in node.decorator_list:
+        name = _decorator_name(decorator)
+        if name == "component_attr" and isinstance(decorator, ast.Call):
+            # The attributes are only applied if the condition is true, so
+            # modules with conditions which aren't constants are imported
+            condition = True
+            for keyword in decorator.keywords:
+                if keyword.arg == "condition":
+                    condition = _evaluate(keyword.value, constants)
+            if condition is None or condition:
+                attrs.update(_evaluate(arg, constants) for arg in decorator.args)
+        elif name == "attr" and isinstance(decorator, ast.Call):
+            attrs.update(_evaluate(arg, constants) for arg in decorator.args)
+        elif name == "data" and isinstance(decorator, ast.Call):
+            data = _data_values(decorator, constants)
+        elif name == "idata" and isinstance(decorator, ast.Call):
+            data = list(_evaluate(decorator.args[0], constants))
+            for keyword in decorator.keywords:
+                if keyword.arg == "index_len":
+                    index_len = _evaluate(keyword.value, constants)
+        elif name == "file_data":
+            raise _DynamicTests("file_data tests can't be listed statically")
+    if data is not None and index_len is None:
+        index_len = len(str(len(data)))
+    return attrs, data, index_len
+
+
+def _scan_class(node, constants, classes):
+    name_format = None
+    for decorator in node.decorator_list:
+        if _decorator_name(decorator) == "ddt":
+            name_format = _ddt_name_format(decorator)
+    methods = {}
+    # Test methods inherited from other classes in the same module
+    for base in node.bases:
+        if isinstance(base, ast.Name) and base.id in classes:
+            methods.update(classes[base.id])
+    for item in node.body:
+        if not isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        methods.pop(item.name, None)
+        if not item.name.startswith("test"):
+            continue
+        attrs, data, index_len = _scan_method(item, constants)
+        if data is None or name_format is None:
+            methods[item.name] = attrs
+            continue
+        for index, value in enumerate(data):
+            test_name = ddt.mk_test_name(item.name, value, index, index_len, name_format)
+            methods[test_name] = attrs
+    classes[node.name] = methods
+    return methods
+
+
+def scan_source(source, module_name):
+    """Find the tests defined in the source of a test module.
+
+    :param str source: The source code of the module
+    :param str module_name: The name of the module
+    :returns: A list of dictionaries with the ``id`` (without attributes)
+        and sorted list of ``attrs`` of each test
+    :rtype: list
+    :raises _DynamicTests: If the tests can't be determined statically
+    """
+    tree = ast.parse(source)
+    constants = _module_constants(tree)
+    classes = {}
+    tests = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        methods = _scan_class(node, constants, classes)
+        if node.name.startswith("_"):
+            continue
+        for method_name, attrs in sorted(methods.items()):
+            tests.append({"id": f"{module_name}.{node.name}.{method_name}", "attrs": sorted(attrs)})
+    return tests
+
+
+def _import_tests(module_name):
+    LOG.info("Importing %s to find its tests", module_name)
+    suite = unittest.defaultTestLoader.loadTestsFromModule(importlib.import_module(module_name))
+    tests = []
+
+    def _walk(suite):
+        for test in suite:
+            if isinstance(test, unittest.TestSuite):
+                _walk(test)
+            else:
+                test_id = unittest.TestCase.id(test)
+                attrs = getattr(getattr(test, test._testMethodName, None), "__testtools_attrs", ())
+                tests.append({"id": test_id, "attrs": sorted(attrs)})
+
+    _walk(suite)
+    return tests
+
+
+def _module_name(path):
+    # Walk up the package directories (with an __init__.py) of the module
+    directory, filename = os.path.split(os.path.abspath(path))
+    parts = [os.path.splitext(filename)[0]]
+    while os.path.isfile(os.path.join(directory, "__init__.py")):
+        directory, package = os.path.split(directory)
+        parts.append(package)
+    return ".".join(reversed(parts))
+
+
+def build_manifest(test_dir=TEST_DIR, cache_file=None):
+    """Build the manifest of the tests in a test directory.
+
+    Each test module is parsed once and the result is cached by the sha256
+    hash of the module's source, so only new or modified modules are parsed
+    again. Modules where the tests can't be determined statically (for
+    example ``ddt`` data which isn't a literal) are imported instead.
+
+    :param str test_dir: The test directory, module names are found from the
+        package directories (with an ``__init__.py``) containing each module
+        (``qiskit_neko/tests`` by default)
+    :param str cache_file: The path of the cache file, by default
+        ``test_manifest.json`` in the qiskit-neko cache directory
+    :returns: A list of dictionaries with the ``id`` and ``attrs`` of each
+        test
+    :rtype: list
+    """
+    if cache_file is None:
+        try:
+            cache_file = os.path.join(cache.get_cache_dir(), MANIFEST_CACHE_FILENAME)
+        except OSError as err:
+            LOG.warning("Unable to use cache directory for the test manifest: %s", err)
+    cached = cache.read_json(cache_file) if cache_file else None
+    if not isinstance(cached, dict) or cached.get("version") != MANIFEST_VERSION:
+        cached = {"version": MANIFEST_VERSION, "files": {}}
+    files = {}
+    tests = []
+    updated = False
+    for root, dirs, filenames in os.walk(test_dir):
+        dirs.sort()
+        for filename in sorted(filenames):
+            if not (filename.startswith("test") and filename.endswith(".py")):
+                continue
+            path = os.path.join(root, filename)
+            with open(path, "rb") as fd:
+                source = fd.read()
+            digest = hashlib.sha256(source).hexdigest()
+            module_name = _module_name(path)
+            entry = cached["files"].get(path)
+            if entry is None or entry["sha256"] != digest:
+                try:
+                    entry = {"sha256": digest, "tests": scan_source(source, module_name)}
+                except _DynamicTests as err:
+                    LOG.info("Tests in %s can't be found statically: %s", module_name, err)
+                    tests.extend(_import_tests(module_name))
+                    continue
+                updated = True
+            files[path] = entry
+            tests.extend(entry["tests"])
+    if cache_file and (updated or files.keys() != cached["files"].keys()):
+        try:
+            cache.write_json(cache_file, {"version": MANIFEST_VERSION, "files": files})
+        except OSError as err:
+            LOG.warning("Unable to write the test manifest cache %s: %s", cache_file, err)
+    return tests
+
+
+def format_test_id(test):
+    """Return the id of a test from the manifest as listed by ``stestr list``."""
+    if test["attrs"]:
+        return f"{test['id']}[{','.join(test['attrs'])}]"
+    return test["id"]
+
+
+def select_tests(tests, filters=None, attrs=None, exclude_attrs=None):
+    """Select tests from the manifest.
+
+    :param list tests: The tests in the manifest as returned by
+        :func:`build_manifest`
+    :param list filters: Regexes, if set a test is only selected if one of
+        them matches its id (including the attributes, as with ``stestr``)
+    :param list attrs: Component attributes which a test must all have to
+        be selected
+    :param list exclude_attrs: Component attributes which a test must have
+        none of to be selected
+    :returns: The selected tests
+    :rtype: list
+    """
+    patterns = [re.compile(pattern) for pattern in filters or []]
+    required = set(attrs or [])
+    excluded = set(exclude_attrs or [])
+    selected = []
+    for test in tests:
+        test_attrs = set(test["attrs"])
+        if not required.issubset(test_attrs) or excluded & test_attrs:
+            continue
+        if patterns and not any(pattern.search(format_test_id(test)) for pattern in patterns):
+            continue
+        selected.append(test)
+    return selected
+
+
+def run_tests(test_ids, concurrency=1, subunit=False):
+    """Run tests by id in subprocesses without test discovery.
+
+    The tests are split between ``concurrency`` ``python -m subunit.run``
+    worker processes, which only import the modules of the tests they run,
+    and the results are loaded into the stestr repository with
+    ``stestr load``. The ``NEKO_WORKERS`` environment variable is set to the
+    number of workers unless it's already set, so each worker's simulators
+    only use its share of the CPUs (see :mod:`qiskit_neko.thread_budget`).
+
+    :param list test_ids: The ids of the tests to run (without attributes)
+    :param int concurrency: The number of worker processes to use
+    :param bool subunit: If set the subunit streams are written to stdout
+        instead of being loaded into the stestr repository
+    :returns: The exit code of ``stestr load`` (or ``0`` if ``subunit`` is
+        set)
+    :rtype: int
+    """
+    partitions = [test_ids[index::concurrency] for index in range(concurrency)]
+    partitions = [partition for partition in partitions if partition]
+    # Let the workers split the CPUs between them
+    env = dict(os.environ)
+    env.setdefault(thread_budget.WORKERS_ENV, str(len(partitions)))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        streams = []
+        procs = []
+        for index, partition in enumerate(partitions):
+            stream_path = os.path.join(tmpdir, f"worker-{index}.subunit")
+            streams.append(stream_path)
+            with open(stream_path, "wb") as stream:
+                procs.append(
+                    subprocess.Popen(  # pylint: disable=consider-using-with
+                        [sys.executable, "-m", "subunit.run", *partition], stdout=stream, env=env
+                    )
+                )
+        for proc in procs:
+            proc.wait()
+        # Subunit v2 streams can be concatenated into a single stream
+        combined_path = os.path.join(tmpdir, "combined.subunit")
+        with open(combined_path, "wb") as combined:
+            for stream_path in streams:
+                with open(stream_path, "rb") as stream:
+                    shutil.copyfileobj(stream, combined)
+        if subunit:
+            with open(combined_path, "rb") as combined:
+                shutil.copyfileobj(combined, sys.stdout.buffer)
+            sys.stdout.buffer.flush()
+            return 0
+        return subprocess.run(
+            [sys.executable, "-m", "stestr", "load", combined_path], check=False
+        ).returncode
+
+
+def main(argv=None):
+    """Entry point for ``python -m qiskit_neko.manifest``."""
+    parser = argparse.ArgumentParser(
+        prog="python -m qiskit_neko.manifest",
+        description="List or run tests using a static manifest.",
+    )
+    parser.add_argument("command", choices=["list", "run"], help="The action to perform")
+    parser.add_argument("filters", nargs="*", help="Regexes to select tests by id")
+    parser.add_argument(
+        "-a",
+        "--attr",
+        action="append",
+        default=[],
+        help="Only select tests with this component attribute, can be repeated",
+    )
+    parser.add_argument(
+        "-x",
+        "--exclude-attr",
+        action="append",
+        default=[],
+        help="Don't select tests with this component attribute, can be repeated",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=os.cpu_count(),
+        help="The number of worker processes for run",
+    )
+    parser.add_argument(
+        "--subunit", action="store_true", help="Write the subunit streams of run to stdout"
+    )
+    parser.add_argument("--test-dir", default=TEST_DIR, help="The test directory to scan")
+    args = parser.parse_intermixed_args(argv)
+    tests = select_tests(build_manifest(args.test_dir), args.filters, args.attr, args.exclude_attr)
+    if args.command == "list":
+        for test in tests:
+            print(format_test_id(test))
+        return 0
+    if not tests:
+        print("No tests selected", file=sys.stderr)
+        return 1
+    return run_tests([test["id"] for test in tests], args.concurrency, args.subunit)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Time budgets and baselines for detecting performance regressions."""
+
+import fnmatch
+import json
+import logging
+import os
+import statistics
+import time
+import tracemalloc
+
+LOG = logging.getLogger(__name__)
+
+# Map of resolved baseline file paths to (stat key, baseline dict) tuples
+_BASELINE_CACHE = {}
+
+# Phases of setUp whose duration depends on whether earlier tests in the same
+# process already loaded the plugin and built the (pooled) backend
+SETUP_PHASES = ("config_load", "plugin_load", "backend_creation")
+
+# Phases doing work on behalf of other tests, such as building and running a
+# batch of circuits shared by a group of tests, which only the first test in
+# the group spends
+SHARED_PHASES = ("shared_batch",)
+
+
+class PerformanceWarning(UserWarning):
+    """Warning emitted when a test exceeds its time budget or baseline."""
+
+
+def _baseline_key(test_id, backend_plugin, backend_selection):
+    return (test_id, backend_plugin, backend_selection)
+
+
+def load_baseline(path):
+    """Load a baseline file.
+
+    A baseline file is a JSON lines file where each line is a JSON object with
+    the ``test_id``, ``backend_plugin``, ``backend_selection`` and
+    ``timings`` (a mapping of phase names to seconds, as recorded by the base
+    test class) of a single test run. When a test has been recorded more than
+    once the median of the recorded times is used. Lines that can't be parsed
+    are ignored.
+
+    The parsed baseline is cached for the life of the process and reused as
+    long as the modification time and size of the file are unchanged.
+
+    :param str path: The path to the baseline file
+    :returns: A dictionary mapping ``(test_id, backend_plugin,
+        backend_selection)`` tuples to dictionaries of phase names to the
+        baseline time in seconds. If the file doesn't exist an empty
+        dictionary is returned.
+    :rtype: dict
+    """
+    path = os.path.realpath(path)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return {}
+    stat_key = (stat.st_mtime_ns, stat.st_size)
+    cached = _BASELINE_CACHE.get(path)
+    if cached is not None and cached[0] == stat_key:
+        return cached[1]
+    samples = {}
+    with open(path, "r", encoding="utf8") as fd:
+        for line in fd:
+            try:
+                record = json.loads(line)
+                key = _baseline_key(
+                    record["test_id"],
+                    record.get("backend_plugin"),
+                    record.get("backend_selection"),
+                )
+                timings = record["timings"]
+            except (ValueError, KeyError, TypeError):
+                continue
+            for phase, value in timings.items():
+                samples.setdefault(key, {}).setdefault(phase, []).append(value)
+    baseline = {
+        key: {phase: statistics.median(values) for phase, values in phases.items()}
+        for key, phases in samples.items()
+    }
+    _BASELINE_CACHE[path] = (stat_key, baseline)
+    return baseline
+
+
+def record_baseline(path, test_id, backend_plugin, backend_selection, timings):
+    """Append the timings of a test run to a baseline file.
+
+    Each record is written with a single append so test workers running in
+    parallel can record to the same file.
+
+    :param str path: The path to the baseline file
+    :param str test_id: The id of the test
+    :param str backend_plugin: The name of the backend plugin used by the test
+    :param str backend_selection: The backend selection string used by the test
+    :param dict timings: A mapping of phase names to seconds
+    """
+    record = {
+        "test_id": test_id,
+        "backend_plugin": backend_plugin,
+        "backend_selection": backend_selection,
+        "timestamp": time.time(),
+        "timings": timings,
+    }
+    with open(path, "a", encoding="utf8") as fd:
+        fd.write(json.dumps(record) + "\n")
+
+
+def find_budget(budgets, test_id, components=()):
+    """Find the budget which applies to a test.
+
+    :param dict budgets: A budget configuration such as ``time_budget`` or
+        ``memory_budget``, a dictionary with optional ``tests`` (a mapping of
+        test id glob patterns to budgets) and ``components`` (a mapping of
+        component attribute names to budgets) keys
+    :param str test_id: The id of the test
+    :param components: The component attributes of the test
+    :returns: A tuple of the smallest applicable budget and a description of
+        where it's from, or ``(None, None)`` if no budget applies to the test
+    :rtype: tuple
+    """
+    candidates = []
+    for pattern, budget in (budgets or {}).get("tests", {}).items():
+        if fnmatch.fnmatchcase(test_id, pattern):
+            candidates.append((budget, f"test budget {pattern!r}"))
+    component_budgets = (budgets or {}).get("components", {})
+    for component in sorted(components):
+        if component in component_budgets:
+            candidates.append((component_budgets[component], f"component budget {component!r}"))
+    if not candidates:
+        return None, None
+    return min(candidates, key=lambda candidate: candidate[0])
+
+
+def checked_time(timings):
+    """Return the time of a test which is checked against budgets and baselines.
+
+    This is the ``total`` time of the test minus the :data:`SETUP_PHASES` and
+    :data:`SHARED_PHASES`, so the result doesn't depend on which test in a
+    worker process built the shared backend or batch first.
+
+    :param dict timings: A mapping of phase names to seconds, including the
+        ``total`` time of the test
+    :rtype: float
+    """
+    excluded = SETUP_PHASES + SHARED_PHASES
+    return timings["total"] - sum(timings.get(phase, 0.0) for phase in excluded)
+
+
+def check_timings(timings, budget=None, baseline=None, tolerance=0.5, grace=0.5):
+    """Check the time of a test against its time budget and baseline.
+
+    The times compared are returned by :func:`checked_time`, so they exclude
+    the setup phases of the test.
+
+    :param dict timings: A mapping of phase names to seconds, including the
+        ``total`` time of the test
+    :param tuple budget: The budget and its description as returned by
+        :func:`find_budget`
+    :param dict baseline: The baseline timings for the test
+    :param float tolerance: The fraction the total time is allowed to exceed
+        the baseline by
+    :param float grace: An absolute time in seconds the total time is allowed
+        to exceed the baseline by in addition to ``tolerance``, this avoids
+        spurious failures from tests which only take a few milliseconds
+    :returns: A list of messages describing each exceeded limit
+    :rtype: list
+    """
+    elapsed = checked_time(timings)
+    problems = []
+    if budget is not None and budget[0] is not None and elapsed > budget[0]:
+        problems.append(f"Test took {elapsed:.3f}s which exceeds the {budget[1]} of {budget[0]}s")
+    if baseline and "total" in baseline:
+        expected = checked_time(baseline)
+        limit = expected * (1 + tolerance) + grace
+        if elapsed > limit:
+            problems.append(
+                f"Test took {elapsed:.3f}s which exceeds its baseline of "
+                f"{expected:.3f}s by more than the tolerance of "
+                f"{tolerance:.0%} (+{grace}s)"
+            )
+    return problems
+
+
+class MemoryTracker:
+    """Track the Python memory allocated while running a test with :mod:`tracemalloc`.
+
+    Only memory allocated through the Python memory allocators (which includes
+    numpy arrays) is tracked, memory allocated directly by compiled extensions
+    such as the Aer simulators isn't.
+    """
+
+    def __init__(self):
+        self._started_tracing = False
+        self._start_size = 0
+
+    def start(self):
+        """Start tracking memory allocations."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        elif hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        self._start_size = tracemalloc.get_traced_memory()[0]
+
+    def stop(self):
+        """Stop tracking memory allocations.
+
+        :returns: A dictionary with the ``peak`` memory allocated since
+            :meth:`start` was called and the ``net`` memory still allocated,
+            both in bytes
+        :rtype: dict
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        net = current - self._start_size
+        return {"peak": max(peak - self._start_size, net, 0), "net": net}
+
+
+def check_memory(memory, budget=None):
+    """Check the peak memory allocated by a test against its memory budget.
+
+    :param dict memory: The memory usage as returned by
+        :meth:`MemoryTracker.stop`
+    :param tuple budget: The budget in MiB and its description as returned by
+        :func:`find_budget`
+    :returns: A list of messages describing each exceeded limit
+    :rtype: list
+    """
+    if budget is None or budget[0] is None:
+        return []
+    peak = memory["peak"] / 2**20
+    if peak > budget[0]:
+        return [
+            f"Test allocated a peak of {peak:.1f} MiB which exceeds the {budget[1]} of {budget[0]} MiB"
+        ]
+    return []
+
+
+def clear_baseline_cache():
+    """Clear the cache of loaded baseline files."""
+    _BASELINE_CACHE.clear()
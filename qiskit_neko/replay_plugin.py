@@ -0,0 +1,245 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""A backend plugin which records and replays the results of another plugin's backend."""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+import uuid
+import zlib
+
+from qiskit.providers import JobError, JobStatus, JobV1
+from qiskit.result import Result
+
+from qiskit_neko import backend_plugin
+from qiskit_neko import cache
+from qiskit_neko import thread_budget
+from qiskit_neko import transpile_cache
+from qiskit_neko import wrapper_backend
+
+LOG = logging.getLogger(__name__)
+
+MODES = ("auto", "record", "replay")
+
+
+class ReplayMissError(JobError):
+    """Raised in replay mode when there is no recorded result for a job."""
+
+
+def _option_fingerprint(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_option_fingerprint(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _option_fingerprint(item) for key, item in sorted(value.items())}
+    if hasattr(value, "item") and not hasattr(value, "__len__"):
+        # numpy scalars
+        return value.item()
+    # Other objects (such as noise models) are determined by the backend
+    return f"{type(value).__module__}.{type(value).__qualname__}"
+
+
+def job_key(backend_name, circuits, options):
+    """Return the key for the result of running circuits on a backend.
+
+    :param str backend_name: The name of the backend
+    :param list circuits: The circuits to run, their names are ignored
+    :param dict options: The run options, including the backend's options.
+        The options controlling the parallelism of Aer simulators are ignored.
+    :returns: The hex digest of the key
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    digest.update(backend_name.encode("utf8"))
+    for circuit in circuits:
+        digest.update(transpile_cache.circuit_fingerprint(circuit).encode("utf8"))
+    # Parallelism doesn't change results, and depends on the host
+    options = {
+        key: _option_fingerprint(value)
+        for key, value in options.items()
+        if key not in thread_budget.AER_PARALLEL_OPTIONS
+    }
+    digest.update(json.dumps(options, sort_keys=True).encode("utf8"))
+    return digest.hexdigest()
+
+
+class ResultStore:
+    """An on-disk store of job results.
+
+    Each result is stored as the zlib compressed pickle of
+    :meth:`qiskit.result.Result.to_dict` in a separate file, written
+    atomically so test workers can share a store. Only load stores from
+    trusted sources.
+
+    :param str path: The directory of the store
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.result")
+
+    def get(self, key):
+        """Return the result dictionary stored for a key or ``None``."""
+        try:
+            with open(self._file(key), "rb") as fd:
+                return pickle.loads(zlib.decompress(fd.read()))
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, result_dict):
+        """Store a result dictionary for a key."""
+        cache.write_bytes(self._file(key), zlib.compress(pickle.dumps(result_dict, protocol=4)))
+
+
+def _result_for(result_dict, circuits, job_id):
+    result_dict = dict(result_dict, job_id=job_id)
+    experiments = []
+    # Use the names and metadata of the circuits being run, not the recorded ones
+    for experiment, circuit in zip(result_dict["results"], circuits):
+        header = dict(experiment.get("header") or {}, name=circuit.name)
+        header["metadata"] = dict(circuit.metadata or {})
+        experiments.append(dict(experiment, header=header))
+    result_dict["results"] = experiments
+    return Result.from_dict(result_dict)
+
+
+class ReplayJob(JobV1):
+    """A job which returns a recorded result."""
+
+    def __init__(self, backend, job_id, result):
+        super().__init__(backend, job_id)
+        self._result = result
+
+    def submit(self):
+        pass
+
+    def result(self):  # pylint: disable=arguments-differ
+        return self._result
+
+    def status(self):
+        return JobStatus.DONE
+
+
+class RecordingJob(JobV1):
+    """A job which stores the result of a job from the wrapped backend."""
+
+    def __init__(self, backend, job, store, key):
+        super().__init__(backend, job.job_id())
+        self._job = job
+        self._store = store
+        self._key = key
+        self._recorded = False
+
+    def submit(self):
+        pass
+
+    def result(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        result = self._job.result(*args, **kwargs)
+        if not self._recorded and result.success:
+            self._store.put(self._key, result.to_dict())
+            self._recorded = True
+        return result
+
+    def status(self):
+        return self._job.status()
+
+    def cancel(self):
+        return self._job.cancel()
+
+
+class ReplayBackend(wrapper_backend.WrappedBackend):
+    """A backend which records or replays the results of another backend.
+
+    :param backend: The backend to wrap
+    :param ResultStore store: The store for the results
+    :param str mode: ``record`` to always run jobs on the wrapped backend
+        and store their results, ``replay`` to only return stored results
+        (raising :class:`ReplayMissError` if there isn't one) or ``auto`` to
+        return stored results when there is one and otherwise record
+    """
+
+    def __init__(self, backend, store, mode="auto"):
+        if mode not in MODES:
+            raise ValueError(f"Invalid replay mode {mode!r}, must be one of {MODES}")
+        super().__init__(backend)
+        self.store = store
+        self.mode = mode
+
+    def run(self, run_input, **options):
+        circuits = run_input if isinstance(run_input, (list, tuple)) else [run_input]
+        run_options = dict(self.options.items())
+        run_options.update(options)
+        key = job_key(self.name, circuits, run_options)
+        if self.mode != "record":
+            recorded = self.store.get(key)
+            if recorded is not None:
+                LOG.debug("Replaying result %s", key)
+                job_id = str(uuid.uuid4())
+                return ReplayJob(self, job_id, _result_for(recorded, circuits, job_id))
+            if self.mode == "replay":
+                raise ReplayMissError(f"No recorded result for job {key} in {self.store.path}")
+        return RecordingJob(self, self._backend.run(run_input, **options), self.store, key)
+
+
+class ReplayBackendPlugin(backend_plugin.BackendPlugin):
+    """A backend plugin which records and replays results from another plugin.
+
+    The backend selection string has the form ``mode:plugin[:selection]``
+    where ``mode`` is one of ``auto`` (the default if omitted), ``record`` or
+    ``replay`` (see :class:`ReplayBackend`), ``plugin`` is the name of the
+    plugin whose backend is wrapped (``aer`` by default) and ``selection`` is
+    the selection string passed to that plugin. For example
+    ``record:aer:fake_sherbrooke`` records the results of running on the
+    ``fake_sherbrooke`` backend from the Aer plugin, and
+    ``replay:aer:fake_sherbrooke`` returns them on subsequent runs without
+    running any circuits.
+
+    Results are keyed by the circuits (ignoring their names) and the run
+    options, and stored in the ``replay`` subdirectory of the qiskit-neko
+    cache directory, unless the ``NEKO_REPLAY_DIR`` environment variable is
+    set to another directory.
+    """
+
+    wraps_plugins = True
+
+    def __init__(self):
+        super().__init__()
+        self._plugin_manager = None
+
+    @property
+    def plugin_manager(self):
+        """The plugin manager used to load the wrapped plugins."""
+        if self._plugin_manager is None:
+            self._plugin_manager = backend_plugin.BackendPluginManager(lazy=True)
+        return self._plugin_manager
+
+    def get_backend(self, backend_selection=None):
+        mode = "auto"
+        if backend_selection:
+            first, _, rest = backend_selection.partition(":")
+            if first in MODES:
+                mode, backend_selection = first, rest
+        plugin_name, selection = wrapper_backend.parse_wrapped_selection(backend_selection)
+        if plugin_name == "replay":
+            raise ValueError("The replay plugin can't wrap itself")
+        backend = self.plugin_manager.get_plugin(plugin_name).get_backend(selection)
+        root = os.getenv("NEKO_REPLAY_DIR") or cache.get_cache_dir("replay")
+        store_name = re.sub(r"[^\w.=-]", "_", f"{plugin_name}-{selection or 'default'}")
+        return ReplayBackend(backend, ResultStore(os.path.join(root, store_name)), mode)
@@ -0,0 +1,252 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Partition tests between test workers using their historical run times.
+
+The base test class records the run time of every test in the timing
+database configured with the ``timing_db`` option, keyed by the test id and
+the backend plugin and backend selection the test was run with. Running::
+
+    python -m qiskit_neko.scheduling --workers 8 --output workers.yaml
+    stestr run --concurrency 8 --worker-file workers.yaml
+
+splits the tests between 8 workers with longest processing time first bin
+packing, so that expensive tests are spread evenly between the workers.
+"""
+
+import argparse
+import collections
+import heapq
+import json
+import logging
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+import yaml
+
+from qiskit_neko import config
+from qiskit_neko import manifest
+
+LOG = logging.getLogger(__name__)
+
+_ATTRS_SUFFIX = re.compile(r"\[[^\[\]]*\]$")
+
+
+def strip_attrs(test_id):
+    """Strip the ``[attr,...]`` suffix testtools adds to test ids with attributes."""
+    return _ATTRS_SUFFIX.sub("", test_id)
+
+
+class TimingDatabase:
+    """A database of the historical run times of tests.
+
+    The database is a JSON lines file where each line records the duration of
+    a single test run. Records are appended with a single write so test
+    workers running in parallel can record to the same file.
+
+    :param str path: The path to the database file
+    :param int history: The number of most recent runs of each test used to
+        estimate its run time
+    """
+
+    def __init__(self, path, history=5):
+        self.path = path
+        self.history = history
+
+    def record(self, test_id, backend_plugin, backend_selection, duration):
+        """Record the duration of a test run.
+
+        :param str test_id: The id of the test
+        :param str backend_plugin: The backend plugin the test was run with
+        :param str backend_selection: The backend selection the test was run with
+        :param float duration: The duration of the test in seconds
+        """
+        record = {
+            "test_id": strip_attrs(test_id),
+            "backend_plugin": backend_plugin,
+            "backend_selection": backend_selection,
+            "duration": duration,
+            "timestamp": time.time(),
+        }
+        with open(self.path, "a", encoding="utf8") as fd:
+            fd.write(json.dumps(record) + "\n")
+
+    def _read_records(self):
+        records = collections.defaultdict(lambda: collections.deque(maxlen=self.history))
+        try:
+            with open(self.path, "r", encoding="utf8") as fd:
+                for line in fd:
+                    try:
+                        record = json.loads(line)
+                        key = (
+                            record["test_id"],
+                            record.get("backend_plugin"),
+                            record.get("backend_selection"),
+                        )
+                        float(record["duration"])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    records[key].append(record)
+        except FileNotFoundError:
+            pass
+        return records
+
+    def get_times(self, backend_plugin=None, backend_selection=None):
+        """Return the estimated run times of the tests recorded for a backend.
+
+        :param str backend_plugin: The backend plugin
+        :param str backend_selection: The backend selection
+        :returns: A dictionary of test ids to the median duration of their most
+            recent runs in seconds
+        :rtype: dict
+        """
+        return {
+            key[0]: statistics.median(record["duration"] for record in records)
+            for key, records in self._read_records().items()
+            if key[1:] == (backend_plugin, backend_selection)
+        }
+
+    def compact(self):
+        """Rewrite the database keeping only the most recent runs of each test."""
+        records = self._read_records()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf8") as tmp_file:
+                for test_records in records.values():
+                    for record in test_records:
+                        tmp_file.write(json.dumps(record) + "\n")
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def partition_tests(test_ids, workers, times, group_regex=None):
+    """Partition tests between workers with longest processing time first bin packing.
+
+    Tests are grouped (tests in a group always run on the same worker), the
+    groups are sorted by their estimated run time, longest first, and each
+    group is assigned to the worker with the least estimated run time so far.
+    Tests without a recorded run time are estimated with the median of the
+    recorded run times.
+
+    :param list test_ids: The ids of the tests to partition
+    :param int workers: The number of workers
+    :param dict times: A dictionary of test ids (without attributes) to their
+        estimated run time in seconds
+    :param str group_regex: An optional regex, tests where the regex matches
+        the same string are put in the same group
+    :returns: A list of lists of test ids for each worker, workers without any
+        tests are omitted
+    :rtype: list
+    """
+    default_time = statistics.median(times.values()) if times else 1.0
+    group_pattern = re.compile(group_regex) if group_regex else None
+    groups = collections.defaultdict(list)
+    for test_id in test_ids:
+        match = group_pattern.match(test_id) if group_pattern else None
+        groups[match.group(0) if match else test_id].append(test_id)
+    durations = {
+        group: sum(times.get(strip_attrs(test_id), default_time) for test_id in group_tests)
+        for group, group_tests in groups.items()
+    }
+    partitions = [[] for _ in range(workers)]
+    heap = [(0.0, index) for index in range(workers)]
+    for group in sorted(groups, key=lambda group: (-durations[group], group)):
+        load, index = heapq.heappop(heap)
+        partitions[index].extend(groups[group])
+        heapq.heappush(heap, (load + durations[group], index))
+    return [partition for partition in partitions if partition]
+
+
+def write_worker_file(path, partitions):
+    """Write an stestr worker file which runs each partition on its own worker.
+
+    :param str path: The path of the worker file to write
+    :param list partitions: The lists of test ids for each worker as returned
+        by :func:`partition_tests`
+    """
+    workers = [
+        {"worker": [f"^{re.escape(strip_attrs(test_id))}(\\[|$)" for test_id in partition]}
+        for partition in partitions
+    ]
+    with open(path, "w", encoding="utf8") as fd:
+        yaml.safe_dump(workers, fd, default_flow_style=False)
+
+
+def main(argv=None):
+    """Entry point for ``python -m qiskit_neko.scheduling``."""
+    neko_config = {}
+    config_path = config.find_config_path()
+    if config_path:
+        neko_config = config.load_config(config_path).config
+    parser = argparse.ArgumentParser(
+        description="Generate an stestr worker file from historical test run times."
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=os.cpu_count(), help="The number of test workers"
+    )
+    parser.add_argument(
+        "-o", "--output", default="neko_workers.yaml", help="The worker file to write"
+    )
+    parser.add_argument(
+        "--timing-db",
+        default=neko_config.get("timing_db"),
+        help="The timing database, defaults to the timing_db config option",
+    )
+    parser.add_argument(
+        "--backend-plugin",
+        default=neko_config.get("backend_plugin", "aer"),
+        help="The backend plugin to use the recorded times for",
+    )
+    parser.add_argument(
+        "--backend-selection",
+        default=neko_config.get("backend_selection"),
+        help="The backend selection to use the recorded times for",
+    )
+    parser.add_argument(
+        "--test-list",
+        default=None,
+        help="A file with the test ids to schedule, one per line, by default "
+        "all the tests in the test manifest are used",
+    )
+    parser.add_argument(
+        "--group-regex", default=None, help="A regex to group tests which must run together"
+    )
+    args = parser.parse_args(argv)
+    if not args.timing_db:
+        parser.error("No timing database, set timing_db in the config file or use --timing-db")
+    if args.test_list:
+        with open(args.test_list, "r", encoding="utf8") as fd:
+            test_ids = [line.strip() for line in fd if line.strip()]
+    else:
+        test_ids = [manifest.format_test_id(test) for test in manifest.build_manifest()]
+    database = TimingDatabase(args.timing_db)
+    database.compact()
+    times = database.get_times(args.backend_plugin, args.backend_selection)
+    partitions = partition_tests(test_ids, args.workers, times, args.group_regex)
+    write_worker_file(args.output, partitions)
+    default_time = statistics.median(times.values()) if times else 1.0
+    for index, partition in enumerate(partitions):
+        estimate = sum(times.get(strip_attrs(test_id), default_time) for test_id in partition)
+        print(f"worker {index}: {len(partition)} tests, estimated {estimate:.1f}s")
+    print(f"Run with: stestr run --concurrency {len(partitions)} --worker-file {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
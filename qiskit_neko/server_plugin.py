@@ -0,0 +1,238 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""A backend plugin which runs circuits in a shared backend server process."""
+
+import io
+import json
+import logging
+import os
+import pickle
+import socket
+import subprocess
+import sys
+import time
+
+from qiskit import qpy
+from qiskit.exceptions import QiskitError
+from qiskit.providers import BackendV2, JobStatus, JobV1, Options
+from qiskit.result import Result
+
+from qiskit_neko import backend_plugin
+from qiskit_neko import backend_server
+from qiskit_neko import wrapper_backend
+
+LOG = logging.getLogger(__name__)
+
+IDLE_TIMEOUT = 300.0
+START_TIMEOUT = 120.0
+
+
+class BackendServerError(QiskitError):
+    """Raised when the backend server fails to handle a request."""
+
+
+class ServerClient:
+    """A client for a :class:`~qiskit_neko.backend_server.BackendServer`.
+
+    A new connection is used for every request so clients can be used from
+    several threads and copied.
+
+    :param str path: The path of the server's Unix socket
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def request(self, header, body=b""):
+        """Send a request to the server and return the response header and body.
+
+        :raises BackendServerError: If the server failed to handle the request
+        :raises OSError: If the server can't be connected to
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.path)
+            backend_server.send_message(sock, header, body)
+            response, response_body = backend_server.recv_message(sock)
+        if not response.pop("ok"):
+            raise BackendServerError(f"Backend server request failed: {response['error']}")
+        return response, response_body
+
+    def is_running(self):
+        """Return whether the server is accepting requests."""
+        try:
+            self.request({"op": "ping"})
+        except OSError:
+            return False
+        return True
+
+    def start(self, max_workers=None, idle_timeout=IDLE_TIMEOUT):
+        """Start a server process unless one is already running.
+
+        Other processes starting a server on the same socket at the same time
+        wait for the first one to be ready and use it. The server shuts down
+        after ``idle_timeout`` seconds without requests and logs to the
+        socket's path with a ``.log`` suffix.
+
+        :raises BackendServerError: If the server doesn't start in time
+        """
+        import fcntl
+
+        if self.is_running():
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), mode=0o700, exist_ok=True)
+        with open(f"{self.path}.lock", "w") as lock_fd:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            if self.is_running():
+                return
+            args = [sys.executable, "-m", "qiskit_neko.backend_server", "--socket", self.path]
+            if max_workers:
+                args += ["--max-workers", str(max_workers)]
+            if idle_timeout is not None:
+                args += ["--idle-timeout", str(idle_timeout)]
+            log_path = f"{self.path}.log"
+            LOG.info("Starting backend server on %s", self.path)
+            with open(log_path, "ab") as log_fd:
+                process = subprocess.Popen(  # pylint: disable=consider-using-with
+                    args,
+                    stdin=subprocess.DEVNULL,
+                    stdout=log_fd,
+                    stderr=subprocess.STDOUT,
+                    start_new_session=True,
+                )
+            deadline = time.monotonic() + START_TIMEOUT
+            while not self.is_running():
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise BackendServerError(
+                        f"The backend server failed to start, see {log_path} for details"
+                    )
+                time.sleep(0.1)
+
+    def shutdown(self):
+        """Shut the server down."""
+        self.request({"op": "shutdown"})
+
+
+class ServerJob(JobV1):
+    """A job running in the backend server."""
+
+    def __init__(self, backend, job_id, client):
+        super().__init__(backend, job_id)
+        self._client = client
+        self._result = None
+
+    def submit(self):
+        pass
+
+    def status(self):
+        if self._result is not None:
+            return JobStatus.DONE
+        response, _ = self._client.request({"op": "status", "job_id": self.job_id()})
+        return JobStatus[response["status"]]
+
+    def result(self, timeout=None):  # pylint: disable=arguments-differ
+        if self._result is None:
+            _, body = self._client.request(
+                {"op": "result", "job_id": self.job_id(), "timeout": timeout}
+            )
+            self._result = Result.from_dict(pickle.loads(body))
+        return self._result
+
+
+class ServerBackend(BackendV2):
+    """A backend which runs circuits on a backend in the backend server.
+
+    The target and options are copied from the server's backend when it's
+    created. Options changed with :meth:`set_options` are sent with every job.
+
+    :param ServerClient client: The client for the server
+    :param str plugin: The name of the plugin providing the server's backend
+    :param str selection: The selection string for the plugin
+    """
+
+    def __init__(self, client, plugin, selection=None):
+        info, target = client.request({"op": "backend", "plugin": plugin, "selection": selection})
+        super().__init__(
+            name=info["name"],
+            description=info["description"],
+            backend_version=info["backend_version"],
+        )
+        self._client = client
+        self._plugin = plugin
+        self._selection = selection
+        self._target = pickle.loads(target)
+        self._max_circuits = info["max_circuits"]
+        self._options.update_options(**info["options"])
+        self._overrides = {}
+
+    @classmethod
+    def _default_options(cls):
+        return Options()
+
+    @property
+    def target(self):
+        return self._target
+
+    @property
+    def max_circuits(self):
+        return self._max_circuits
+
+    def set_options(self, **fields):
+        super().set_options(**fields)
+        self._overrides.update(fields)
+
+    def run(self, run_input, **options):
+        circuits = run_input if isinstance(run_input, (list, tuple)) else [run_input]
+        options = {**self._overrides, **options}
+        try:
+            json.dumps(options)
+        except TypeError as err:
+            raise TypeError(f"Run options for the backend server must be JSON: {err}") from None
+        qpy_file = io.BytesIO()
+        qpy.dump(circuits, qpy_file)
+        response, _ = self._client.request(
+            {
+                "op": "run",
+                "plugin": self._plugin,
+                "selection": self._selection,
+                "options": options,
+            },
+            qpy_file.getvalue(),
+        )
+        return ServerJob(self, response["job_id"], self._client)
+
+
+class ServerBackendPlugin(backend_plugin.BackendPlugin):
+    """A backend plugin which runs circuits in a shared backend server process.
+
+    The backend selection string has the form ``plugin[:selection]``: the
+    server loads the backend from the installed ``plugin`` (``aer`` by
+    default) with ``selection`` once, and all the test workers using this
+    plugin run their circuits on it. The server is started automatically if
+    it isn't running and shuts down after :data:`IDLE_TIMEOUT` seconds without
+    requests (pooled backends are only reused while it's running, so it's
+    started again when needed). It listens on the Unix socket returned by
+    :func:`~qiskit_neko.backend_server.default_socket_path`, which can be set
+    with the ``NEKO_BACKEND_SERVER`` environment variable.
+    """
+
+    wraps_plugins = True
+
+    def is_reusable(self, backend):
+        # The server shuts down when it's idle, a new backend starts it again
+        return backend._client.is_running()  # pylint: disable=protected-access
+
+    def get_backend(self, backend_selection=None):
+        plugin, selection = wrapper_backend.parse_wrapped_selection(backend_selection)
+        client = ServerClient(backend_server.default_socket_path())
+        client.start()
+        return ServerBackend(client, plugin, selection)
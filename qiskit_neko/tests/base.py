@@ -12,20 +12,51 @@
 
 """Base test class for qiskit-neko framework."""
 
+import atexit
+import concurrent.futures
+import contextlib
 import inspect
-import importlib.util
 import logging
+import math
 import os
 import sys
+import threading
+import time
+import traceback
+import types
+import warnings
 
 import testtools
+import testtools.content
 import fixtures
+import numpy as np
 
+from qiskit_neko import async_jobs
 from qiskit_neko import backend_plugin
 from qiskit_neko import config
+from qiskit_neko import log_file
+from qiskit_neko import performance
+from qiskit_neko import scheduling
+from qiskit_neko import thread_budget
+from qiskit_neko import transpile_cache
 
 LOG = logging.getLogger(__name__)
 
+# Backends are shared between all the tests run in a single worker process and
+# their plugins are closed when it exits.
+BACKEND_POOL = backend_plugin.BackendPool()
+atexit.register(BACKEND_POOL.close)
+# Transpile caches keyed by (maximum size, cache directory) shared by all tests
+# run in a single worker process.
+_TRANSPILE_CACHES = {}
+_TRANSPILE_CACHES_LOCK = threading.Lock()
+# Batches shared between the tests of a class keyed by (test class, group name, backend id)
+_SHARED_BATCHES = {}
+
+
+# Maximum number of mismatched entries listed in a dicts_almost_equal() message
+DICT_ERROR_MSG_LIMIT = 100
+
 
 def dicts_almost_equal(dict1, dict2, delta=None, places=None, default_value=0):
     """Test if two dictionaries with numeric values are almost equal.
@@ -36,6 +67,9 @@ def dicts_almost_equal(dict1, dict2, delta=None, places=None, default_value=0):
     dictionary is not in the other the default_value keyword argument
     will be used for the missing value (default 0). If the two objects
     compare equal then they will automatically compare almost equal.
+    The values are compared as numpy arrays and at most
+    ``DICT_ERROR_MSG_LIMIT`` differing entries are listed in the returned
+    description.
     Args:
         dict1 (dict): a dictionary.
         dict2 (dict): a dictionary.
@@ -50,13 +84,6 @@ def dicts_almost_equal(dict1, dict2, delta=None, places=None, default_value=0):
             of their difference if they are deemed not almost equal.
     """
 
-    def valid_comparison(value):
-        """compare value to delta, within places accuracy"""
-        if places is not None:
-            return round(value, places) == 0
-        else:
-            return value < delta
-
     # Check arguments.
     if dict1 == dict2:
         return ""
@@ -68,41 +95,296 @@ def dicts_almost_equal(dict1, dict2, delta=None, places=None, default_value=0):
         delta = delta or 1e-8
         msg_suffix = f" within {delta} delta"
 
-    # Compare all keys in both dicts, populating error_msg.
-    error_msg = ""
-    for key in set(dict1.keys()) | set(dict2.keys()):
-        val1 = dict1.get(key, default_value)
-        val2 = dict2.get(key, default_value)
-        if not valid_comparison(abs(val1 - val2)):
-            error_msg += f"({key}: {val1} != {val2}), "
-
-    if error_msg:
-        return error_msg[:-2] + msg_suffix
+    # Map the keys of both dicts to indices and compare the values as arrays
+    keys = list(dict1)
+    keys.extend(key for key in dict2 if key not in dict1)
+    values1 = [dict1.get(key, default_value) for key in keys]
+    values2 = [dict2.get(key, default_value) for key in keys]
+    try:
+        diff = np.abs(np.asarray(values1, dtype=float) - np.asarray(values2, dtype=float))
+    except (TypeError, ValueError):
+        # Values which can't be represented as floats (e.g. complex numbers)
+        diff = np.asarray([abs(val1 - val2) for val1, val2 in zip(values1, values2)])
+    if places is not None:
+        failed = np.flatnonzero(np.round(diff, places) != 0)
     else:
+        failed = np.flatnonzero(~(diff < delta))
+
+    if not failed.size:
         return ""
+    error_msg = ", ".join(
+        f"({keys[index]}: {values1[index]} != {values2[index]})"
+        for index in failed[:DICT_ERROR_MSG_LIMIT]
+    )
+    if failed.size > DICT_ERROR_MSG_LIMIT:
+        error_msg += f", ... and {failed.size - DICT_ERROR_MSG_LIMIT} more"
+    return error_msg + msg_suffix
 
 
-class _WrappedMethodCall:
-    """Method call with extra functionality before and after.  This is returned by
-    :obj:`~_WrappedMethod` when accessed as an atrribute."""
+def _normalize(counts, keys):
+    values = np.asarray([counts.get(key, 0) for key in keys], dtype=float)
+    total = values.sum()
+    return values / total if total else values
 
-    def __init__(self, descriptor, obj, objtype):
-        self.descriptor = descriptor
-        self.obj = obj
-        self.objtype = objtype
 
-    def __call__(self, *args, **kwargs):
-        if self.descriptor.isclassmethod:
-            ref = self.objtype
-        else:
-            # obj if we're being accessed as an instance method, or objtype if as a class method.
-            ref = self.obj if self.obj is not None else self.objtype
-        for before in self.descriptor.before:
-            before(ref, *args, **kwargs)
-        out = self.descriptor.method(ref, *args, **kwargs)
-        for after in self.descriptor.after:
-            after(ref, *args, **kwargs)
-        return out
+def total_variation_distance(counts, expected):
+    """Return the total variation distance between two distributions.
+
+    Args:
+        counts (dict): the observed counts (or probabilities).
+        expected (dict): the expected counts (or probabilities).
+    Returns:
+        float: The total variation distance between the normalized
+            distributions, between 0 and 1.
+    """
+    keys = list(counts)
+    keys.extend(key for key in expected if key not in counts)
+    return 0.5 * float(np.abs(_normalize(counts, keys) - _normalize(expected, keys)).sum())
+
+
+def tvd_confidence_radius(num_outcomes, shots, alpha):
+    """Return a bound on the total variation distance of an empirical distribution.
+
+    For ``shots`` independent samples from a distribution over at most
+    ``num_outcomes`` outcomes the total variation distance between the
+    empirical and the true distribution is less than the returned value
+    with probability at least ``1 - alpha``. The bound is the sum of the
+    bound on the expected distance, ``sqrt(num_outcomes / shots) / 2``, and the
+    McDiarmid deviation bound ``sqrt(ln(1 / alpha) / (2 * shots))``.
+    Args:
+        num_outcomes (int): the number of possible outcomes.
+        shots (int): the number of samples.
+        alpha (float): the probability of the bound being exceeded.
+    Returns:
+        float: The confidence radius.
+    """
+    return 0.5 * math.sqrt(num_outcomes / shots) + math.sqrt(math.log(1 / alpha) / (2 * shots))
+
+
+def chi_square_pvalue(counts, expected):
+    """Return the p-value of Pearson's chi-square goodness of fit test.
+
+    Args:
+        counts (dict): the observed counts.
+        expected (dict): the expected counts (or probabilities), these are
+            rescaled to the total number of observed counts.
+    Returns:
+        float: The probability of observing a chi-square statistic at least
+            as large as the observed one if ``counts`` were sampled from the
+            ``expected`` distribution. If an outcome with an expected
+            probability of 0 was observed this is 0.
+    """
+    from scipy import stats
+
+    keys = list(counts)
+    keys.extend(key for key in expected if key not in counts)
+    observed = np.asarray([counts.get(key, 0) for key in keys], dtype=float)
+    expected_counts = _normalize(expected, keys) * observed.sum()
+    if np.any(observed[expected_counts == 0] > 0):
+        return 0.0
+    nonzero = expected_counts > 0
+    if np.count_nonzero(nonzero) < 2:
+        return 1.0
+    statistic = float(
+        (((observed[nonzero] - expected_counts[nonzero]) ** 2) / expected_counts[nonzero]).sum()
+    )
+    return float(stats.chi2.sf(statistic, np.count_nonzero(nonzero) - 1))
+
+
+class CircuitBatch:
+    """Collect circuits and run them on a backend as a single job.
+
+    Circuits are added to the batch with :meth:`add` and then all of them are
+    submitted together in a single call to ``backend.run()`` when :meth:`run`
+    is called. If the backend limits the number of circuits in a job with
+    ``max_circuits`` the batch is split into the fewest jobs possible. The
+    results are then fanned back out per circuit with :meth:`get_counts` and
+    :meth:`get_result`.
+
+    Errors are kept per circuit so a batch shared by several tests only fails
+    the tests whose circuits are affected. An exception raised while building
+    a circuit added with :meth:`add_from`, or while submitting or retrieving
+    the results of a job, is recorded for each circuit it affects and raised
+    again by :meth:`get_counts` and :meth:`get_result` for those circuits.
+
+    :param Backend backend: The backend to run the circuits on
+    :param callable timer: An optional callable which takes a phase name and
+        returns a context manager timing that phase, such as
+        :meth:`BaseTestCase.time_phase`. It is used to time the
+        ``job_submission`` and ``result_retrieval`` phases.
+    :param run_kwargs: Keyword arguments to pass to ``backend.run()``
+    """
+
+    def __init__(self, backend, timer=None, **run_kwargs):
+        self.backend = backend
+        self.run_kwargs = run_kwargs
+        self._timer = timer if timer is not None else lambda _: contextlib.nullcontext()
+        self.jobs = []
+        self._circuits = []
+        self._keys = {}
+        self._errors = {}
+        self._results = None
+
+    def __len__(self):
+        return len(self._circuits)
+
+    def add(self, circuit, key=None):
+        """Add a circuit to the batch.
+
+        :param QuantumCircuit circuit: The circuit to add
+        :param key: An optional hashable key to look up the circuit's result
+            with. If not specified the index of the circuit in the batch is used.
+        :returns: The key for the circuit
+        :raises ValueError: If the batch was already run or the key is a duplicate
+        """
+        if self._results is not None:
+            raise ValueError("Circuits can't be added to a batch which has already run")
+        if key is None:
+            key = len(self._circuits)
+        if key in self._keys or key in self._errors:
+            raise ValueError(f"Duplicate key {key!r} in circuit batch")
+        self._keys[key] = len(self._circuits)
+        self._circuits.append(circuit)
+        return key
+
+    def add_from(self, build, key):
+        """Add the circuit returned by a callable to the batch.
+
+        If ``build`` raises an exception no circuit is added and the exception
+        is raised when the result for ``key`` is looked up instead.
+
+        :param callable build: A callable with no arguments returning the
+            circuit to add, for example transpiling it
+        :param key: The hashable key to look up the circuit's result with
+        :returns: The key for the circuit
+        :raises ValueError: If the batch was already run or the key is a duplicate
+        """
+        try:
+            circuit = build()
+        except Exception as error:  # pylint: disable=broad-except
+            if self._results is not None:
+                raise ValueError(
+                    "Circuits can't be added to a batch which has already run"
+                ) from error
+            if key in self._keys or key in self._errors:
+                raise ValueError(f"Duplicate key {key!r} in circuit batch") from error
+            self._errors[key] = error
+            return key
+        return self.add(circuit, key)
+
+    def _chunk_size(self):
+        max_circuits = getattr(self.backend, "max_circuits", None)
+        if not isinstance(max_circuits, int) or max_circuits <= 0:
+            return max(len(self._circuits), 1)
+        return max_circuits
+
+    def run(self):
+        """Submit all the circuits in the batch and wait for the results.
+
+        Calling this more than once has no effect.
+        """
+        if self._results is not None:
+            return
+        chunk_size = self._chunk_size()
+        starts = range(0, len(self._circuits), chunk_size)
+        jobs = []
+        with self._timer("job_submission"):
+            for start in starts:
+                try:
+                    job = self.backend.run(
+                        self._circuits[start : start + chunk_size], **self.run_kwargs
+                    )
+                except Exception as error:  # pylint: disable=broad-except
+                    self._fail_chunk(start, chunk_size, error)
+                    job = None
+                else:
+                    self.jobs.append(job)
+                jobs.append(job)
+        results = []
+        with self._timer("result_retrieval"):
+            for start, job in zip(starts, jobs):
+                result = None
+                if job is not None:
+                    try:
+                        result = job.result()
+                    except Exception as error:  # pylint: disable=broad-except
+                        self._fail_chunk(start, chunk_size, error)
+                results.append(result)
+        self._results = results
+
+    def _fail_chunk(self, start, chunk_size, error):
+        members = list(self._keys)[start : start + chunk_size]
+        for key in members:
+            self._errors[key] = error
+
+    def _locate(self, key):
+        self.run()
+        if key in self._errors:
+            raise self._errors[key]
+        index = self._keys[key]
+        chunk_size = self._chunk_size()
+        return self._results[index // chunk_size], index % chunk_size
+
+    def get_result(self, key):
+        """Return the job result and the experiment index in it for a circuit.
+
+        :param key: The key of the circuit returned by :meth:`add`
+        :returns: A tuple of the :class:`~qiskit.result.Result` object
+            containing the circuit's result and the index of the circuit's
+            experiment in that result.
+        """
+        return self._locate(key)
+
+    def get_counts(self, key):
+        """Return the counts for a circuit in the batch.
+
+        :param key: The key of the circuit returned by :meth:`add`
+        """
+        result, index = self._locate(key)
+        return result.get_counts(index)
+
+
+def _compose(method, before, after):
+    """Build a single function which calls ``before``, ``method`` and ``after`` in order.
+
+    This is done once when a method is wrapped so calling the wrapped method doesn't need to look
+    up or iterate over the hooks."""
+    if len(before) == 1 and not after:
+        (before_0,) = before
+
+        def composed(ref, *args, **kwargs):
+            before_0(ref, *args, **kwargs)
+            return method(ref, *args, **kwargs)
+
+    elif not before and len(after) == 1:
+        (after_0,) = after
+
+        def composed(ref, *args, **kwargs):
+            out = method(ref, *args, **kwargs)
+            after_0(ref, *args, **kwargs)
+            return out
+
+    elif len(before) == 1 and len(after) == 1:
+        (before_0,) = before
+        (after_0,) = after
+
+        def composed(ref, *args, **kwargs):
+            before_0(ref, *args, **kwargs)
+            out = method(ref, *args, **kwargs)
+            after_0(ref, *args, **kwargs)
+            return out
+
+    else:
+
+        def composed(ref, *args, **kwargs):
+            for before_ in before:
+                before_(ref, *args, **kwargs)
+            out = method(ref, *args, **kwargs)
+            for after_ in after:
+                after_(ref, *args, **kwargs)
+            return out
+
+    return composed
 
 
 class _WrappedMethod:
@@ -111,9 +393,12 @@ class _WrappedMethod:
 
     It is intended that this class will replace the attribute that ``inner`` previously was on a
     class or instance.  When accessed as that attribute, this descriptor will behave it is the same
-    function call, but with the ``function`` called after.
+    function call, but with the ``function`` called after.  The calls are composed into a single
+    function when the descriptor is created, and attribute access only binds that function.
     """
 
+    __slots__ = ("method", "isclassmethod", "before", "after", "function")
+
     def __init__(self, cls, name, before=None, after=None):
         # Find the actual definition of the method, not just the descriptor output from getattr.
         for cls_ in inspect.getmro(cls):
@@ -138,10 +423,13 @@ class _WrappedMethod:
         if isinstance(self.method, classmethod):
             self.method = self.method.__func__
             self.isclassmethod = True
+        self.function = _compose(self.method, self.before, self.after)
 
     def __get__(self, obj, objtype=None):
-        # No functools.wraps because we're probably about to be bound to a different context.
-        return _WrappedMethodCall(self, obj, objtype)
+        # obj if we're being accessed as an instance method, or objtype if as a class method.
+        if obj is None or self.isclassmethod:
+            return types.MethodType(self.function, objtype if objtype is not None else type(obj))
+        return types.MethodType(self.function, obj)
 
 
 def _wrap_method(cls, name, before=None, after=None):
@@ -271,6 +559,9 @@ class BaseTestCase(testtools.testcase.WithAttributes, testtools.TestCase):
         self.__setup_called = False
         self.__teardown_called = False
         self.log_format = "%(asctime)s %(process)d %(levelname)-8s [%(name)s] %(message)s"
+        self.timings = {}
+        self._timings_lock = threading.Lock()
+        self._shared_work = threading.local()
 
     def setUp(self):
         super().setUp()
@@ -282,6 +573,10 @@ class BaseTestCase(testtools.testcase.WithAttributes, testtools.TestCase):
                 "the base setUp."
             )
         self.__setup_called = True
+        # Setup timing, this cleanup is added first so it runs last
+        self.timings = {}
+        self._start_time = time.perf_counter()
+        self.addCleanup(self._attach_timings)
         # Setup output fixtures:
         stdout = self.useFixture(fixtures.StringStream("stdout")).stream
         self.useFixture(fixtures.MonkeyPatch("sys.stdout", stdout))
@@ -289,7 +584,8 @@ class BaseTestCase(testtools.testcase.WithAttributes, testtools.TestCase):
         self.useFixture(fixtures.MonkeyPatch("sys.stderr", stderr))
         # Load configuration
         self.config = None
-        self.find_config_file()
+        with self.time_phase("config_load"):
+            self.find_config_file()
         # Configure logging
         default_log_level = None
         module_log_levels = None
@@ -297,14 +593,14 @@ class BaseTestCase(testtools.testcase.WithAttributes, testtools.TestCase):
             default_log_level = self.config.config.get("default_log_level", None)
             self.log_format = self.config.config.get("log_format", self.log_format)
             module_log_levels = self.config.config.get("module_log_level", {})
-            log_file = self.config.config.get("log_file", None)
-            if log_file:
-                file_handler = logging.FileHandler(log_file)
-                formatter = logging.Formatter(self.log_format)
-                file_handler.setFormatter(formatter)
-                if default_log_level:
-                    file_handler.setLevel(default_log_level)
-                logging.getLogger("").addHandler(file_handler)
+            log_file_path = self.config.config.get("log_file", None)
+            if log_file_path:
+                log_file.configure_log_file(
+                    log_file_path,
+                    self.log_format,
+                    level=default_log_level,
+                    json_lines=self.config.config.get("log_file_json", False),
+                )
 
         self.useFixture(
             fixtures.LoggerFixture(
@@ -317,20 +613,38 @@ class BaseTestCase(testtools.testcase.WithAttributes, testtools.TestCase):
                 logger.setLevel(level)
 
         # Set backend
-        self.plugin_manager = backend_plugin.BackendPluginManager()
+        if self.config and not self.config.config.get("reuse_backends", True):
+            pool = backend_plugin.BackendPool()
+            self.addCleanup(pool.close)
+        else:
+            pool = BACKEND_POOL
+        self.plugin_manager = pool.plugin_manager
+        self._backend_pool = pool
+        self._backends = None
+        self._backend_plugin = "aer"
+        self._backend_selection = None
+        backend_script_path = None
         if self.config:
             backend_script_path = self.config.config.get("backend_script", None)
-            backend_selection = self.config.config.get("backend_selection", None)
+            self._backend_selection = self.config.config.get("backend_selection", None)
             if backend_script_path is not None:
-                plugin = self.load_plugin_script(backend_script_path)
-                self.backend = plugin.get_backend(backend_selection)
+                self._backend_plugin = None
             else:
-                plugin = self.config.config.get("backend_plugin", "aer")
-                self.backends = self.plugin_manager.get_plugin_backends(backend_selection)
-                self.backend = self.backends[plugin]
-        else:
-            self.backends = backend_plugin.BackendPluginManager().get_plugin_backends()
-            self.backend = self.backends["aer"]
+                self._backend_plugin = self.config.config.get("backend_plugin", "aer")
+        with self.time_phase("plugin_load"):
+            pool.get_plugin(self._backend_plugin, backend_script_path)
+        with self.time_phase("backend_creation"):
+            self.backend = pool.get_backend(
+                self._backend_plugin, self._backend_selection, backend_script_path
+            )
+            # Limit simulators to this worker's share of the CPUs
+            budget_config = self.config.config if self.config else {}
+            thread_budget.apply_to_backend(
+                self.backend,
+                thread_budget.worker_threads(
+                    budget_config.get("test_workers"), budget_config.get("worker_threads")
+                ),
+            )
         # Set test timeout
         test_timeout = os.environ.get("NEKO_TEST_TIMEOUT", 0)
         try:
@@ -342,39 +656,424 @@ class BaseTestCase(testtools.testcase.WithAttributes, testtools.TestCase):
                 test_timeout = self.config.config.get("test_timeout", 0)
         if test_timeout > 0:
             self.useFixture(fixtures.Timeout(test_timeout, gentle=True))
+        # Track memory, this is started last so only the test is measured
+        self.memory = None
+        if self.config and (
+            self.config.config.get("track_memory", False) or "memory_budget" in self.config.config
+        ):
+            tracker = performance.MemoryTracker()
+            tracker.start()
+            self.addCleanup(self._check_memory, tracker)
+
+    @contextlib.contextmanager
+    def time_phase(self, phase):
+        """Context manager which records the time spent in a phase of the test.
+
+        The time spent in the ``with`` block is added to the total for
+        ``phase`` in :attr:`timings`. The base test class records the
+        ``config_load``, ``plugin_load`` and ``backend_creation`` phases of
+        :meth:`setUp`, and its helper methods record the ``transpile``,
+        ``job_submission``, ``queue_wait``, ``job_execution``,
+        ``result_retrieval`` and ``assertion`` phases. The timings are
+        attached to the test result as the ``neko-timings`` detail (a JSON
+        object of phase names to seconds, including the ``total`` time of
+        the test), so they are included in the subunit stream stored by
+        stestr. Phases timed in several threads at once (for example by
+        :meth:`run_on_backends`) add up the time spent in each thread.
+
+        While the work shared by a group of tests in :meth:`shared_batch` is
+        timed as the ``shared_batch`` phase, the phases nested in it are not
+        recorded so they only count towards the tests doing that work.
+
+        :param str phase: The name of the phase
+        """
+        if getattr(self._shared_work, "active", False):
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._timings_lock:
+                self.timings[phase] = self.timings.get(phase, 0.0) + elapsed
+
+    def _attach_timings(self):
+        self.timings["total"] = time.perf_counter() - self._start_time
+        self.addDetail("neko-timings", testtools.content.json_content(self.timings))
+        self._record_timing()
+        self._check_performance()
+
+    def _record_timing(self):
+        if getattr(self, "config", None) is None:
+            return
+        timing_db = self.config.config.get("timing_db", None)
+        if timing_db:
+            test_id, _ = self._performance_id()
+            scheduling.TimingDatabase(timing_db).record(
+                test_id,
+                getattr(self, "_backend_plugin", None),
+                getattr(self, "_backend_selection", None),
+                self.timings["total"],
+            )
+
+    def _performance_id(self):
+        test_id = f"{type(self).__module__}.{type(self).__qualname__}.{self._testMethodName}"
+        components = getattr(getattr(self, self._testMethodName), "__testtools_attrs", ())
+        return test_id, components
+
+    def _report_performance(self, detail_name, problems):
+        if not problems:
+            return
+        message = "\n".join(problems)
+        self.addDetail(detail_name, testtools.content.text_content(message))
+        if self.config.config.get("performance_action", "fail") == "fail":
+            self.fail(message)
+        warnings.warn(message, performance.PerformanceWarning, stacklevel=3)
+
+    def _check_performance(self):
+        if getattr(self, "config", None) is None:
+            return
+        settings = self.config.config
+        test_id, components = self._performance_id()
+        backend_plugin_name = getattr(self, "_backend_plugin", None)
+        backend_selection = getattr(self, "_backend_selection", None)
+        baseline_file = settings.get("baseline_file", None)
+        if baseline_file and settings.get("record_baseline", False):
+            performance.record_baseline(
+                baseline_file, test_id, backend_plugin_name, backend_selection, self.timings
+            )
+            return
+        budget = performance.find_budget(settings.get("time_budget"), test_id, components)
+        baseline = None
+        if baseline_file:
+            baseline = performance.load_baseline(baseline_file).get(
+                (test_id, backend_plugin_name, backend_selection)
+            )
+        problems = performance.check_timings(
+            self.timings,
+            budget,
+            baseline,
+            tolerance=settings.get("baseline_tolerance", 0.5),
+            grace=settings.get("baseline_grace", 0.5),
+        )
+        self._report_performance("neko-performance", problems)
+
+    def _check_memory(self, tracker):
+        self.memory = tracker.stop()
+        self.addDetail("neko-memory", testtools.content.json_content(self.memory))
+        test_id, components = self._performance_id()
+        budget = performance.find_budget(
+            self.config.config.get("memory_budget"), test_id, components
+        )
+        self._report_performance(
+            "neko-memory-budget", performance.check_memory(self.memory, budget)
+        )
+
+    @property
+    def backends(self):
+        """A dictionary of plugin names to backend objects for all installed plugins.
+
+        Only the configured backend plugin is loaded by :meth:`setUp`, the other
+        installed plugins are only loaded the first time this is accessed.
+        Plugins which wrap the backends of other plugins (such as ``replay``)
+        are left out, unless they're the configured plugin.
+        """
+        if self._backends is None:
+            names = self.plugin_manager.get_plugin_names()
+            if self._backend_plugin is not None and self._backend_plugin not in names:
+                names.append(self._backend_plugin)
+            self._backends = {
+                name: (
+                    self.backend
+                    if name == self._backend_plugin
+                    else self._backend_pool.get_backend(name, self._backend_selection)
+                )
+                for name in names
+            }
+        return self._backends
+
+    @property
+    def fanout_backends(self):
+        """A dictionary of names to the backends used by :meth:`run_on_backends`.
+
+        If the ``fanout_backends`` configuration option is set this has the
+        backends for the ``plugin[:selection]`` strings it lists, under the
+        names they're listed with, otherwise it only has the configured
+        :attr:`backend` (named after its plugin, or ``backend_script`` if it's
+        loaded from a script).
+        """
+        fanout = self._fanout_selections()
+        if fanout is None:
+            return {self._configured_backend_name(): self.backend}
+        return {
+            name: (
+                self.backend
+                if (plugin, selection) == (self._backend_plugin, self._backend_selection)
+                else self._backend_pool.get_backend(plugin, selection)
+            )
+            for name, (plugin, selection) in fanout.items()
+        }
+
+    def _fanout_selections(self):
+        """Return the ``fanout_backends`` option as names to (plugin, selection) tuples."""
+        fanout = self.config.config.get("fanout_backends") if self.config else None
+        if fanout is None:
+            return None
+        from qiskit_neko import wrapper_backend
+
+        return {
+            name: wrapper_backend.parse_wrapped_selection(backend_selection)
+            for name, backend_selection in fanout.items()
+        }
+
+    def _configured_backend_name(self):
+        """Return the name of the configured backend in :attr:`fanout_backends`."""
+        for name, plugin_selection in (self._fanout_selections() or {}).items():
+            if plugin_selection == (self._backend_plugin, self._backend_selection):
+                return name
+        return self._backend_plugin or "backend_script"
+
+    def run_on_backends(self, function, backends=None, max_workers=None):
+        """Run a function with several backends concurrently.
+
+        This is used for differential testing: ``function`` is called with
+        each backend in a separate thread, so the time the backends spend
+        running jobs overlaps, and the returned values can be compared with
+        :meth:`assertBackendsAgree`. The function can use the helper methods
+        of the test such as :meth:`transpile` and :meth:`batch` (passing them
+        the backend).
+
+        If the function raises an exception for any backend, the traceback
+        for every backend which failed is attached to the test result as a
+        ``neko-fanout-<name>`` detail and the first exception is raised once
+        all the threads finished.
+
+        :param callable function: A callable which takes a backend
+        :param dict backends: A dictionary of names to the backends to run
+            ``function`` with, defaults to :attr:`fanout_backends`
+        :param int max_workers: The maximum number of threads, defaults to one
+            per backend
+        :returns: A dictionary of the backend names to the values returned by
+            ``function``
+        :rtype: dict
+        """
+        if backends is None:
+            backends = self.fanout_backends
+        if not backends:
+            return {}
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers or len(backends), thread_name_prefix="neko-fanout"
+        ) as executor:
+            futures = {
+                name: executor.submit(function, backend) for name, backend in backends.items()
+            }
+            concurrent.futures.wait(futures.values())
+        errors = {name: future.exception() for name, future in futures.items()}
+        errors = {name: err for name, err in errors.items() if err is not None}
+        for name, err in errors.items():
+            self.addDetail(
+                f"neko-fanout-{name}",
+                testtools.content.text_content(
+                    "".join(traceback.format_exception(type(err), err, err.__traceback__))
+                ),
+            )
+        if errors:
+            raise next(iter(errors.values()))
+        return {name: future.result() for name, future in futures.items()}
+
+    def assertBackendsAgree(self, results, reference=None, assertion=None, **kwargs):
+        """Assert the results from several backends agree with a reference backend.
+
+        Each value in ``results`` other than the reference one is compared
+        with the reference value by calling ``assertion(value, reference_value,
+        msg=..., **kwargs)``. By default :meth:`assertCountsDistribution` is
+        used, so the values must be counts dictionaries, and the distribution
+        of each backend's counts is compared with the reference backend's.
+        Args:
+            results (dict): a dictionary of backend names to values, such as
+                the return value of :meth:`run_on_backends`.
+            reference (str): the name of the reference backend, defaults to
+                the name of the configured backend in :attr:`fanout_backends`
+                if it's in ``results`` and the first backend otherwise.
+            assertion (callable): the assertion method to compare the values.
+            kwargs: additional keyword arguments for ``assertion``.
+        Raises:
+            AssertionError: if any value doesn't agree with the reference.
+        """
+        if not results:
+            return
+        if assertion is None:
+            assertion = self.assertCountsDistribution
+        if reference is None:
+            reference = self._configured_backend_name()
+            if reference not in results:
+                reference = next(iter(results))
+        for name, value in results.items():
+            if name != reference:
+                assertion(
+                    value,
+                    results[reference],
+                    msg=f"Results from {name} don't agree with {reference}",
+                    **kwargs,
+                )
+
+    def transpile(self, circuits, backend=None, optimization_level=None, seed_transpiler=None):
+        """Transpile circuits using the per-process transpile cache.
+
+        This should be used instead of calling :func:`~qiskit.compiler.transpile`
+        directly when a test transpiles the same circuits for the same backend
+        as other tests. Transpiled circuits are only cached when a
+        ``seed_transpiler`` is specified as the output of the transpiler is
+        not deterministic otherwise.
+
+        :param circuits: The circuit or list of circuits to transpile
+        :param Backend backend: The backend to transpile for, if not specified
+            ``self.backend`` is used.
+        :param int optimization_level: The optimization level to use
+        :param int seed_transpiler: The seed to use for the transpiler
+        :returns: The transpiled circuit or list of circuits
+        """
+        if backend is None:
+            backend = self.backend
+        cache_size = 128
+        cache_dir = None
+        if self.config:
+            cache_size = self.config.config.get("transpile_cache_size", cache_size)
+            cache_dir = self.config.config.get("transpile_cache_dir", None)
+        with _TRANSPILE_CACHES_LOCK:
+            cache = _TRANSPILE_CACHES.get((cache_size, cache_dir))
+            if cache is None:
+                cache = transpile_cache.TranspileCache(cache_size, cache_dir)
+                _TRANSPILE_CACHES[(cache_size, cache_dir)] = cache
+        with self.time_phase("transpile"):
+            return cache.transpile(
+                circuits,
+                backend,
+                optimization_level=optimization_level,
+                seed_transpiler=seed_transpiler,
+            )
+
+    def batch(self, backend=None, **run_kwargs):
+        """Return a new :class:`CircuitBatch` for running circuits in a single job.
+
+        :param Backend backend: The backend to run the circuits on, if not
+            specified ``self.backend`` is used.
+        :param run_kwargs: Keyword arguments to pass to ``backend.run()``
+        """
+        return CircuitBatch(
+            backend if backend is not None else self.backend, timer=self.time_phase, **run_kwargs
+        )
+
+    def shared_batch(self, group, build, backend=None, **run_kwargs):
+        """Return a :class:`CircuitBatch` shared by a group of tests in a class.
+
+        This is used to run the circuits for a group of related tests, such as
+        the cases generated by ``ddt``, in a single job. The first test in the
+        group to call this runs ``build`` to add the circuits for every test in
+        the group to the batch, and runs the batch. The other tests in the
+        group then reuse the results and only need to look up their own
+        circuit's result by its key. Circuits should be added in ``build``
+        with :meth:`CircuitBatch.add_from` so an error building or running
+        one test's circuit only fails that test. The time spent building and
+        running the batch is recorded as the ``shared_batch`` phase, which is
+        left out of time budget and baseline checks.
+
+        :param str group: The name of the group of tests sharing the batch
+        :param callable build: A callable which takes a :class:`CircuitBatch`
+            and adds the circuits for all the tests in the group to it,
+            transpiled for the batch's ``backend``
+        :param Backend backend: The backend to run the circuits on, if not
+            specified ``self.backend`` is used. Each backend has its own batch.
+        :param run_kwargs: Keyword arguments to pass to ``backend.run()``
+        :returns: The batch which has already been run
+        """
+        if backend is None:
+            backend = self.backend
+        # The batch holds a reference to the backend so its id isn't reused
+        key = (type(self), group, id(backend))
+        batch = _SHARED_BATCHES.get(key)
+        if batch is not None and batch.backend is backend and batch.run_kwargs == run_kwargs:
+            return batch
+        batch = self.batch(backend, **run_kwargs)
+        with self.time_phase("shared_batch"):
+            self._shared_work.active = True
+            try:
+                build(batch)
+                batch.run()
+            finally:
+                self._shared_work.active = False
+        _SHARED_BATCHES[key] = batch
+        return batch
+
+    def run_jobs_async(self, circuit_sets, backend=None, **run_kwargs):
+        """Submit several jobs concurrently and wait for all of their results.
+
+        Each entry in ``circuit_sets`` is submitted as a separate job. The jobs
+        are submitted and their status polled concurrently using asyncio, so
+        the time they spend queued on a backend overlaps instead of adding up.
+        The polling behavior is set by the ``job_poll_interval``,
+        ``job_poll_max_interval``, ``job_poll_backoff`` and ``job_timeout``
+        configuration options.
+
+        :param list circuit_sets: A list of circuits or lists of circuits, each
+            of which is submitted as a single job
+        :param Backend backend: The backend to run the circuits on, if not
+            specified ``self.backend`` is used.
+        :param run_kwargs: Keyword arguments to pass to ``backend.run()``
+        :returns: A list of :class:`~qiskit_neko.async_jobs.JobOutcome` objects
+            (with the job, its result and a breakdown of the queue and execution
+            times) in the same order as ``circuit_sets``
+        """
+        polling = async_jobs.PollingConfig()
+        if self.config:
+            polling.interval = self.config.config.get("job_poll_interval", polling.interval)
+            polling.max_interval = self.config.config.get(
+                "job_poll_max_interval", polling.max_interval
+            )
+            polling.backoff = self.config.config.get("job_poll_backoff", polling.backoff)
+            polling.timeout = self.config.config.get("job_timeout", polling.timeout)
+        outcomes = async_jobs.run_concurrently(
+            backend if backend is not None else self.backend,
+            circuit_sets,
+            polling=polling,
+            **run_kwargs,
+        )
+        # The jobs ran concurrently so these are the sums over all jobs, not wall time
+        with self._timings_lock:
+            for outcome in outcomes:
+                for phase, value in (
+                    ("job_submission", outcome.timing.submit_time),
+                    ("queue_wait", outcome.timing.queue_time),
+                    ("job_execution", outcome.timing.execution_time),
+                    ("result_retrieval", outcome.timing.result_time),
+                ):
+                    self.timings[phase] = self.timings.get(phase, 0.0) + value
+        return outcomes
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        for key in [key for key in _SHARED_BATCHES if key[0] is cls]:
+            del _SHARED_BATCHES[key]
 
     def load_plugin_script(self, path):
         """Load plugin from user specified script file."""
-        spec = importlib.util.spec_from_file_location("backend_script", path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        return module.main()
+        return backend_plugin.load_plugin_script(path)
 
     def find_config_file(self):
         """Find a config file to use and load."""
-        env_var = os.getenv("NekoConfigPath", None)
-        if env_var is not None:
-            if not os.path.isfile(env_var):
-                LOG.warning(
-                    "NekoConfigPath environment variable set to %s, however no file "
-                    "exists at this path. This value is being ignored.",
-                    env_var,
-                )
-            else:
-                self.config = config.NekoConfig(env_var)
-                return
-        default_filename = "neko_config.yml"
-        home_dir = os.path.expanduser("~")
-        search_locations = [
-            os.path.join(os.getcwd(), default_filename),
-            os.path.join(home_dir, ".qiskit", default_filename),
-            os.path.join(home_dir, ".config", "qiskit-neko", default_filename),
-            os.path.join("/etc", default_filename),
-        ]
-        for path in search_locations:
-            if os.path.isfile(path):
-                LOG.info("Loading configuration file from %s", path)
-                self.config = config.NekoConfig(path)
+        path = config.find_config_path()
+        if path is None:
+            return
+        try:
+            self.config = config.load_config(path)
+        except FileNotFoundError:
+            # The file was removed since it was found, search again
+            config.clear_config_cache()
+            path = config.find_config_path()
+            if path is not None:
+                self.config = config.load_config(path)
 
     def tearDown(self):
         super().tearDown()
@@ -387,6 +1086,139 @@ class BaseTestCase(testtools.testcase.WithAttributes, testtools.TestCase):
             )
         self.__teardown_called = True
 
+    def assertCountsDistribution(self, counts, expected, tolerance=0.1, alpha=0.001, msg=None):
+        """Assert the distribution of counts is close to an expected distribution.
+
+        Fail if the total variation distance between the distribution the
+        counts were sampled from and the expected distribution is larger than
+        ``tolerance`` with confidence ``1 - alpha``. That is, the observed
+        distance must be larger than ``tolerance`` by more than the statistical
+        fluctuation expected for the number of shots (see
+        :func:`tvd_confidence_radius`), so this fails falsely with probability
+        at most ``alpha``.
+        Args:
+            counts (dict): the observed counts.
+            expected (dict): the expected counts or probabilities.
+            tolerance (float): the maximum allowed total variation distance.
+            alpha (float): the maximum probability of a false failure.
+            msg (str): return a custom message on failure.
+        Raises:
+            AssertionError: if the distributions are not close.
+        """
+        with self.time_phase("assertion"):
+            shots = sum(counts.values())
+            num_outcomes = len(set(counts) | {key for key, value in expected.items() if value})
+            distance = total_variation_distance(counts, expected)
+            radius = tvd_confidence_radius(num_outcomes, shots, alpha)
+        if distance - radius > tolerance:
+            error_msg = (
+                f"Total variation distance {distance:.4f} exceeds the tolerance "
+                f"{tolerance} by more than {radius:.4f} for {shots} shots: {counts} != {expected}"
+            )
+            raise self.failureException(self._formatMessage(msg, error_msg))
+
+    def assertCountsChiSquare(self, counts, expected, alpha=0.001, msg=None):
+        """Assert counts were sampled from an expected distribution with a chi-square test.
+
+        Fail if the p-value of Pearson's chi-square goodness of fit test (see
+        :func:`chi_square_pvalue`) is less than ``alpha``, so this fails falsely
+        with probability at most ``alpha`` if the counts are sampled from the
+        expected distribution. This test is exact, so it is only suitable for
+        ideal simulators; use :meth:`assertCountsDistribution` to allow for
+        noise.
+        Args:
+            counts (dict): the observed counts.
+            expected (dict): the expected counts or probabilities.
+            alpha (float): the maximum probability of a false failure.
+            msg (str): return a custom message on failure.
+        Raises:
+            AssertionError: if the counts are not consistent with the
+                expected distribution.
+        """
+        with self.time_phase("assertion"):
+            pvalue = chi_square_pvalue(counts, expected)
+        if pvalue < alpha:
+            error_msg = (
+                f"Chi-square p-value {pvalue:.3g} is less than {alpha}: {counts} != {expected}"
+            )
+            raise self.failureException(self._formatMessage(msg, error_msg))
+
+    def assertDistributionSequential(
+        self,
+        run,
+        expected,
+        tolerance=0.1,
+        alpha=0.001,
+        initial_shots=128,
+        max_shots=8192,
+        growth=4,
+        msg=None,
+    ):
+        """Assert a sampled distribution is close to an expected one using as few shots as needed.
+
+        This runs a small number of shots first and only requests more shots
+        while the result is inconclusive. After each round the total variation
+        distance between the accumulated counts and the expected distribution
+        is compared against ``tolerance`` with a confidence radius (see
+        :func:`tvd_confidence_radius`) computed for a share of ``alpha`` which
+        halves every round, so the overall probability of a false failure is
+        at most ``alpha``. The assertion passes as soon as the distance plus
+        the radius is within the tolerance and fails as soon as the distance
+        minus the radius exceeds it. If the result is still inconclusive
+        after ``max_shots`` it passes and a warning is logged.
+        Args:
+            run (callable): a callable which takes a number of shots and
+                returns a counts dictionary. Every call must return new
+                independent samples, so a fixed simulator seed must not be used.
+            expected (dict): the expected counts or probabilities.
+            tolerance (float): the maximum allowed total variation distance.
+            alpha (float): the maximum probability of a false failure.
+            initial_shots (int): the number of shots for the first round.
+            max_shots (int): the maximum total number of shots.
+            growth (int): the factor the total number of shots grows by in
+                each round.
+            msg (str): return a custom message on failure.
+        Raises:
+            AssertionError: if the distributions are not close.
+        Returns:
+            dict: the accumulated counts from all rounds.
+        """
+        counts = {}
+        shots = 0
+        round_shots = min(initial_shots, max_shots)
+        round_index = 0
+        while True:
+            for key, value in run(round_shots).items():
+                counts[key] = counts.get(key, 0) + value
+            shots += round_shots
+            round_index += 1
+            round_alpha = alpha / 2**round_index
+            with self.time_phase("assertion"):
+                num_outcomes = len(set(counts) | {key for key, value in expected.items() if value})
+                distance = total_variation_distance(counts, expected)
+                radius = tvd_confidence_radius(num_outcomes, shots, round_alpha)
+            if distance - radius > tolerance:
+                error_msg = (
+                    f"Total variation distance {distance:.4f} exceeds the tolerance "
+                    f"{tolerance} by more than {radius:.4f} after {shots} shots: "
+                    f"{counts} != {expected}"
+                )
+                raise self.failureException(self._formatMessage(msg, error_msg))
+            if distance + radius <= tolerance:
+                LOG.debug("Distribution within tolerance after %s shots", shots)
+                return counts
+            if shots >= max_shots:
+                LOG.warning(
+                    "Distribution test inconclusive after %s shots: total variation distance "
+                    "%.4f with confidence radius %.4f for tolerance %s",
+                    shots,
+                    distance,
+                    radius,
+                    tolerance,
+                )
+                return counts
+            round_shots = min(shots * (growth - 1), max_shots - shots)
+
     def assertDictAlmostEqual(
         self, dict1, dict2, delta=None, msg=None, places=None, default_value=0
     ):
@@ -411,7 +1243,8 @@ class BaseTestCase(testtools.testcase.WithAttributes, testtools.TestCase):
             AssertionError: if the dictionaries are not almost equal.
         """
 
-        error_msg = dicts_almost_equal(dict1, dict2, delta, places, default_value)
+        with self.time_phase("assertion"):
+            error_msg = dicts_almost_equal(dict1, dict2, delta, places, default_value)
 
         if error_msg:
             msg = self._formatMessage(msg, error_msg)
@@ -12,15 +12,19 @@
 
 """Tests from circuit basics tutorial."""
 
+import functools
 import math
 
 import ddt
-from qiskit import QuantumCircuit, transpile
+from qiskit import QuantumCircuit
 
 from qiskit_neko import decorators
 from qiskit_neko.tests import base
 
 
+OPTIMIZATION_LEVELS = (0, 1, 2, 3)
+
+
 @ddt.ddt
 class TestCircuitBasics(base.BaseTestCase):
     """Tests adapted from circuit basics tutorial."""
@@ -32,24 +36,37 @@ class TestCircuitBasics(base.BaseTestCase):
         self.circ.cx(0, 1)
         self.circ.cx(0, 2)
 
+    def _build_ghz_batch(self, batch):
+        circuit = self.circ.measure_all(inplace=False)
+        for opt_level in OPTIMIZATION_LEVELS:
+            build = functools.partial(
+                self.transpile,
+                circuit,
+                backend=batch.backend,
+                optimization_level=opt_level,
+                seed_transpiler=42,
+            )
+            batch.add_from(build, key=opt_level)
+
     @decorators.component_attr("terra", "backend")
-    @ddt.data(0, 1, 2, 3)
+    @ddt.data(*OPTIMIZATION_LEVELS)
     def test_ghz_circuit(self, opt_level):
         """Test execution of ghz circuit."""
-        self.circ.measure_all()
-        tqc = transpile(self.circ, self.backend, optimization_level=opt_level)
-        run_kwargs = {}
-        expected_value = None
-        if hasattr(self.backend.options, "shots"):
-            run_kwargs["shots"] = 1000
-            expected_value = 500
-        if hasattr(self.backend.options, "seed_simulator"):
-            run_kwargs["seed_simulator"] = 42
-        job = self.backend.run(tqc, **run_kwargs)
-        result = job.result()
-        counts = result.get_counts()
-        if expected_value is None:
+
+        def run(backend):
+            run_kwargs = {}
+            if hasattr(backend.options, "shots"):
+                run_kwargs["shots"] = 1000
+            if hasattr(backend.options, "seed_simulator"):
+                run_kwargs["seed_simulator"] = 42
+            # The circuits for all optimization levels are run in a single job
+            batch = self.shared_batch("ghz", self._build_ghz_batch, backend=backend, **run_kwargs)
+            return batch.get_counts(opt_level)
+
+        results = self.run_on_backends(run)
+        for name, counts in results.items():
             expected_value = sum(counts.values()) / 2
-        expected = {"000": expected_value, "111": expected_value}
-        delta = 10 ** math.floor(math.log10(expected_value))
-        self.assertDictAlmostEqual(counts, expected, delta=delta)
+            expected = {"000": expected_value, "111": expected_value}
+            delta = 10 ** math.floor(math.log10(expected_value))
+            self.assertDictAlmostEqual(counts, expected, delta=delta, msg=f"Backend {name}")
+        self.assertBackendsAgree(results)
@@ -15,7 +15,6 @@
 import math
 
 from qiskit.circuit import QuantumCircuit
-from qiskit import transpile
 
 from qiskit_neko import decorators
 from qiskit_neko.tests import base
@@ -40,10 +39,17 @@ class TestExecute(base.BaseTestCase):
         circuit.h(0)
         circuit.cx(0, 1)
         circuit.measure_all()
-        job = self.backend.run(transpile(circuit, self.backend), shots=100)
-        result = job.result()
-        counts = result.get_counts()
-        self.assertDictAlmostEqual(counts, {"00": 50, "11": 50}, delta=10)
+
+        def run(backend):
+            job = backend.run(self.transpile(circuit, backend, seed_transpiler=42), shots=100)
+            return job.result().get_counts()
+
+        results = self.run_on_backends(run)
+        for name, counts in results.items():
+            self.assertDictAlmostEqual(
+                counts, {"00": 50, "11": 50}, delta=10, msg=f"Backend {name}"
+            )
+        self.assertBackendsAgree(results)
 
     @decorators.component_attr("terra", "backend")
     def test_bell_execute_default_shots(self):
@@ -52,14 +58,22 @@ class TestExecute(base.BaseTestCase):
         circuit.h(0)
         circuit.cx(0, 1)
         circuit.measure_all()
-        expected_count = self.backend.options.shots / 2
-        job = self.backend.run(transpile(circuit, self.backend))
-        result = job.result()
-        counts = result.get_counts()
-        delta = 10 ** (math.log10(self.backend.options.shots) - 1)
-        self.assertDictAlmostEqual(
-            counts, {"00": expected_count, "11": expected_count}, delta=delta
-        )
+
+        def run(backend):
+            job = backend.run(self.transpile(circuit, backend, seed_transpiler=42))
+            return backend.options.shots, job.result().get_counts()
+
+        results = self.run_on_backends(run)
+        for name, (shots, counts) in results.items():
+            expected_count = shots / 2
+            delta = 10 ** (math.log10(shots) - 1)
+            self.assertDictAlmostEqual(
+                counts,
+                {"00": expected_count, "11": expected_count},
+                delta=delta,
+                msg=f"Backend {name}",
+            )
+        self.assertBackendsAgree({name: counts for name, (_, counts) in results.items()})
 
     @decorators.component_attr("terra", "backend")
     def test_bell_execute_backend_shots_set_options(self):
@@ -69,7 +83,39 @@ class TestExecute(base.BaseTestCase):
         circuit.cx(0, 1)
         circuit.measure_all()
         self.backend.set_options(shots=100)
-        job = self.backend.run(transpile(circuit, self.backend))
+        job = self.backend.run(self.transpile(circuit, seed_transpiler=42))
         result = job.result()
         counts = result.get_counts()
         self.assertDictAlmostEqual(counts, {"00": 50, "11": 50}, delta=10)
+
+    @decorators.component_attr("terra", "backend")
+    def test_bell_execute_concurrent_jobs(self):
+        """Test the execution of a bell circuit in several jobs submitted concurrently."""
+        circuit = QuantumCircuit(2)
+        circuit.h(0)
+        circuit.cx(0, 1)
+        circuit.measure_all()
+        tqc = self.transpile(circuit, seed_transpiler=42)
+        outcomes = self.run_jobs_async([tqc] * 3, shots=100)
+        self.assertEqual(len(outcomes), 3)
+        for outcome in outcomes:
+            counts = outcome.result.get_counts()
+            self.assertDictAlmostEqual(counts, {"00": 50, "11": 50}, delta=10)
+
+    @decorators.component_attr("terra", "backend")
+    def test_bell_execute_sequential_shots(self):
+        """Test the distribution of a bell circuit using only as many shots as needed."""
+        circuit = QuantumCircuit(2)
+        circuit.h(0)
+        circuit.cx(0, 1)
+        circuit.measure_all()
+        tqc = self.transpile(circuit, seed_transpiler=42)
+        seeds = iter(range(42, 142))
+
+        def run(shots):
+            run_kwargs = {"shots": shots}
+            if hasattr(self.backend.options, "seed_simulator"):
+                run_kwargs["seed_simulator"] = next(seeds)
+            return self.backend.run(tqc, **run_kwargs).result().get_counts()
+
+        self.assertDistributionSequential(run, {"00": 0.5, "11": 0.5}, tolerance=0.1)
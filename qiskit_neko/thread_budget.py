@@ -0,0 +1,124 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Split the available CPUs between test worker processes.
+
+By default every Aer simulator uses all the CPU cores of the host, so running
+tests in several worker processes oversubscribes the CPUs and can be slower
+than using fewer workers. The functions in this module compute how many
+threads each worker should use from the number of workers and the CPUs the
+process is allowed to run on, and the options which limit an Aer simulator
+to them.
+
+The number of workers is read from the ``NEKO_WORKERS`` environment variable
+(which is set by ``python -m qiskit_neko.manifest run``) unless it's passed
+in, and ``NEKO_WORKER_THREADS`` can be set to use a fixed number of threads
+per worker instead.
+"""
+
+import logging
+import os
+
+LOG = logging.getLogger(__name__)
+
+WORKERS_ENV = "NEKO_WORKERS"
+THREADS_ENV = "NEKO_WORKER_THREADS"
+
+# The Aer simulator options which bound the number of threads it uses, for
+# circuits run in parallel, shots run in parallel and each simulation
+AER_PARALLEL_OPTIONS = ("max_parallel_threads", "max_parallel_experiments", "max_parallel_shots")
+
+
+def available_cpus():
+    """Return the number of CPUs the current process can run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _env_int(name):
+    value = os.getenv(name)
+    if not value:
+        return None
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        LOG.warning("Ignoring invalid value %r for %s, it must be a positive integer", value, name)
+        return None
+    return number
+
+
+def worker_threads(workers=None, threads=None):
+    """Return the number of threads each test worker process should use.
+
+    :param int workers: The number of worker processes sharing the CPUs,
+        defaults to the value of the ``NEKO_WORKERS`` environment variable
+    :param int threads: A fixed number of threads to use, defaults to the
+        value of the ``NEKO_WORKER_THREADS`` environment variable. If set
+        ``workers`` is ignored.
+    :returns: The number of threads, at least 1, or ``None`` if neither the
+        number of workers nor threads is known, or there is only one worker
+    :rtype: int
+    """
+    if threads is None:
+        threads = _env_int(THREADS_ENV)
+    if threads:
+        return threads
+    if workers is None:
+        workers = _env_int(WORKERS_ENV)
+    if not workers or workers <= 1:
+        return None
+    return max(1, available_cpus() // workers)
+
+
+def aer_options(threads):
+    """Return the Aer simulator options which limit it to a number of threads.
+
+    Every option in :data:`AER_PARALLEL_OPTIONS` is set, so the limit holds
+    however Aer splits the threads between experiments, shots and each
+    simulation.
+
+    :param int threads: The maximum number of threads
+    :rtype: dict
+    """
+    return {option: threads for option in AER_PARALLEL_OPTIONS}
+
+
+def apply_to_backend(backend, threads):
+    """Limit the number of threads used by a backend if it's an Aer simulator.
+
+    Only the options from :func:`aer_options` which the backend has are set,
+    and backends without the ``max_parallel_threads`` option are left
+    unchanged.
+
+    :param backend: The backend to limit
+    :param int threads: The maximum number of threads, if ``None`` nothing
+        is changed
+    :returns: Whether the backend's options were changed
+    :rtype: bool
+    """
+    if threads is None:
+        return False
+    try:
+        if "max_parallel_threads" not in backend.options:
+            return False
+        options = {
+            key: value for key, value in aer_options(threads).items() if key in backend.options
+        }
+        backend.set_options(**options)
+    except (AttributeError, TypeError) as err:
+        LOG.debug("Unable to limit the threads used by %s: %s", backend, err)
+        return False
+    return True
@@ -0,0 +1,295 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Content addressed cache for transpiled circuits."""
+
+import collections
+import hashlib
+import functools
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import weakref
+
+LOG = logging.getLogger(__name__)
+
+
+# Auto-generated names of circuits, which are unique per object. These are
+# also used as the names of instructions made with QuantumCircuit.to_instruction
+_AUTO_CIRCUIT_NAME = re.compile(r"^circuit-\d+$")
+
+
+def _update_circuit_digest(digest, circuit, standard_names):
+    from qiskit import QuantumCircuit
+    from qiskit.circuit import ParameterExpression
+
+    def add(*values):
+        digest.update(repr(values).encode("utf8"))
+
+    def value_repr(value):
+        # The repr of parameter expressions includes their address
+        if isinstance(value, ParameterExpression):
+            return f"{type(value).__name__}({value})"
+        return repr(value)
+
+    add(circuit.num_qubits, circuit.num_clbits, value_repr(circuit.global_phase))
+    add([(reg.name, reg.size) for reg in circuit.qregs])
+    add([(reg.name, reg.size) for reg in circuit.cregs])
+    add(json.dumps(circuit.metadata or {}, sort_keys=True, default=repr))
+    for instruction in circuit.data:
+        operation = instruction.operation
+        add(
+            _AUTO_CIRCUIT_NAME.sub("circuit", operation.name),
+            operation.num_qubits,
+            operation.num_clbits,
+            getattr(operation, "label", None),
+            repr(getattr(operation, "condition", None)),
+            [circuit.find_bit(qubit).index for qubit in instruction.qubits],
+            [circuit.find_bit(clbit).index for clbit in instruction.clbits],
+        )
+        for param in operation.params:
+            if isinstance(param, QuantumCircuit):
+                _update_circuit_digest(digest, param, standard_names)
+            elif hasattr(param, "tobytes"):
+                add(getattr(param, "shape", None), str(getattr(param, "dtype", "")))
+                digest.update(param.tobytes())
+            else:
+                add(value_repr(param))
+        if operation.name not in standard_names:
+            # Custom instructions are identified by their definition, not their name
+            try:
+                definition = operation.definition
+            except Exception:  # pylint: disable=broad-except
+                definition = None
+            if definition is not None:
+                _update_circuit_digest(digest, definition, standard_names)
+
+
+@functools.lru_cache(maxsize=None)
+def _standard_names():
+    from qiskit.circuit.library import get_standard_gate_name_mapping
+
+    return frozenset(get_standard_gate_name_mapping())
+
+
+def circuit_fingerprint(circuit):
+    """Return a fingerprint of the contents of a circuit.
+
+    The fingerprint covers the registers, global phase, metadata and every
+    instruction with its parameters, qubits and clbits, as well as the
+    definitions of any custom instructions. The names of the circuit and of
+    the definitions of custom instructions are ignored, since the
+    auto-generated names are unique per object. Parameters are identified by
+    their names, so circuits with different :class:`~qiskit.circuit.Parameter`
+    objects of the same names have the same fingerprint.
+
+    :param QuantumCircuit circuit: The circuit to fingerprint
+    :returns: The hex digest of the circuit
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    _update_circuit_digest(digest, circuit, _standard_names())
+    return digest.hexdigest()
+
+
+def _use_parameters(circuit, source):
+    # Circuits from the cache can hold other Parameter objects with the same
+    # names as the circuit they're returned for, replace them with its own
+    parameters = {parameter.name: parameter for parameter in source.parameters}
+    mapping = {
+        parameter: parameters[parameter.name]
+        for parameter in circuit.parameters
+        if parameter.name in parameters and parameters[parameter.name] != parameter
+    }
+    if mapping:
+        circuit.assign_parameters(mapping, inplace=True)
+    return circuit
+
+
+def target_fingerprint(target):
+    """Return a fingerprint of a :class:`~qiskit.transpiler.Target`.
+
+    The fingerprint covers the number of qubits, ``dt``, and every supported
+    instruction with its qubits and the error and duration properties.
+
+    :param Target target: The target to fingerprint
+    :returns: The hex digest of the target
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    digest.update(repr((target.num_qubits, target.dt)).encode("utf8"))
+    for name in sorted(target.operation_names):
+        digest.update(name.encode("utf8"))
+        qargs_map = target[name]
+        for qargs in sorted(qargs_map, key=repr):
+            props = qargs_map[qargs]
+            if props is None:
+                digest.update(repr((qargs, None)).encode("utf8"))
+            else:
+                digest.update(repr((qargs, props.error, props.duration)).encode("utf8"))
+    return digest.hexdigest()
+
+
+class TranspileCache:
+    """A cache of transpiled circuits.
+
+    Transpiled circuits are keyed by a fingerprint of the input circuit, a
+    fingerprint of the backend's target, the optimization level and the
+    transpiler seed. The most recently used circuits are stored in memory
+    and optionally in a directory of QPY files which can be shared by multiple
+    processes. Transpilation is only deterministic for a fixed seed, so
+    calls to :meth:`transpile` without ``seed_transpiler`` or with any other
+    transpiler options are passed straight through to
+    :func:`~qiskit.compiler.transpile`.
+
+    The cache can be used from several threads.
+
+    :param int maxsize: The maximum number of circuits to store in memory
+    :param str cache_dir: An optional directory to store transpiled circuits
+        in as QPY files
+    """
+
+    def __init__(self, maxsize=128, cache_dir=None):
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._circuits = collections.OrderedDict()
+        self._target_fingerprints = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _backend_fingerprint(self, backend):
+        target = backend.target
+        try:
+            with self._lock:
+                cached = self._target_fingerprints.get(backend)
+        except TypeError:
+            return target_fingerprint(target)
+        if cached is not None and cached[0] is target:
+            return cached[1]
+        fingerprint = target_fingerprint(target)
+        with self._lock:
+            self._target_fingerprints[backend] = (target, fingerprint)
+        return fingerprint
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.qpy")
+
+    def _get(self, key):
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is not None:
+                self._circuits.move_to_end(key)
+                return circuit
+        if self.cache_dir is None:
+            return None
+        from qiskit import qpy
+
+        try:
+            with open(self._disk_path(key), "rb") as fd:
+                circuit = qpy.load(fd)[0]
+        except FileNotFoundError:
+            return None
+        except Exception as err:  # pylint: disable=broad-except
+            LOG.warning("Unable to load cached circuit %s: %s", key, err)
+            return None
+        self._put(key, circuit, write=False)
+        return circuit
+
+    def _put(self, key, circuit, write=True):
+        if self.maxsize > 0:
+            with self._lock:
+                self._circuits[key] = circuit
+                self._circuits.move_to_end(key)
+                while len(self._circuits) > self.maxsize:
+                    self._circuits.popitem(last=False)
+        if write and self.cache_dir is not None:
+            from qiskit import qpy
+
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as tmp_file:
+                    qpy.dump(circuit, tmp_file)
+                os.replace(tmp_path, self._disk_path(key))
+            except Exception as err:  # pylint: disable=broad-except
+                LOG.warning("Unable to store cached circuit %s: %s", key, err)
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+
+    def transpile(self, circuits, backend, optimization_level=None, seed_transpiler=None, **kwargs):
+        """Transpile circuits for a backend through the cache.
+
+        :param circuits: The circuit or list of circuits to transpile
+        :param Backend backend: The backend to transpile for
+        :param int optimization_level: The optimization level to use
+        :param int seed_transpiler: The seed to use for the transpiler
+        :param kwargs: Any other arguments to pass to
+            :func:`~qiskit.compiler.transpile`. If any are set the cache is
+            bypassed.
+        :returns: The transpiled circuit or list of circuits. The returned
+            circuits are copies and can be modified freely, and use the
+            :class:`~qiskit.circuit.Parameter` objects of the input circuits.
+        """
+        from qiskit import QuantumCircuit, __version__ as qiskit_version
+        from qiskit import transpile
+
+        if kwargs or seed_transpiler is None or getattr(backend, "target", None) is None:
+            return transpile(
+                circuits,
+                backend,
+                optimization_level=optimization_level,
+                seed_transpiler=seed_transpiler,
+                **kwargs,
+            )
+        single = isinstance(circuits, QuantumCircuit)
+        if single:
+            circuits = [circuits]
+        backend_fingerprint = self._backend_fingerprint(backend)
+        keys = []
+        for circuit in circuits:
+            key = hashlib.sha256(
+                repr(
+                    (
+                        qiskit_version,
+                        circuit_fingerprint(circuit),
+                        backend_fingerprint,
+                        optimization_level,
+                        seed_transpiler,
+                    )
+                ).encode("utf8")
+            ).hexdigest()
+            keys.append(key)
+        outputs = [self._get(key) for key in keys]
+        missing = [index for index, output in enumerate(outputs) if output is None]
+        with self._lock:
+            self.hits += len(outputs) - len(missing)
+            self.misses += len(missing)
+        if missing:
+            transpiled = transpile(
+                [circuits[index] for index in missing],
+                backend,
+                optimization_level=optimization_level,
+                seed_transpiler=seed_transpiler,
+            )
+            for index, circuit in zip(missing, transpiled):
+                self._put(keys[index], circuit)
+                outputs[index] = circuit
+        outputs = [
+            _use_parameters(output.copy(name=circuit.name), circuit)
+            for output, circuit in zip(outputs, circuits)
+        ]
+        return outputs[0] if single else outputs
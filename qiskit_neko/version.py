@@ -10,7 +10,12 @@
 # copyright notice, and modified files need to carry a notice indicating
 # that they have been altered from the originals.
 
-"""Functions for getting version information about qiskit experiments."""
+"""Functions for getting version information about qiskit-neko.
+
+The full version string can require running ``git`` in a subprocess so it is
+only computed the first time the ``__version__`` attribute is accessed and not
+when the module is imported.
+"""
 
 
 import os
@@ -76,4 +81,9 @@ def get_version_info():
     return full_version
 
 
-__version__ = get_version_info()
+def __getattr__(name):
+    if name == "__version__":
+        global __version__  # pylint: disable=global-variable-undefined
+        __version__ = get_version_info()
+        return __version__
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
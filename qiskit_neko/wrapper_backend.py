@@ -0,0 +1,78 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Backends which wrap the backend from another backend plugin."""
+
+from qiskit.providers import BackendV2, Options
+
+
+class WrappedBackend(BackendV2):
+    """A backend which delegates to a backend from another plugin.
+
+    The target, options and :meth:`run` of the wrapped backend are used as is,
+    subclasses override :meth:`run` to change how circuits are executed.
+
+    :param backend: The backend to wrap
+    :param str name: The name of the backend, defaults to the name of the
+        wrapped backend
+    """
+
+    def __init__(self, backend, name=None):
+        super().__init__(
+            name=name or backend.name,
+            description=f"Wrapper of {backend.name}",
+            backend_version=getattr(backend, "backend_version", None),
+        )
+        self._backend = backend
+
+    @property
+    def backend(self):
+        """The wrapped backend."""
+        return self._backend
+
+    @classmethod
+    def _default_options(cls):
+        return Options()
+
+    @property
+    def options(self):
+        return self._backend.options
+
+    def set_options(self, **fields):
+        self._backend.set_options(**fields)
+
+    @property
+    def target(self):
+        return self._backend.target
+
+    @property
+    def max_circuits(self):
+        return self._backend.max_circuits
+
+    def run(self, run_input, **options):
+        return self._backend.run(run_input, **options)
+
+
+def parse_wrapped_selection(backend_selection, default_plugin="aer"):
+    """Split a selection string into a wrapped plugin name and its selection string.
+
+    :param str backend_selection: A selection string of the form
+        ``plugin[:selection]``
+    :param str default_plugin: The plugin to use if ``backend_selection`` is
+        empty
+    :returns: A tuple of the plugin name and its selection string (or ``None``)
+    :rtype: tuple
+    """
+    if not backend_selection:
+        return default_plugin, None
+    plugin, _, selection = backend_selection.partition(":")
+    return plugin or default_plugin, selection or None
@@ -69,6 +69,9 @@ setup(
     entry_points={
         "qiskit_neko.backend_plugins": [
             "aer = qiskit_neko.aer_plugin:AerBackendPlugin",
+            "latency = qiskit_neko.latency_plugin:LatencyBackendPlugin",
+            "replay = qiskit_neko.replay_plugin:ReplayBackendPlugin",
+            "server = qiskit_neko.server_plugin:ServerBackendPlugin",
         ]
     },
 )
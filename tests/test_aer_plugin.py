@@ -0,0 +1,136 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+# pylint: disable=missing-class-docstring,missing-function-docstring
+
+"""Test the aer backend plugin."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from qiskit_neko import aer_plugin
+from qiskit_neko import cache
+
+
+class TestAerBackendPluginFakeBackendIndex(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        patcher = mock.patch.dict(os.environ, {"NEKO_CACHE_DIR": tmp_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.index_path = os.path.join(tmp_dir.name, aer_plugin.FAKE_BACKEND_INDEX_FILENAME)
+
+    def test_index_written(self):
+        plugin = aer_plugin.AerBackendPlugin()
+        self.assertIn("fake_sherbrooke", plugin.mock_provider_backend_names)
+        index = cache.read_json(self.index_path)
+        self.assertEqual(index["qiskit_ibm_runtime_version"], aer_plugin._runtime_version())
+        self.assertEqual(index["backends"]["fake_sherbrooke"], "FakeSherbrooke")
+
+    def test_cached_index_used(self):
+        cache.write_json(
+            self.index_path,
+            {
+                "qiskit_ibm_runtime_version": aer_plugin._runtime_version(),
+                "backends": {"fake_sherbrooke": "FakeSherbrooke"},
+            },
+        )
+        with mock.patch.object(aer_plugin, "_build_fake_backend_index") as build_mock:
+            plugin = aer_plugin.AerBackendPlugin()
+            self.assertEqual(plugin.mock_provider_backend_names, {"fake_sherbrooke"})
+        build_mock.assert_not_called()
+
+    def test_index_invalidated_by_version(self):
+        cache.write_json(
+            self.index_path,
+            {"qiskit_ibm_runtime_version": "0.0.0", "backends": {}},
+        )
+        plugin = aer_plugin.AerBackendPlugin()
+        self.assertIn("fake_sherbrooke", plugin.mock_provider_backend_names)
+
+    def test_get_fake_backend(self):
+        plugin = aer_plugin.AerBackendPlugin()
+        backend = plugin.get_backend("fake_sherbrooke")
+        self.assertEqual(backend.name, "fake_sherbrooke")
+
+    def test_invalid_selection(self):
+        plugin = aer_plugin.AerBackendPlugin()
+        with self.assertRaises(ValueError):
+            plugin.get_backend("fake_not_a_real_backend")
+
+
+class TestAerBackendPluginSelection(unittest.TestCase):
+    def test_parse_selection(self):
+        self.assertEqual((None, {}), aer_plugin.parse_selection(None))
+        self.assertEqual(("fake_sherbrooke", {}), aer_plugin.parse_selection("fake_sherbrooke"))
+        self.assertEqual(
+            (
+                None,
+                {
+                    "method": "matrix_product_state",
+                    "precision": "single",
+                    "fusion_enable": True,
+                    "max_memory_mb": 4096,
+                    "zero_threshold": 1e-10,
+                    "seed_simulator": None,
+                },
+            ),
+            aer_plugin.parse_selection(
+                "method=matrix_product_state,precision=single,fusion_enable=true,"
+                "max_memory_mb=4096,zero_threshold=1e-10,seed_simulator=none"
+            ),
+        )
+        self.assertEqual(
+            ("fake_sherbrooke", {"method": "density_matrix"}),
+            aer_plugin.parse_selection("fake_sherbrooke+method=density_matrix"),
+        )
+
+    def test_parse_invalid_option(self):
+        with self.assertRaises(ValueError):
+            aer_plugin.parse_selection("method=statevector,precision")
+
+    def test_options(self):
+        backend = aer_plugin.AerBackendPlugin().get_backend(
+            "method=matrix_product_state,precision=single,fusion_enable=false,max_memory_mb=4096"
+        )
+        self.assertEqual("matrix_product_state", backend.options.method)
+        self.assertEqual("single", backend.options.precision)
+        self.assertFalse(backend.options.fusion_enable)
+        self.assertEqual(4096, backend.options.max_memory_mb)
+
+    def test_fake_backend_with_options(self):
+        backend = aer_plugin.AerBackendPlugin().get_backend("fake_sherbrooke+method=density_matrix")
+        self.assertEqual("density_matrix", backend.options.method)
+        self.assertIsNotNone(backend.options.noise_model)
+        self.assertEqual(127, backend.num_qubits)
+
+    def test_invalid_options(self):
+        plugin = aer_plugin.AerBackendPlugin()
+        for selection in [
+            "not_an_option=1",
+            "method=not_a_method",
+            "fake_not_real+method=statevector",
+            "precision=triple",
+            "device=not_a_device",
+            "method=statevector,shots=abc",
+            "shots=1.5",
+            "fusion_enable=1",
+            "zero_threshold=small",
+            "fake_sherbrooke+precision=triple",
+        ]:
+            with self.subTest(selection=selection):
+                with self.assertRaises(ValueError):
+                    plugin.get_backend(selection)
@@ -0,0 +1,113 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+# pylint: disable=missing-class-docstring,missing-function-docstring
+
+"""Test concurrent job submission."""
+
+import asyncio
+import time
+import unittest
+import uuid
+
+from qiskit.providers import JobStatus
+
+from qiskit_neko import async_jobs
+
+
+class SleepingJob:
+    """Stand-in job which is queued and then runs for fixed times."""
+
+    def __init__(self, circuits, queue_time, run_time, fail=False):
+        self.circuits = circuits
+        self.queue_time = queue_time
+        self.run_time = run_time
+        self.fail = fail
+        self.submitted = time.monotonic()
+        self._job_id = str(uuid.uuid4())
+
+    def job_id(self):
+        return self._job_id
+
+    def status(self):
+        elapsed = time.monotonic() - self.submitted
+        if elapsed < self.queue_time:
+            return JobStatus.QUEUED
+        if elapsed < self.queue_time + self.run_time:
+            return JobStatus.RUNNING
+        return JobStatus.ERROR if self.fail else JobStatus.DONE
+
+    def result(self):
+        if self.fail:
+            raise RuntimeError("Job failed")
+        return {"circuits": self.circuits}
+
+
+class SleepingBackend:
+    """Stand-in backend for a queued service."""
+
+    def __init__(self, queue_time=0.2, run_time=0.1, fail=False):
+        self.queue_time = queue_time
+        self.run_time = run_time
+        self.fail = fail
+        self.run_kwargs = []
+
+    def run(self, circuits, **kwargs):
+        self.run_kwargs.append(kwargs)
+        return SleepingJob(circuits, self.queue_time, self.run_time, self.fail)
+
+
+POLLING = async_jobs.PollingConfig(interval=0.01, max_interval=0.02)
+
+
+class TestRunConcurrently(unittest.TestCase):
+    def test_jobs_overlap(self):
+        backend = SleepingBackend(queue_time=0.3, run_time=0.1)
+        start = time.monotonic()
+        outcomes = async_jobs.run_concurrently(
+            backend, ["a", "b", "c", "d"], polling=POLLING, shots=10
+        )
+        elapsed = time.monotonic() - start
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual([outcome.result["circuits"] for outcome in outcomes], ["a", "b", "c", "d"])
+        self.assertEqual(backend.run_kwargs, [{"shots": 10}] * 4)
+
+    def test_queue_and_execution_time(self):
+        backend = SleepingBackend(queue_time=0.2, run_time=0.1)
+        (outcome,) = async_jobs.run_concurrently(backend, ["a"], polling=POLLING)
+        self.assertAlmostEqual(outcome.timing.queue_time, 0.2, delta=0.05)
+        self.assertAlmostEqual(outcome.timing.execution_time, 0.1, delta=0.05)
+        self.assertGreaterEqual(outcome.timing.total_time, 0.3)
+
+    def test_timeout(self):
+        backend = SleepingBackend(queue_time=1.0, run_time=0.0)
+        polling = async_jobs.PollingConfig(interval=0.01, max_interval=0.02, timeout=0.1)
+        with self.assertRaises(TimeoutError):
+            async_jobs.run_concurrently(backend, ["a"], polling=polling)
+
+    def test_failed_job(self):
+        backend = SleepingBackend(queue_time=0.0, run_time=0.0, fail=True)
+        with self.assertRaises(RuntimeError):
+            async_jobs.run_concurrently(backend, ["a", "b"], polling=POLLING)
+
+    def test_inside_running_loop(self):
+        backend = SleepingBackend(queue_time=0.0, run_time=0.0)
+
+        async def caller():
+            return async_jobs.run_concurrently(backend, ["a", "b"], polling=POLLING)
+
+        outcomes = asyncio.run(caller())
+        self.assertEqual([outcome.result["circuits"] for outcome in outcomes], ["a", "b"])
+
+    def test_no_jobs(self):
+        self.assertEqual(async_jobs.run_concurrently(SleepingBackend(), []), [])
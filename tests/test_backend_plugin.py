@@ -0,0 +1,163 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+# pylint: disable=missing-class-docstring,missing-function-docstring
+
+"""Test the backend plugin pool."""
+
+import os
+import tempfile
+import textwrap
+import unittest
+from unittest import mock
+
+from qiskit_neko import backend_plugin
+
+SCRIPT = textwrap.dedent(
+    """
+    import os
+
+    from qiskit.providers import Options
+
+    from qiskit_neko import backend_plugin
+
+
+    class FakeBackend:
+        def __init__(self, selection):
+            self.selection = selection
+            self.options = Options(shots=1024, seed_simulator=None)
+
+        def set_options(self, **fields):
+            self.options.update_options(**fields)
+
+
+    class FakePlugin(backend_plugin.BackendPlugin):
+        calls = 0
+
+        def get_backend(self, backend_selection=None):
+            FakePlugin.calls += 1
+            return FakeBackend(backend_selection)
+
+
+    class LifecyclePlugin(FakePlugin):
+        def __init__(self):
+            self.events = []
+            self.reusable = True
+
+        def warmup(self):
+            self.events.append("warmup")
+
+        def is_reusable(self, backend):
+            self.events.append("is_reusable")
+            return self.reusable
+
+        def close(self):
+            self.events.append("close")
+            raise RuntimeError("close failed")
+
+
+    def main():
+        return LifecyclePlugin() if os.environ.get("NEKO_LIFECYCLE") else FakePlugin()
+    """
+)
+
+
+class TestBackendPool(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.script_path = os.path.join(tmp_dir.name, "backend_script.py")
+        with open(self.script_path, "w", encoding="utf8") as fd:
+            fd.write(SCRIPT)
+        self.pool = backend_plugin.BackendPool()
+
+    def test_backend_reused(self):
+        first = self.pool.get_backend(script_path=self.script_path)
+        second = self.pool.get_backend(script_path=self.script_path)
+        self.assertIs(first, second)
+        plugin = self.pool._get_script_plugin(self.script_path)
+        self.assertEqual(type(plugin).calls, 1)
+
+    def test_backend_keyed_by_selection(self):
+        first = self.pool.get_backend(backend_selection="a", script_path=self.script_path)
+        second = self.pool.get_backend(backend_selection="b", script_path=self.script_path)
+        self.assertIsNot(first, second)
+        self.assertEqual(first.selection, "a")
+        self.assertEqual(second.selection, "b")
+
+    def test_options_reset_on_checkout(self):
+        backend = self.pool.get_backend(script_path=self.script_path)
+        backend.set_options(shots=100, seed_simulator=42)
+        backend = self.pool.get_backend(script_path=self.script_path)
+        self.assertEqual(backend.options.shots, 1024)
+        self.assertIsNone(backend.options.seed_simulator)
+
+    def test_clear(self):
+        first = self.pool.get_backend(script_path=self.script_path)
+        self.pool.clear()
+        second = self.pool.get_backend(script_path=self.script_path)
+        self.assertIsNot(first, second)
+
+    def test_default_lifecycle(self):
+        first = self.pool.get_backend(script_path=self.script_path)
+        self.assertIs(first, self.pool.get_backend(script_path=self.script_path))
+        self.pool.close()
+        self.assertEqual({}, self.pool._backends)
+        self.assertIsNot(first, self.pool.get_backend(script_path=self.script_path))
+
+    def test_lifecycle(self):
+        with mock.patch.dict(os.environ, {"NEKO_LIFECYCLE": "1"}):
+            plugin = self.pool.get_plugin(script_path=self.script_path)
+        self.assertEqual(["warmup"], plugin.events)
+        first = self.pool.get_backend(script_path=self.script_path)
+        self.assertIs(first, self.pool.get_backend(script_path=self.script_path))
+        self.assertEqual(["warmup", "is_reusable"], plugin.events)
+        plugin.reusable = False
+        second = self.pool.get_backend(script_path=self.script_path)
+        self.assertIsNot(first, second)
+        with self.assertLogs("qiskit_neko.backend_plugin", "WARNING"):
+            self.pool.close()
+        self.assertEqual(["warmup", "is_reusable", "is_reusable", "close"], plugin.events)
+        self.pool.get_backend(script_path=self.script_path)
+        self.assertEqual("warmup", plugin.events[-1])
+
+
+class TestBackendPluginManager(unittest.TestCase):
+    def test_lazy_loads_single_plugin(self):
+        manager = backend_plugin.BackendPluginManager(lazy=True)
+        plugin = manager.get_plugin("aer")
+        self.assertIsInstance(plugin, backend_plugin.BackendPlugin)
+        self.assertIsNone(manager._ext_plugins)
+        self.assertIs(manager.get_plugin("aer"), plugin)
+
+    def test_lazy_full_map_reuses_loaded_plugin(self):
+        manager = backend_plugin.BackendPluginManager(lazy=True)
+        plugin = manager.get_plugin("aer")
+        self.assertIs(manager.ext_plugins["aer"].obj, plugin)
+
+    def test_missing_plugin(self):
+        manager = backend_plugin.BackendPluginManager(lazy=True)
+        with self.assertRaises(KeyError):
+            manager.get_plugin("not_a_real_plugin")
+
+    def test_wrapper_plugins_skipped(self):
+        manager = backend_plugin.BackendPluginManager(lazy=True)
+        names = manager.get_plugin_names()
+        wrappers = set(manager.get_plugin_names(include_wrappers=True)) - set(names)
+        self.assertIn("aer", names)
+        self.assertIn("replay", wrappers)
+        for name in wrappers:
+            self.assertTrue(manager.get_plugin(name).wraps_plugins)
+        backends = manager.get_plugin_backends("method=statevector")
+        self.assertEqual(names, list(backends))
+        self.assertEqual("statevector", backends["aer"].options.method)
@@ -0,0 +1,169 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+# pylint: disable=missing-class-docstring,missing-function-docstring
+
+"""Test the backend server and its backend plugin."""
+
+import os
+import socket
+import stat
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from qiskit import QuantumCircuit
+from qiskit.providers import JobStatus
+
+from qiskit_neko import backend_server
+from qiskit_neko import server_plugin
+from qiskit_neko import thread_budget
+
+
+def bell_circuit():
+    circuit = QuantumCircuit(2, name="bell")
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure_all()
+    return circuit
+
+
+class TestMessages(unittest.TestCase):
+    def test_round_trip(self):
+        left, right = socket.socketpair()
+        self.addCleanup(left.close)
+        self.addCleanup(right.close)
+        backend_server.send_message(left, {"op": "run", "options": {"shots": 10}}, b"\x00" * 5)
+        backend_server.send_message(left, {"op": "ping"})
+        self.assertEqual(
+            ({"op": "run", "options": {"shots": 10}}, b"\x00" * 5),
+            backend_server.recv_message(right),
+        )
+        self.assertEqual(({"op": "ping"}, b""), backend_server.recv_message(right))
+        left.close()
+        with self.assertRaises(ConnectionError):
+            backend_server.recv_message(right)
+
+
+class TestBackendServer(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, "backend.sock")
+        self.server = backend_server.BackendServer(self.path, max_workers=2)
+        thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05})
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.shutdown)
+        self.client = server_plugin.ServerClient(self.path)
+
+    def test_run(self):
+        backend = server_plugin.ServerBackend(self.client, "aer")
+        self.assertEqual("aer_simulator", backend.name)
+        self.assertEqual(1024, backend.options.shots)
+        self.assertIn("cx", backend.target.operation_names)
+        job = backend.run(bell_circuit(), shots=100, seed_simulator=42)
+        counts = job.result().get_counts("bell")
+        self.assertEqual(100, sum(counts.values()))
+        self.assertEqual({"00", "11"}, set(counts))
+        self.assertEqual(JobStatus.DONE, job.status())
+        backend.set_options(shots=10)
+        self.assertEqual(10, backend.options.shots)
+        result = backend.run([bell_circuit(), bell_circuit()]).result()
+        self.assertEqual([10, 10], [sum(counts.values()) for counts in result.get_counts()])
+
+    def test_backends_are_shared(self):
+        first = server_plugin.ServerBackend(self.client, "aer", "method=statevector")
+        second = server_plugin.ServerBackend(self.client, "aer", "method=statevector")
+        self.assertEqual("statevector", second.options.method)
+        first.run(bell_circuit()).result()
+        second.run(bell_circuit()).result()
+        self.assertEqual(1, len(self.server._backends))  # pylint: disable=protected-access
+
+    def test_errors(self):
+        with self.assertRaisesRegex(server_plugin.BackendServerError, "ValueError"):
+            server_plugin.ServerBackend(self.client, "aer", "not_a_backend")
+        with self.assertRaises(server_plugin.BackendServerError):
+            server_plugin.ServerBackend(self.client, "server")
+        backend = server_plugin.ServerBackend(self.client, "aer")
+        with self.assertRaises(TypeError):
+            backend.run(bell_circuit(), noise_model=object())
+        with self.assertRaisesRegex(server_plugin.BackendServerError, "Unknown job"):
+            server_plugin.ServerJob(backend, "missing", self.client).status()
+
+    def test_backend_threads_limited(self):
+        server_plugin.ServerBackend(self.client, "aer")
+        backend = self.server.get_backend("aer", None)
+        expected = max(1, thread_budget.available_cpus() // 2)
+        self.assertEqual(expected, backend.options.max_parallel_threads)
+
+    def test_socket_permissions(self):
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(self.path).st_mode))
+
+    def test_failed_job_removed(self):
+        backend = server_plugin.ServerBackend(self.client, "aer")
+        job = backend.run(bell_circuit(), method="not_a_method")
+        with self.assertRaises(server_plugin.BackendServerError):
+            job.result()
+        self.assertEqual({}, self.server._jobs)  # pylint: disable=protected-access
+
+    def test_start_uses_running_server(self):
+        with mock.patch("subprocess.Popen") as popen_mock:
+            self.client.start()
+        popen_mock.assert_not_called()
+
+    def test_plugin(self):
+        with mock.patch.dict(os.environ, {backend_server.SOCKET_ENV: self.path}):
+            backend = server_plugin.ServerBackendPlugin().get_backend("aer:method=statevector")
+        self.assertEqual("statevector", backend.options.method)
+        self.assertEqual(
+            100, sum(backend.run(bell_circuit(), shots=100).result().get_counts().values())
+        )
+
+    def test_plugin_reuses_backend_while_running(self):
+        plugin = server_plugin.ServerBackendPlugin()
+        backend = server_plugin.ServerBackend(self.client, "aer")
+        self.assertTrue(plugin.is_reusable(backend))
+        stopped = server_plugin.ServerBackend(self.client, "aer")
+        stopped._client = server_plugin.ServerClient(self.path + ".stopped")
+        self.assertFalse(plugin.is_reusable(stopped))
+
+
+class TestDefaultSocketPath(unittest.TestCase):
+    def test_private_directory(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.makedirs(os.path.join(tmpdir, "server"), mode=0o755)
+            with mock.patch.dict(os.environ, {"NEKO_CACHE_DIR": tmpdir}):
+                os.environ.pop(backend_server.SOCKET_ENV, None)
+                path = backend_server.default_socket_path()
+            directory = os.path.join(tmpdir, "server")
+            self.assertEqual(os.path.join(directory, backend_server.SOCKET_NAME), path)
+            self.assertEqual(0o700, stat.S_IMODE(os.stat(directory).st_mode))
+
+
+class TestIdleTimeout(unittest.TestCase):
+    def test_idle_timeout(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "backend.sock")
+            server = backend_server.BackendServer(path, idle_timeout=0.1)
+            thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.02})
+            thread.start()
+            thread.join(timeout=10)
+            self.assertFalse(thread.is_alive())
+            server.server_close()
+            self.assertFalse(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
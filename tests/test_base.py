@@ -0,0 +1,464 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+# pylint: disable=missing-class-docstring,missing-function-docstring
+
+"""Test the base test class helpers."""
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import numpy as np
+import testtools
+from qiskit import QuantumCircuit
+from qiskit_aer import AerSimulator
+
+from qiskit_neko import config
+from qiskit_neko.tests import base
+
+
+def basis_state_circuit(bits):
+    circuit = QuantumCircuit(len(bits))
+    for index, bit in enumerate(reversed(bits)):
+        if bit == "1":
+            circuit.x(index)
+    circuit.measure_all()
+    return circuit
+
+
+class TestCircuitBatch(unittest.TestCase):
+    def test_single_job(self):
+        backend = AerSimulator()
+        batch = base.CircuitBatch(backend, shots=10)
+        batch.add(basis_state_circuit("01"), key="a")
+        batch.add(basis_state_circuit("10"), key="b")
+        with mock.patch.object(backend, "run", wraps=backend.run) as run_mock:
+            self.assertEqual(batch.get_counts("b"), {"10": 10})
+            self.assertEqual(batch.get_counts("a"), {"01": 10})
+        run_mock.assert_called_once()
+        self.assertEqual(len(batch.jobs), 1)
+
+    def test_default_keys(self):
+        batch = base.CircuitBatch(AerSimulator(), shots=10)
+        self.assertEqual(batch.add(basis_state_circuit("1")), 0)
+        self.assertEqual(batch.add(basis_state_circuit("0")), 1)
+        self.assertEqual(batch.get_counts(1), {"0": 10})
+
+    def test_split_by_max_circuits(self):
+        backend = AerSimulator()
+        batch = base.CircuitBatch(backend, shots=10)
+        bits = ["00", "01", "10", "11", "00"]
+        for bit in bits:
+            batch.add(basis_state_circuit(bit))
+        with mock.patch.object(type(backend), "max_circuits", 2):
+            batch.run()
+            self.assertEqual(len(batch.jobs), 3)
+            for index, bit in enumerate(bits):
+                self.assertEqual(batch.get_counts(index), {bit: 10})
+
+    def test_add_after_run(self):
+        batch = base.CircuitBatch(AerSimulator(), shots=10)
+        batch.add(basis_state_circuit("1"))
+        batch.run()
+        with self.assertRaises(ValueError):
+            batch.add(basis_state_circuit("1"))
+
+    def test_duplicate_key(self):
+        batch = base.CircuitBatch(AerSimulator(), shots=10)
+        batch.add(basis_state_circuit("1"), key="a")
+        with self.assertRaises(ValueError):
+            batch.add(basis_state_circuit("1"), key="a")
+
+    def test_build_error_per_member(self):
+        def broken():
+            raise ValueError("transpile failed")
+
+        batch = base.CircuitBatch(AerSimulator(), shots=10)
+        batch.add_from(lambda: basis_state_circuit("1"), key="a")
+        batch.add_from(broken, key="b")
+        with self.assertRaises(ValueError):
+            batch.add_from(broken, key="b")
+        self.assertEqual(batch.get_counts("a"), {"1": 10})
+        with self.assertRaisesRegex(ValueError, "transpile failed"):
+            batch.get_counts("b")
+
+    def test_job_error_per_chunk(self):
+        backend = AerSimulator()
+        batch = base.CircuitBatch(backend, shots=10)
+        bits = ["00", "01", "10"]
+        for bit in bits:
+            batch.add(basis_state_circuit(bit), key=bit)
+        run = backend.run
+
+        def flaky_run(circuits, **kwargs):
+            if len(circuits) == 1:
+                raise RuntimeError("job failed")
+            return run(circuits, **kwargs)
+
+        with mock.patch.object(type(backend), "max_circuits", 2), mock.patch.object(
+            backend, "run", side_effect=flaky_run
+        ):
+            batch.run()
+            self.assertEqual(batch.get_counts("00"), {"00": 10})
+            self.assertEqual(batch.get_counts("01"), {"01": 10})
+            with self.assertRaisesRegex(RuntimeError, "job failed"):
+                batch.get_counts("10")
+
+
+class TestDictsAlmostEqual(unittest.TestCase):
+    def test_equal(self):
+        self.assertEqual(base.dicts_almost_equal({"00": 50, "11": 50}, {"00": 50, "11": 50}), "")
+
+    def test_within_delta(self):
+        self.assertEqual(
+            base.dicts_almost_equal({"00": 45, "11": 55}, {"00": 50, "11": 50}, delta=10), ""
+        )
+
+    def test_outside_delta(self):
+        msg = base.dicts_almost_equal({"00": 30, "11": 70}, {"00": 50, "11": 50}, delta=10)
+        self.assertEqual(msg, "(00: 30 != 50), (11: 70 != 50) within 10 delta")
+
+    def test_default_delta(self):
+        self.assertEqual(base.dicts_almost_equal({"a": 1.0}, {"a": 1.0 + 1e-9}), "")
+        self.assertEqual(
+            base.dicts_almost_equal({"a": 1.0}, {"a": 1.1}), "(a: 1.0 != 1.1) within 1e-08 delta"
+        )
+
+    def test_places(self):
+        self.assertEqual(base.dicts_almost_equal({"a": 1.001}, {"a": 1.002}, places=2), "")
+        self.assertEqual(
+            base.dicts_almost_equal({"a": 1.01}, {"a": 1.02}, places=2),
+            "(a: 1.01 != 1.02) within 2 places",
+        )
+
+    def test_delta_and_places(self):
+        with self.assertRaises(TypeError):
+            base.dicts_almost_equal({"a": 1}, {"a": 2}, delta=1, places=1)
+
+    def test_missing_keys(self):
+        self.assertEqual(base.dicts_almost_equal({"00": 50, "01": 1}, {"00": 50}, delta=2), "")
+        self.assertEqual(
+            base.dicts_almost_equal({"00": 50}, {"00": 50, "11": 5}, delta=2),
+            "(11: 0 != 5) within 2 delta",
+        )
+
+    def test_default_value(self):
+        self.assertEqual(
+            base.dicts_almost_equal({"00": 50}, {"00": 50, "11": 5}, delta=2, default_value=5), ""
+        )
+
+    def test_complex_values(self):
+        self.assertEqual(base.dicts_almost_equal({"a": 1j}, {"a": 1j + 1e-9}), "")
+        self.assertNotEqual(base.dicts_almost_equal({"a": 1j}, {"a": 2j}), "")
+
+    def test_error_message_bounded(self):
+        size = 10 * base.DICT_ERROR_MSG_LIMIT
+        dict1 = {format(index, "020b"): 1 for index in range(size)}
+        msg = base.dicts_almost_equal(dict1, {}, delta=0.5)
+        self.assertEqual(msg.count("!="), base.DICT_ERROR_MSG_LIMIT)
+        self.assertIn(f"and {size - base.DICT_ERROR_MSG_LIMIT} more", msg)
+
+
+class TestDistributionAssertions(unittest.TestCase):
+    class Case(base.BaseTestCase):
+        def test_noop(self):
+            pass
+
+    def setUp(self):
+        self.case = self.Case("test_noop")
+
+    def test_total_variation_distance(self):
+        self.assertEqual(base.total_variation_distance({"0": 50, "1": 50}, {"0": 1, "1": 1}), 0)
+        self.assertAlmostEqual(base.total_variation_distance({"0": 100}, {"0": 0.5, "1": 0.5}), 0.5)
+        self.assertAlmostEqual(base.total_variation_distance({"0": 10}, {"1": 10}), 1.0)
+
+    def test_chi_square_pvalue(self):
+        self.assertGreater(base.chi_square_pvalue({"0": 50, "1": 50}, {"0": 0.5, "1": 0.5}), 0.9)
+        self.assertLess(base.chi_square_pvalue({"0": 90, "1": 10}, {"0": 0.5, "1": 0.5}), 1e-10)
+        self.assertEqual(base.chi_square_pvalue({"0": 99, "1": 1}, {"0": 1.0}), 0.0)
+
+    def test_confidence_radius_shrinks(self):
+        self.assertLess(
+            base.tvd_confidence_radius(2, 1000, 0.01), base.tvd_confidence_radius(2, 100, 0.01)
+        )
+        self.assertLess(
+            base.tvd_confidence_radius(2, 100, 0.1), base.tvd_confidence_radius(2, 100, 0.01)
+        )
+
+    def test_counts_distribution(self):
+        self.case.assertCountsDistribution({"0": 520, "1": 480}, {"0": 0.5, "1": 0.5})
+        with self.assertRaises(AssertionError):
+            self.case.assertCountsDistribution({"0": 900, "1": 100}, {"0": 0.5, "1": 0.5})
+
+    def test_counts_chi_square(self):
+        self.case.assertCountsChiSquare({"0": 520, "1": 480}, {"0": 0.5, "1": 0.5})
+        with self.assertRaises(AssertionError):
+            self.case.assertCountsChiSquare({"0": 600, "1": 400}, {"0": 0.5, "1": 0.5})
+
+    def test_sequential_stops_early(self):
+        rng = np.random.default_rng(1234)
+        requested = []
+
+        def run(shots):
+            requested.append(shots)
+            ones = int(rng.binomial(shots, 0.5))
+            return {"0": shots - ones, "1": ones}
+
+        counts = self.case.assertDistributionSequential(
+            run, {"0": 0.5, "1": 0.5}, tolerance=0.1, initial_shots=100, max_shots=100000
+        )
+        self.assertEqual(sum(counts.values()), sum(requested))
+        self.assertLess(sum(requested), 100000)
+        self.assertGreater(len(requested), 1)
+
+    def test_sequential_fails(self):
+        rng = np.random.default_rng(1234)
+
+        def run(shots):
+            ones = int(rng.binomial(shots, 0.9))
+            return {"0": shots - ones, "1": ones}
+
+        with self.assertRaises(AssertionError):
+            self.case.assertDistributionSequential(run, {"0": 0.5, "1": 0.5}, tolerance=0.1)
+
+
+class TestPhaseTimings(unittest.TestCase):
+    class Case(base.BaseTestCase):
+        def test_phases(self):
+            with self.time_phase("custom"):
+                pass
+            with self.time_phase("custom"):
+                pass
+            self.assertDictAlmostEqual({"0": 1}, {"0": 1})
+
+    def test_timings_attached(self):
+        case = self.Case("test_phases")
+        result = testtools.TestResult()
+        case.run(result)
+        self.assertTrue(result.wasSuccessful(), result.errors + result.failures)
+        details = case.getDetails()
+        timings = json.loads(b"".join(details["neko-timings"].iter_bytes()))
+        for phase in [
+            "config_load",
+            "plugin_load",
+            "backend_creation",
+            "custom",
+            "assertion",
+            "total",
+        ]:
+            self.assertIn(phase, timings)
+        self.assertGreaterEqual(timings["total"], timings["backend_creation"])
+
+
+class TestSharedBatch(unittest.TestCase):
+    class Case(base.BaseTestCase):
+        @staticmethod
+        def build(batch):
+            def broken():
+                raise ValueError("transpile failed")
+
+            batch.add_from(lambda: basis_state_circuit("1"), key="good")
+            batch.add_from(broken, key="bad")
+
+        def test_good(self):
+            batch = self.shared_batch("group", self.build, shots=10)
+            self.assertEqual(batch.get_counts("good"), {"1": 10})
+
+        def test_bad(self):
+            self.shared_batch("group", self.build, shots=10).get_counts("bad")
+
+    def setUp(self):
+        base._SHARED_BATCHES.clear()
+        self.addCleanup(base._SHARED_BATCHES.clear)
+
+    def run_case(self, test):
+        case = self.Case(test)
+        result = testtools.TestResult()
+        case.run(result)
+        timings = json.loads(b"".join(case.getDetails()["neko-timings"].iter_bytes()))
+        return result, timings
+
+    def test_errors_only_fail_owner(self):
+        result, first = self.run_case("test_good")
+        self.assertTrue(result.wasSuccessful(), result.errors + result.failures)
+        self.assertIn("shared_batch", first)
+        self.assertNotIn("job_submission", first)
+        self.assertNotIn("result_retrieval", first)
+        result, second = self.run_case("test_bad")
+        self.assertEqual(1, len(result.errors))
+        self.assertIn("transpile failed", result.errors[0][1])
+        self.assertNotIn("shared_batch", second)
+
+
+class TestRunOnBackends(unittest.TestCase):
+    class Case(base.BaseTestCase):
+        backends_to_use = None
+        function = None
+
+        def test_fanout(self):
+            self.fanout_results = self.run_on_backends(self.function, self.backends_to_use)
+            self.assertBackendsAgree(self.fanout_results)
+
+    def run_case(self, function, backends):
+        case = self.Case("test_fanout")
+        case.function = function
+        case.backends_to_use = backends
+        result = testtools.TestResult()
+        case.run(result)
+        return case, result
+
+    @staticmethod
+    def bell_counts(backend):
+        circuit = QuantumCircuit(2)
+        circuit.h(0)
+        circuit.cx(0, 1)
+        circuit.measure_all()
+        return backend.run(circuit, shots=1000, seed_simulator=42).result().get_counts()
+
+    def test_results_compared(self):
+        backends = {"a": AerSimulator(), "b": AerSimulator(method="statevector")}
+        case, result = self.run_case(self.bell_counts, backends)
+        self.assertTrue(result.wasSuccessful(), result.errors + result.failures)
+        self.assertEqual({"a", "b"}, set(case.fanout_results))
+
+    def test_default_backends(self):
+        case, result = self.run_case(lambda backend: backend, None)
+        self.assertTrue(result.wasSuccessful(), result.errors + result.failures)
+        self.assertEqual({case._backend_plugin: case.backend}, case.fanout_results)
+
+    def test_configured_backends(self):
+        fanout = {"automatic": "aer", "statevector": "aer:method=statevector"}
+        methods = []
+
+        def function(backend):
+            methods.append(backend.options.method)
+            return {"0": 1}
+
+        config.clear_config_cache()
+        self.addCleanup(config.clear_config_cache)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = os.path.join(tmpdir, "neko_config.yml")
+            with open(config_path, "w", encoding="utf8") as fd:
+                json.dump({"fanout_backends": fanout}, fd)
+            with mock.patch.dict(os.environ, {"NekoConfigPath": config_path}):
+                case, result = self.run_case(function, None)
+        self.assertTrue(result.wasSuccessful(), result.errors + result.failures)
+        self.assertEqual({"automatic", "statevector"}, set(case.fanout_results))
+        self.assertEqual(["automatic", "statevector"], sorted(methods))
+
+    def test_disagreement_fails(self):
+        def function(backend):
+            if backend.options.method == "statevector":
+                return {"00": 1000}
+            return self.bell_counts(backend)
+
+        backends = {"a": AerSimulator(), "b": AerSimulator(method="statevector")}
+        _, result = self.run_case(function, backends)
+        self.assertEqual(1, len(result.failures))
+        self.assertIn("Results from b don't agree with a", result.failures[0][1])
+
+    def test_errors_attached(self):
+        def function(backend):
+            if backend.options.method == "statevector":
+                raise ValueError("broken backend")
+            return {}
+
+        backends = {"a": AerSimulator(), "b": AerSimulator(method="statevector")}
+        case, result = self.run_case(function, backends)
+        self.assertEqual(1, len(result.errors))
+        details = case.getDetails()
+        self.assertIn("neko-fanout-b", details)
+        self.assertNotIn("neko-fanout-a", details)
+        self.assertIn("broken backend", details["neko-fanout-b"].as_text())
+
+    def test_concurrent(self):
+        barrier = threading.Barrier(3, timeout=10)
+
+        def function(backend):
+            # Fails with BrokenBarrierError unless all the backends run at once
+            barrier.wait()
+            return {"0": 1}
+
+        backends = {name: AerSimulator() for name in "abc"}
+        _, result = self.run_case(function, backends)
+        self.assertTrue(result.wasSuccessful(), result.errors + result.failures)
+
+
+class TestEnforceSubclassesCall(unittest.TestCase):
+    def setUp(self):
+        calls = self.calls = []
+
+        @base.enforce_subclasses_call(["setUp", "setUpClass"])
+        class Base:
+            def __init__(self, value):
+                self.value = value
+
+            def setUp(self):
+                calls.append("base")
+                return "result"
+
+            @classmethod
+            def setUpClass(cls):
+                calls.append(cls.__name__)
+
+        self.base_cls = Base
+
+    def test_calls_in_order(self):
+        calls = self.calls
+
+        class Child(self.base_cls):
+            def setUp(self):
+                calls.append("child before")
+                out = super().setUp()
+                calls.append("child after")
+                return out
+
+        child = Child(3)
+        self.assertEqual(3, child.value)
+        self.assertEqual("result", child.setUp())
+        self.assertEqual(["child before", "base", "child after"], calls)
+
+    def test_missing_super_call(self):
+        class Child(self.base_cls):
+            def setUp(self):
+                pass
+
+        class GrandChild(Child):
+            def setUp(self):
+                super().setUp()
+
+        with self.assertRaisesRegex(ValueError, "'Child.setUp'"):
+            Child(1).setUp()
+        with self.assertRaisesRegex(ValueError, "'GrandChild.setUp'"):
+            GrandChild(1).setUp()
+
+    def test_classmethod(self):
+        class Child(self.base_cls):
+            @classmethod
+            def setUpClass(cls):
+                super().setUpClass()
+
+        class Broken(self.base_cls):
+            @classmethod
+            def setUpClass(cls):
+                pass
+
+        Child.setUpClass()
+        Child(1).setUpClass()
+        self.assertEqual(["Child", "Child"], self.calls)
+        with self.assertRaisesRegex(ValueError, "'Broken.setUpClass'"):
+            Broken.setUpClass()
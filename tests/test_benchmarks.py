@@ -0,0 +1,103 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+# pylint: disable=missing-class-docstring,missing-function-docstring
+
+"""Test the benchmark runner."""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from qiskit_neko.benchmarks import _common
+from qiskit_neko.benchmarks import runner
+
+
+class Counting:
+    params = ([1, 2], ["a", "b"])
+    param_names = ["number", "letter"]
+
+    def __init__(self):
+        self.calls = []
+
+    def setup(self, number, letter):
+        if number == 2 and letter == "b":
+            raise NotImplementedError
+
+    def time_noop(self, number, letter):
+        self.calls.append((number, letter))
+
+
+class Failing:
+    params = [1]
+
+    def time_fail(self, _):
+        raise RuntimeError("boom")
+
+
+class TestBenchmarkRunner(unittest.TestCase):
+    def test_discover(self):
+        benchmarks = runner.discover(pattern=r"^circuits\.GHZ\.")
+        names = [name for name, _, _ in benchmarks]
+        self.assertEqual(["circuits.GHZ.time_run", "circuits.GHZ.time_transpile"], names)
+
+    def test_param_combinations(self):
+        combinations = list(runner._param_combinations(Counting))
+        self.assertEqual(4, len(combinations))
+        self.assertEqual(({"number": 1, "letter": "b"}, (1, "b")), combinations[1])
+        self.assertEqual([({"param0": 1}, (1,))], list(runner._param_combinations(Failing)))
+
+    def test_run_benchmark(self):
+        times = runner.run_benchmark(Counting, "time_noop", (1, "a"), repeat=3, number=2)
+        self.assertEqual(3, len(times))
+        self.assertIsNone(runner.run_benchmark(Counting, "time_noop", (2, "b")))
+
+    def test_run_writes_history(self):
+        benchmarks = [
+            ("test.Counting.time_noop", Counting, "time_noop"),
+            ("test.Failing.time_fail", Failing, "time_fail"),
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            history = os.path.join(tmpdir, "history.jsonl")
+            with self.assertLogs(runner.LOG, "ERROR"):
+                runner.run(benchmarks, history, repeat=2)
+            runner.run(benchmarks[:1], history, repeat=1)
+            with open(history, encoding="utf8") as fd:
+                records = [json.loads(line) for line in fd]
+        self.assertEqual(9, len(records))
+        statuses = [record["status"] for record in records]
+        self.assertEqual(["ok", "ok", "ok", "skipped", "failed"], statuses[:5])
+        self.assertEqual(2, len(records[0]["times"]))
+        self.assertEqual(min(records[0]["times"]), records[0]["min"])
+        self.assertIn("qiskit", records[0]["environment"]["packages"])
+
+
+class TestBenchmarkBackends(unittest.TestCase):
+    def test_selection_options(self):
+        specs = "aer, aer:fake_sherbrooke,aer:method=matrix_product_state,precision=single,aer"
+        with mock.patch.dict(os.environ, {"NEKO_BENCHMARK_BACKENDS": specs}):
+            self.assertEqual(
+                [
+                    "aer",
+                    "aer:fake_sherbrooke",
+                    "aer:method=matrix_product_state,precision=single",
+                    "aer",
+                ],
+                _common.benchmark_backends(),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,7 +14,10 @@
 
 """Test configuration files."""
 
+import os
+import tempfile
 import unittest
+from unittest import mock
 
 import voluptuous as vol
 
@@ -110,3 +113,43 @@ module_log_level:
         with unittest.mock.patch("qiskit_neko.config.open", mock_open):
             with self.assertRaises(vol.MultipleInvalid):
                 config.NekoConfig("fake_path")
+
+
+class TestConfigCache(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, "neko_config.yml")
+        self.write_config("backend_plugin: aer\n")
+        config.clear_config_cache()
+        self.addCleanup(config.clear_config_cache)
+
+    def write_config(self, data):
+        with open(self.path, "w", encoding="utf8") as fd:
+            fd.write(data)
+
+    def test_load_config_cached(self):
+        first = config.load_config(self.path)
+        second = config.load_config(self.path)
+        self.assertIs(first, second)
+
+    def test_load_config_file_modified(self):
+        first = config.load_config(self.path)
+        self.write_config("backend_plugin: aer\nbackend_selection: fake_sherbrooke\n")
+        second = config.load_config(self.path)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.config["backend_selection"], "fake_sherbrooke")
+
+    def test_clear_config_cache(self):
+        first = config.load_config(self.path)
+        config.clear_config_cache()
+        second = config.load_config(self.path)
+        self.assertIsNot(first, second)
+        self.assertEqual(first.config, second.config)
+
+    def test_find_config_path_env_var(self):
+        with mock.patch.dict(os.environ, {"NekoConfigPath": self.path}):
+            self.assertEqual(config.find_config_path(), self.path)
+            with mock.patch.object(config, "_search_config_path") as search_mock:
+                self.assertEqual(config.find_config_path(), self.path)
+            search_mock.assert_not_called()
@@ -0,0 +1,72 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+# pylint: disable=missing-class-docstring,missing-function-docstring
+
+"""Test the import time side effects of qiskit-neko."""
+
+import json
+import subprocess
+import sys
+import textwrap
+import unittest
+
+# Packages which are only needed when tests are run and must not be imported
+# just by importing qiskit-neko or the base test class.
+HEAVY_PACKAGES = [
+    "qiskit",
+    "qiskit_aer",
+    "qiskit_ibm_runtime",
+    "qiskit_experiments",
+    "qiskit_machine_learning",
+    "scipy",
+]
+
+
+def _import_in_subprocess(module):
+    code = textwrap.dedent(
+        f"""
+        import json
+        import subprocess
+        import sys
+
+        def _fail(*args, **kwargs):
+            raise AssertionError(f"subprocess spawned on import: {{args}}")
+
+        subprocess.Popen = _fail
+        import {module}
+        print(json.dumps(sorted({{name.split(".")[0] for name in sys.modules}})))
+        """
+    )
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=False)
+    return proc
+
+
+class TestImports(unittest.TestCase):
+    def assertLightweightImport(self, module):
+        proc = _import_in_subprocess(module)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        imported = set(json.loads(proc.stdout))
+        self.assertEqual(imported & set(HEAVY_PACKAGES), set())
+
+    def test_import_qiskit_neko(self):
+        self.assertLightweightImport("qiskit_neko")
+
+    def test_import_base_test_class(self):
+        self.assertLightweightImport("qiskit_neko.tests.base")
+
+    def test_version_lazy(self):
+        import qiskit_neko
+        from qiskit_neko import version
+
+        self.assertEqual(qiskit_neko.__version__, version.get_version_info())
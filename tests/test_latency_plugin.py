@@ -0,0 +1,130 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+# pylint: disable=missing-class-docstring,missing-function-docstring
+
+"""Test the latency injecting backend plugin."""
+
+import copy
+import time
+import unittest
+
+from qiskit import QuantumCircuit
+from qiskit.providers import JobError, JobStatus
+
+from qiskit_neko import async_jobs
+from qiskit_neko import latency_plugin
+
+
+def bell_circuit():
+    circuit = QuantumCircuit(2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure_all()
+    return circuit
+
+
+class TestLatencySettings(unittest.TestCase):
+    def test_from_string(self):
+        settings = latency_plugin.LatencySettings.from_string("queue=2,fail=0.5,rate=3,seed=7")
+        self.assertEqual(2.0, settings.queue)
+        self.assertEqual(0.5, settings.fail)
+        self.assertEqual(3, settings.rate)
+        self.assertEqual(7, settings.seed)
+        self.assertEqual(latency_plugin.LatencySettings(), settings.from_string(""))
+
+    def test_invalid(self):
+        for settings in ["delay=1", "queue", "rate=1.5", "fail=often"]:
+            with self.subTest(settings=settings):
+                with self.assertRaises(ValueError):
+                    latency_plugin.LatencySettings.from_string(settings)
+
+
+class TestLatencyPlugin(unittest.TestCase):
+    def setUp(self):
+        self.plugin = latency_plugin.LatencyBackendPlugin()
+
+    def test_selection(self):
+        backend = self.plugin.get_backend()
+        self.assertEqual("aer_simulator", backend.name)
+        self.assertEqual(latency_plugin.LatencySettings(), backend.settings)
+        backend = self.plugin.get_backend("queue=0.5:method=statevector")
+        self.assertEqual(0.5, backend.settings.queue)
+        self.assertEqual("statevector", backend.options.method)
+
+    def test_status_transitions(self):
+        backend = self.plugin.get_backend("queue=0.2,run=0.2")
+        job = backend.run(bell_circuit(), shots=100)
+        self.assertEqual(JobStatus.QUEUED, job.status())
+        time.sleep(0.25)
+        self.assertEqual(JobStatus.RUNNING, job.status())
+        self.assertEqual(100, sum(job.result().get_counts().values()))
+        self.assertEqual(JobStatus.DONE, job.status())
+        self.assertEqual(job.job_id(), job.result().job_id)
+
+    def test_transient_failure(self):
+        backend = self.plugin.get_backend("fail=1")
+        job = backend.run(bell_circuit(), shots=100)
+        with self.assertRaises(latency_plugin.TransientJobError):
+            job.result()
+        self.assertEqual(JobStatus.ERROR, job.status())
+
+    def test_cancel(self):
+        backend = self.plugin.get_backend("queue=10")
+        job = backend.run(bell_circuit(), shots=100)
+        self.assertTrue(job.cancel())
+        self.assertEqual(JobStatus.CANCELLED, job.status())
+        with self.assertRaises(JobError):
+            job.result()
+
+    def test_rate_limit(self):
+        backend = self.plugin.get_backend("rate=2,window=0.3")
+        backend.run(bell_circuit(), shots=10)
+        backend.run(bell_circuit(), shots=10)
+        with self.assertRaises(latency_plugin.RateLimitError) as err:
+            backend.run(bell_circuit(), shots=10)
+        self.assertGreater(err.exception.retry_after, 0)
+        time.sleep(err.exception.retry_after)
+        backend.run(bell_circuit(), shots=10).result()
+
+    def test_max_jobs(self):
+        backend = self.plugin.get_backend("queue=0.2,max_jobs=1")
+        job = backend.run(bell_circuit(), shots=10)
+        with self.assertRaises(latency_plugin.RateLimitError):
+            backend.run(bell_circuit(), shots=10)
+        job.result()
+        backend.run(bell_circuit(), shots=10).result()
+
+    def test_deepcopy(self):
+        backend = self.plugin.get_backend("rate=1,window=10")
+        backend.run(bell_circuit(), shots=10)
+        copied = copy.deepcopy(backend)
+        self.assertEqual(backend.settings, copied.settings)
+        copied.run(bell_circuit(), shots=10).result()
+
+    def test_concurrent_jobs_overlap(self):
+        backend = self.plugin.get_backend("queue=0.3,run=0.1")
+        start = time.monotonic()
+        outcomes = async_jobs.run_concurrently(
+            backend,
+            [bell_circuit() for _ in range(4)],
+            polling=async_jobs.PollingConfig(interval=0.02, max_interval=0.05),
+            shots=100,
+        )
+        self.assertLess(time.monotonic() - start, 1.2)
+        for outcome in outcomes:
+            self.assertEqual(100, sum(outcome.result.get_counts().values()))
+            self.assertGreaterEqual(outcome.timing.queue_time, 0.25)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+# pylint: disable=missing-class-docstring,missing-function-docstring
+
+"""Test the shared log file handlers."""
+
+import json
+import logging
+import logging.handlers
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import testtools
+
+from qiskit_neko import config
+from qiskit_neko import log_file
+from qiskit_neko.tests import base
+
+
+class TestLogFile(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.addCleanup(log_file.close_log_files)
+        self.path = os.path.join(self.tmpdir.name, "neko.log")
+        self.logger = logging.getLogger("qiskit_neko.test_log_file")
+        self.logger.setLevel(logging.DEBUG)
+        self.addCleanup(self.logger.setLevel, logging.NOTSET)
+
+    def read_lines(self):
+        log_file.close_log_files()
+        with open(self.path, encoding="utf8") as fd:
+            return fd.read().splitlines()
+
+    def root_queue_handlers(self):
+        return [
+            handler
+            for handler in logging.getLogger("").handlers
+            if isinstance(handler, logging.handlers.QueueHandler)
+        ]
+
+    def test_handler_reused(self):
+        first = log_file.configure_log_file(self.path, "%(name)s %(message)s")
+        second = log_file.configure_log_file(self.path, "%(name)s %(message)s")
+        self.assertIs(first, second)
+        self.assertEqual([first], self.root_queue_handlers())
+        self.logger.warning("hello %s", "world")
+        self.assertEqual(["qiskit_neko.test_log_file hello world"], self.read_lines())
+        self.assertEqual([], self.root_queue_handlers())
+
+    def test_settings_change_replaces_handler(self):
+        first = log_file.configure_log_file(self.path, "%(message)s")
+        second = log_file.configure_log_file(self.path, "%(levelname)s %(message)s", "ERROR")
+        self.assertIsNot(first, second)
+        self.assertEqual([second], self.root_queue_handlers())
+        self.logger.warning("dropped")
+        self.logger.error("kept")
+        self.assertEqual(["ERROR kept"], self.read_lines())
+
+    def test_json_lines(self):
+        log_file.configure_log_file(self.path, "%(message)s", json_lines=True)
+        self.logger.info("value %d", 42)
+        try:
+            raise ValueError("bad")
+        except ValueError:
+            self.logger.exception("failed")
+        lines = [json.loads(line) for line in self.read_lines()]
+        self.assertEqual(2, len(lines))
+        self.assertEqual("value 42", lines[0]["message"])
+        self.assertEqual("INFO", lines[0]["level"])
+        self.assertEqual("qiskit_neko.test_log_file", lines[0]["name"])
+        self.assertIn("ValueError: bad", lines[1]["message"])
+
+    def test_base_test_case_single_handler(self):
+        class Case(base.BaseTestCase):
+            def test_log(self):
+                logging.getLogger("qiskit_neko.test_log_file").warning("from %s", self.id())
+
+        config_path = os.path.join(self.tmpdir.name, "neko_config.yml")
+        with open(config_path, "w", encoding="utf8") as fd:
+            json.dump({"log_file": self.path}, fd)
+        config.clear_config_cache()
+        self.addCleanup(config.clear_config_cache)
+        with mock.patch.dict(os.environ, {"NekoConfigPath": config_path}):
+            for _ in range(3):
+                result = testtools.TestResult()
+                Case("test_log").run(result)
+                self.assertTrue(result.wasSuccessful(), result.errors + result.failures)
+        self.assertEqual(1, len(self.root_queue_handlers()))
+        lines = [line for line in self.read_lines() if "test_log_file" in line]
+        self.assertEqual(3, len(lines))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,207 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+# pylint: disable=missing-class-docstring,missing-function-docstring
+
+"""Test the static test manifest."""
+
+import os
+import tempfile
+import textwrap
+import unittest
+from unittest import mock
+
+from qiskit_neko import manifest
+
+SOURCE = textwrap.dedent(
+    """
+    import ddt
+    from ddt import data, unpack
+
+    from qiskit_neko import decorators
+    from qiskit_neko.tests import base
+
+    LEVELS = (0, 1, 2, 3)
+    HAS_FEATURE = False
+    UNHASHABLE = {[1]: 2}
+
+
+    @ddt.ddt
+    class TestExample(base.BaseTestCase):
+        def setUp(self):
+            super().setUp()
+
+        @decorators.component_attr("terra", "backend")
+        @ddt.data(*LEVELS)
+        def test_levels(self, level):
+            pass
+
+        @decorators.component_attr("terra", "aer", "machine_learning")
+        @data(["reference", 2], ["aer", 1])
+        @unpack
+        def test_unpack(self, implementation, decimal):
+            pass
+
+        def test_plain(self):
+            pass
+
+
+    @ddt.ddt(testNameFormat=ddt.TestNameFormat.INDEX_ONLY)
+    class TestIndexOnly(base.BaseTestCase):
+        @decorators.component_attr("terra", condition=HAS_FEATURE)
+        @decorators.component_attr("backend", condition=True)
+        @data("a", "b")
+        def test_index(self, value):
+            pass
+
+
+    class _Mixin(base.BaseTestCase):
+        def test_shared(self):
+            pass
+
+
+    class TestChild(_Mixin):
+        pass
+    """
+)
+
+
+class TestScanSource(unittest.TestCase):
+    def test_scan(self):
+        tests = {test["id"]: test for test in manifest.scan_source(SOURCE, "pkg.test_mod")}
+        self.assertEqual(
+            [
+                "pkg.test_mod.TestChild.test_shared",
+                "pkg.test_mod.TestExample.test_levels_1_0",
+                "pkg.test_mod.TestExample.test_levels_2_1",
+                "pkg.test_mod.TestExample.test_levels_3_2",
+                "pkg.test_mod.TestExample.test_levels_4_3",
+                "pkg.test_mod.TestExample.test_plain",
+                "pkg.test_mod.TestExample.test_unpack_1___reference___2_",
+                "pkg.test_mod.TestExample.test_unpack_2___aer___1_",
+                "pkg.test_mod.TestIndexOnly.test_index_1",
+                "pkg.test_mod.TestIndexOnly.test_index_2",
+            ],
+            sorted(tests),
+        )
+        self.assertEqual(
+            ["aer", "machine_learning", "terra"],
+            tests["pkg.test_mod.TestExample.test_unpack_2___aer___1_"]["attrs"],
+        )
+        self.assertEqual([], tests["pkg.test_mod.TestExample.test_plain"]["attrs"])
+        self.assertEqual(["backend"], tests["pkg.test_mod.TestIndexOnly.test_index_1"]["attrs"])
+
+    def test_dynamic_data(self):
+        source = textwrap.dedent(
+            """
+            @ddt
+            class TestDynamic(base.BaseTestCase):
+                @data(*range(3))
+                def test_range(self, value):
+                    pass
+            """
+        )
+        with self.assertRaises(manifest._DynamicTests):
+            manifest.scan_source(source, "pkg.test_dynamic")
+
+    def test_dynamic_condition(self):
+        source = textwrap.dedent(
+            """
+            class TestDynamic(base.BaseTestCase):
+                @decorators.component_attr("terra", condition=sys.platform == "linux")
+                def test_platform(self):
+                    pass
+            """
+        )
+        with self.assertRaises(manifest._DynamicTests):
+            manifest.scan_source(source, "pkg.test_dynamic")
+
+
+class TestBuildManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.cache_file = os.path.join(self.tmpdir.name, "manifest.json")
+
+    def test_matches_loaded_tests(self):
+        test_dir = os.path.join(manifest.TEST_DIR, "circuits")
+        tests = manifest.build_manifest(test_dir, self.cache_file)
+        imported = []
+        for module in ["test_circuit_basics", "test_execute"]:
+            imported.extend(manifest._import_tests(f"qiskit_neko.tests.circuits.{module}"))
+        self.assertEqual(
+            sorted(imported, key=lambda test: test["id"]),
+            sorted(tests, key=lambda test: test["id"]),
+        )
+
+    def test_cached_by_hash(self):
+        test_dir = os.path.join(self.tmpdir.name, "pkg", "tests")
+        os.makedirs(test_dir)
+        for package_dir in [os.path.dirname(test_dir), test_dir]:
+            with open(os.path.join(package_dir, "__init__.py"), "w", encoding="utf8"):
+                pass
+        path = os.path.join(test_dir, "test_example.py")
+        with open(path, "w", encoding="utf8") as fd:
+            fd.write(SOURCE)
+        with mock.patch.object(manifest, "scan_source", wraps=manifest.scan_source) as scan:
+            first = manifest.build_manifest(test_dir, self.cache_file)
+            second = manifest.build_manifest(test_dir, self.cache_file)
+            self.assertEqual(1, scan.call_count)
+            self.assertEqual(first, second)
+            self.assertEqual("pkg.tests.test_example.TestExample.test_levels_1_0", first[0]["id"])
+            with open(path, "a", encoding="utf8") as fd:
+                fd.write(
+                    "\n\nclass TestNew(base.BaseTestCase):\n    def test_new(self):\n        pass\n"
+                )
+            third = manifest.build_manifest(test_dir, self.cache_file)
+            self.assertEqual(2, scan.call_count)
+        self.assertEqual(len(first) + 1, len(third))
+
+    def test_unwritable_cache(self):
+        test_dir = os.path.join(manifest.TEST_DIR, "circuits")
+        cache_file = os.path.join(self.tmpdir.name, "missing", "manifest.json")
+        with self.assertLogs(manifest.LOG, "WARNING"):
+            tests = manifest.build_manifest(test_dir, cache_file)
+        self.assertEqual(tests, manifest.build_manifest(test_dir, self.cache_file))
+
+
+class TestSelectTests(unittest.TestCase):
+    def setUp(self):
+        self.tests = [
+            {"id": "m.A.test_a", "attrs": ["backend", "terra"]},
+            {"id": "m.B.test_b", "attrs": ["machine_learning", "terra"]},
+            {"id": "m.C.test_c", "attrs": []},
+        ]
+
+    def ids(self, **kwargs):
+        return [
+            manifest.format_test_id(test) for test in manifest.select_tests(self.tests, **kwargs)
+        ]
+
+    def test_select(self):
+        self.assertEqual(3, len(self.ids()))
+        self.assertEqual(
+            ["m.A.test_a[backend,terra]", "m.B.test_b[machine_learning,terra]"],
+            self.ids(attrs=["terra"]),
+        )
+        self.assertEqual(
+            ["m.A.test_a[backend,terra]", "m.C.test_c"],
+            self.ids(exclude_attrs=["machine_learning"]),
+        )
+        self.assertEqual(["m.B.test_b[machine_learning,terra]"], self.ids(filters=[r"B\.", "ml"]))
+        self.assertEqual(
+            ["m.A.test_a[backend,terra]"], self.ids(filters=[r"\[backend"], attrs=["terra"])
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
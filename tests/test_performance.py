@@ -0,0 +1,215 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+# pylint: disable=missing-class-docstring,missing-function-docstring
+
+"""Test time budgets and baselines."""
+
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+import unittest
+from unittest import mock
+
+import testtools
+
+from qiskit_neko import config
+from qiskit_neko import decorators
+from qiskit_neko import performance
+from qiskit_neko.tests import base
+
+
+class TestBaseline(unittest.TestCase):
+    def setUp(self):
+        performance.clear_baseline_cache()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "baseline.jsonl")
+
+    def test_missing_file(self):
+        self.assertEqual({}, performance.load_baseline(self.path))
+
+    def test_record_and_load_median(self):
+        for total in [1.0, 3.0, 2.0]:
+            performance.record_baseline(self.path, "a.test", "aer", None, {"total": total})
+        performance.record_baseline(self.path, "a.test", "aer", "fake_manila", {"total": 9.0})
+        with open(self.path, "a", encoding="utf8") as fd:
+            fd.write("not json\n")
+        baseline = performance.load_baseline(self.path)
+        self.assertEqual({"total": 2.0}, baseline[("a.test", "aer", None)])
+        self.assertEqual({"total": 9.0}, baseline[("a.test", "aer", "fake_manila")])
+
+    def test_load_cached_until_modified(self):
+        performance.record_baseline(self.path, "a.test", "aer", None, {"total": 1.0})
+        first = performance.load_baseline(self.path)
+        self.assertIs(first, performance.load_baseline(self.path))
+        performance.record_baseline(self.path, "b.test", "aer", None, {"total": 1.0})
+        self.assertIn(("b.test", "aer", None), performance.load_baseline(self.path))
+
+
+class TestCheckTimings(unittest.TestCase):
+    def test_find_budget(self):
+        time_budget = {
+            "tests": {"qiskit_neko.tests.circuits.*": 10.0, "*.test_slow": 100.0},
+            "components": {"aer": 5.0, "experiment": 60.0},
+        }
+        self.assertEqual(
+            (10.0, "test budget 'qiskit_neko.tests.circuits.*'"),
+            performance.find_budget(
+                time_budget, "qiskit_neko.tests.circuits.Test.test_slow", {"experiment"}
+            ),
+        )
+        self.assertEqual(
+            (5.0, "component budget 'aer'"),
+            performance.find_budget(time_budget, "other.Test.test", {"aer", "terra"}),
+        )
+        self.assertEqual((None, None), performance.find_budget(time_budget, "other.test"))
+        self.assertEqual((None, None), performance.find_budget(None, "other.test"))
+
+    def test_check_budget(self):
+        budget = (1.0, "test budget '*'")
+        self.assertEqual([], performance.check_timings({"total": 0.9}, budget))
+        problems = performance.check_timings({"total": 1.5}, budget)
+        self.assertEqual(1, len(problems))
+        self.assertIn("test budget '*' of 1.0s", problems[0])
+
+    def test_check_baseline(self):
+        baseline = {"total": 2.0}
+        self.assertEqual(
+            [], performance.check_timings({"total": 3.4}, baseline=baseline, tolerance=0.5)
+        )
+        problems = performance.check_timings(
+            {"total": 3.6}, baseline=baseline, tolerance=0.5, grace=0.0
+        )
+        self.assertEqual(1, len(problems))
+        self.assertIn("baseline of 2.000s", problems[0])
+
+    def test_setup_phases_not_checked(self):
+        timings = {"total": 5.0, "backend_creation": 4.0, "plugin_load": 0.5}
+        self.assertEqual(0.5, performance.checked_time(timings))
+        self.assertEqual([], performance.check_timings(timings, (1.0, "test budget '*'")))
+        baseline = {"total": 0.6}
+        self.assertEqual([], performance.check_timings(timings, baseline=baseline, grace=0.0))
+        problems = performance.check_timings(
+            {"total": 1.0}, baseline={"total": 4.5, "backend_creation": 4.1}, grace=0.0
+        )
+        self.assertIn("baseline of 0.400s", problems[0])
+
+
+class TestMemoryTracker(unittest.TestCase):
+    def test_peak_and_net(self):
+        tracker = performance.MemoryTracker()
+        tracker.start()
+        kept = bytearray(2**20)
+        temporary = bytearray(4 * 2**20)
+        del temporary
+        memory = tracker.stop()
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertGreaterEqual(memory["peak"], 4 * 2**20)
+        self.assertGreaterEqual(memory["net"], 2**20)
+        self.assertLess(memory["net"], 2 * 2**20)
+        del kept
+
+    def test_check_memory(self):
+        memory = {"peak": 3 * 2**20, "net": 0}
+        self.assertEqual([], performance.check_memory(memory))
+        self.assertEqual([], performance.check_memory(memory, (4.0, "component budget 'aer'")))
+        problems = performance.check_memory(memory, (2.0, "component budget 'aer'"))
+        self.assertEqual(1, len(problems))
+        self.assertIn("peak of 3.0 MiB", problems[0])
+
+
+class TestPerformanceGate(unittest.TestCase):
+    class Case(base.BaseTestCase):
+        @decorators.component_attr("terra")
+        def test_sleep(self):
+            time.sleep(0.05)
+
+        @decorators.component_attr("terra")
+        def test_allocate(self):
+            self.data = bytearray(8 * 2**20)
+
+    def setUp(self):
+        config.clear_config_cache()
+        performance.clear_baseline_cache()
+        self.addCleanup(config.clear_config_cache)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.baseline_file = os.path.join(self.tmpdir.name, "baseline.jsonl")
+        self.test_id = f"{__name__}.TestPerformanceGate.Case.test_sleep"
+
+    def run_case(self, test="test_sleep", **settings):
+        config_path = os.path.join(self.tmpdir.name, "neko_config.yml")
+        with open(config_path, "w", encoding="utf8") as fd:
+            json.dump(settings, fd)
+        case = self.Case(test)
+        result = testtools.TestResult()
+        with mock.patch.dict(os.environ, {"NekoConfigPath": config_path}):
+            case.run(result)
+        return case, result
+
+    def test_record_baseline(self):
+        _, result = self.run_case(baseline_file=self.baseline_file, record_baseline=True)
+        self.assertTrue(result.wasSuccessful(), result.errors + result.failures)
+        baseline = performance.load_baseline(self.baseline_file)
+        self.assertGreaterEqual(baseline[(self.test_id, "aer", None)]["total"], 0.05)
+
+    def test_exceeds_baseline_fails(self):
+        performance.record_baseline(self.baseline_file, self.test_id, "aer", None, {"total": 0.001})
+        case, result = self.run_case(
+            baseline_file=self.baseline_file, baseline_tolerance=0.1, baseline_grace=0.0
+        )
+        self.assertEqual(1, len(result.failures))
+        self.assertIn("neko-performance", case.getDetails())
+
+    def test_within_baseline_passes(self):
+        performance.record_baseline(self.baseline_file, self.test_id, "aer", None, {"total": 0.001})
+        _, result = self.run_case(baseline_file=self.baseline_file)
+        self.assertTrue(result.wasSuccessful(), result.errors + result.failures)
+
+    def test_component_budget_warns(self):
+        with self.assertWarns(performance.PerformanceWarning):
+            case, result = self.run_case(
+                time_budget={"components": {"terra": 0.001}}, performance_action="warn"
+            )
+        self.assertTrue(result.wasSuccessful(), result.errors + result.failures)
+        self.assertIn("neko-performance", case.getDetails())
+
+    def test_test_budget_fails(self):
+        _, result = self.run_case(time_budget={"tests": {f"{__name__}.*": 0.001}})
+        self.assertEqual(1, len(result.failures))
+
+    def test_track_memory(self):
+        case, result = self.run_case("test_allocate", track_memory=True)
+        self.assertTrue(result.wasSuccessful(), result.errors + result.failures)
+        memory = json.loads(b"".join(case.getDetails()["neko-memory"].iter_bytes()))
+        self.assertGreaterEqual(memory["peak"], 8 * 2**20)
+        self.assertGreaterEqual(memory["net"], 8 * 2**20)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_memory_budget_fails(self):
+        case, result = self.run_case(
+            "test_allocate", memory_budget={"components": {"terra": 4.0, "aer": 1.0}}
+        )
+        self.assertEqual(1, len(result.failures))
+        self.assertIn("neko-memory-budget", case.getDetails())
+
+    def test_no_memory_tracking_by_default(self):
+        case, result = self.run_case("test_allocate")
+        self.assertTrue(result.wasSuccessful(), result.errors + result.failures)
+        self.assertNotIn("neko-memory", case.getDetails())
+
+
+if __name__ == "__main__":
+    unittest.main()
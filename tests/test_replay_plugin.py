@@ -0,0 +1,87 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+# pylint: disable=missing-class-docstring,missing-function-docstring
+
+"""Test the record and replay backend plugin."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from qiskit import QuantumCircuit
+from qiskit.providers import JobStatus
+
+from qiskit_neko import replay_plugin
+
+
+def bell_circuit():
+    circuit = QuantumCircuit(2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure_all()
+    return circuit
+
+
+class TestReplayPlugin(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        patcher = mock.patch.dict(os.environ, {"NEKO_REPLAY_DIR": self.tmpdir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.plugin = replay_plugin.ReplayBackendPlugin()
+
+    def test_selection(self):
+        backend = self.plugin.get_backend()
+        self.assertEqual("auto", backend.mode)
+        self.assertEqual("aer_simulator", backend.name)
+        backend = self.plugin.get_backend("replay:aer:method=statevector")
+        self.assertEqual("replay", backend.mode)
+        self.assertEqual("statevector", backend.options.method)
+        self.assertTrue(backend.store.path.endswith("aer-method=statevector"))
+        self.assertEqual("record", self.plugin.get_backend("record").mode)
+        with self.assertRaises(ValueError):
+            self.plugin.get_backend("replay:replay")
+
+    def test_record_then_replay(self):
+        recorder = self.plugin.get_backend("record:aer")
+        recorded = recorder.run(bell_circuit(), shots=100, seed_simulator=1234).result()
+        replayer = self.plugin.get_backend("replay:aer")
+        circuit = bell_circuit()
+        with mock.patch.object(replayer.backend, "run") as run_mock:
+            job = replayer.run(circuit, shots=100, seed_simulator=1234)
+            run_mock.assert_not_called()
+        self.assertEqual(JobStatus.DONE, job.status())
+        self.assertEqual(recorded.get_counts(), job.result().get_counts(circuit))
+
+    def test_replay_miss(self):
+        self.plugin.get_backend("record:aer").run(bell_circuit(), shots=100).result()
+        replayer = self.plugin.get_backend("replay:aer")
+        with self.assertRaises(replay_plugin.ReplayMissError):
+            replayer.run(bell_circuit(), shots=200)
+        replayer.set_options(shots=100)
+        replayer.run(bell_circuit()).result()
+
+    def test_auto_records_once(self):
+        backend = self.plugin.get_backend("auto:aer")
+        with mock.patch.object(backend.store, "put", wraps=backend.store.put) as put_mock:
+            first = backend.run(bell_circuit(), shots=100).result()
+            second = backend.run(bell_circuit(), shots=100).result()
+        put_mock.assert_called_once()
+        self.assertEqual(first.get_counts(), second.get_counts())
+        self.assertEqual(1, len(os.listdir(backend.store.path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+# pylint: disable=missing-class-docstring,missing-function-docstring
+
+"""Test the timing based test scheduling."""
+
+import os
+import tempfile
+import unittest
+
+import yaml
+from stestr import selection
+
+from qiskit_neko import scheduling
+
+
+class TestTimingDatabase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "timings.jsonl")
+
+    def test_missing_file(self):
+        self.assertEqual({}, scheduling.TimingDatabase(self.path).get_times("aer"))
+
+    def test_recent_median_per_backend(self):
+        database = scheduling.TimingDatabase(self.path, history=3)
+        for duration in [100.0, 1.0, 3.0, 2.0]:
+            database.record("a.Test.test_a[terra]", "aer", None, duration)
+        database.record("a.Test.test_a", "aer", "fake_manila", 10.0)
+        database.record("a.Test.test_b", "other", None, 5.0)
+        self.assertEqual({"a.Test.test_a": 2.0}, database.get_times("aer"))
+        self.assertEqual({"a.Test.test_a": 10.0}, database.get_times("aer", "fake_manila"))
+        self.assertEqual({"a.Test.test_b": 5.0}, database.get_times("other"))
+
+    def test_compact(self):
+        database = scheduling.TimingDatabase(self.path, history=2)
+        for duration in [1.0, 2.0, 3.0, 4.0]:
+            database.record("a.Test.test_a", "aer", None, duration)
+        with open(self.path, "a", encoding="utf8") as fd:
+            fd.write("{broken\n")
+        database.compact()
+        with open(self.path, encoding="utf8") as fd:
+            self.assertEqual(2, len(fd.readlines()))
+        self.assertEqual({"a.Test.test_a": 3.5}, database.get_times("aer"))
+
+
+class TestPartitionTests(unittest.TestCase):
+    def test_longest_processing_time_first(self):
+        times = {"t.a": 7.0, "t.b": 5.0, "t.c": 4.0, "t.d": 3.0, "t.e": 1.0}
+        partitions = scheduling.partition_tests(sorted(times), 2, times)
+        loads = sorted(sum(times[test_id] for test_id in partition) for partition in partitions)
+        self.assertEqual([10.0, 10.0], loads)
+
+    def test_unknown_tests_use_median(self):
+        times = {"t.a": 10.0, "t.b": 2.0, "t.c": 2.0}
+        partitions = scheduling.partition_tests(["t.a", "t.b", "t.c", "t.new[terra]"], 2, times)
+        self.assertEqual([["t.a"], ["t.b", "t.c", "t.new[terra]"]], partitions)
+
+    def test_group_regex(self):
+        test_ids = ["m.A.test_1", "m.A.test_2", "m.B.test_1"]
+        times = {"m.A.test_1": 1.0, "m.A.test_2": 1.0, "m.B.test_1": 5.0}
+        partitions = scheduling.partition_tests(test_ids, 3, times, r"^[^.]+\.[^.]+")
+        self.assertEqual([["m.B.test_1"], ["m.A.test_1", "m.A.test_2"]], partitions)
+
+    def test_worker_file(self):
+        test_ids = ["m.A.test_1[terra]", "m.A.test_10[aer]", "m.B.test_1"]
+        partitions = [["m.A.test_1[terra]"], ["m.A.test_10[aer]", "m.B.test_1"]]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "workers.yaml")
+            scheduling.write_worker_file(path, partitions)
+            with open(path, encoding="utf8") as fd:
+                workers = yaml.safe_load(fd)
+        selected = [selection.filter_tests(worker["worker"], test_ids) for worker in workers]
+        self.assertEqual(partitions, selected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+# pylint: disable=missing-class-docstring,missing-function-docstring
+
+"""Test splitting the CPUs between test workers."""
+
+import os
+import unittest
+from unittest import mock
+
+from qiskit_aer import AerSimulator
+
+from qiskit_neko import aer_plugin
+from qiskit_neko import replay_plugin
+from qiskit_neko import thread_budget
+
+
+class TestWorkerThreads(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(os.environ)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        os.environ.pop(thread_budget.WORKERS_ENV, None)
+        os.environ.pop(thread_budget.THREADS_ENV, None)
+        patcher = mock.patch.object(thread_budget, "available_cpus", return_value=16)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_unknown_workers(self):
+        self.assertIsNone(thread_budget.worker_threads())
+        self.assertIsNone(thread_budget.worker_threads(workers=1))
+
+    def test_split_between_workers(self):
+        self.assertEqual(4, thread_budget.worker_threads(workers=4))
+        self.assertEqual(3, thread_budget.worker_threads(workers=5))
+        self.assertEqual(1, thread_budget.worker_threads(workers=64))
+
+    def test_environment(self):
+        os.environ[thread_budget.WORKERS_ENV] = "8"
+        self.assertEqual(2, thread_budget.worker_threads())
+        self.assertEqual(4, thread_budget.worker_threads(workers=4))
+        os.environ[thread_budget.THREADS_ENV] = "3"
+        self.assertEqual(3, thread_budget.worker_threads())
+        self.assertEqual(5, thread_budget.worker_threads(threads=5))
+
+    def test_invalid_environment(self):
+        os.environ[thread_budget.WORKERS_ENV] = "many"
+        with self.assertLogs("qiskit_neko.thread_budget", "WARNING"):
+            self.assertIsNone(thread_budget.worker_threads())
+
+
+class TestApplyToBackend(unittest.TestCase):
+    def test_available_cpus(self):
+        self.assertGreaterEqual(thread_budget.available_cpus(), 1)
+
+    def test_aer(self):
+        backend = AerSimulator()
+        self.assertTrue(thread_budget.apply_to_backend(backend, 2))
+        for option in thread_budget.AER_PARALLEL_OPTIONS:
+            self.assertEqual(2, getattr(backend.options, option))
+
+    def test_no_budget(self):
+        backend = AerSimulator()
+        self.assertFalse(thread_budget.apply_to_backend(backend, None))
+        self.assertEqual(0, backend.options.max_parallel_threads or 0)
+
+    def test_other_backend(self):
+        self.assertFalse(thread_budget.apply_to_backend(object(), 2))
+
+    def test_aer_plugin(self):
+        with mock.patch.dict(os.environ, {thread_budget.THREADS_ENV: "2"}):
+            backend = aer_plugin.AerBackendPlugin().get_backend("method=statevector")
+        self.assertEqual(2, backend.options.max_parallel_threads)
+        self.assertEqual("statevector", backend.options.method)
+
+    def test_replay_key_ignores_parallelism(self):
+        self.assertEqual(
+            replay_plugin.job_key("aer", [], {"shots": 10}),
+            replay_plugin.job_key("aer", [], {"shots": 10, "max_parallel_threads": 4}),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+# pylint: disable=missing-class-docstring,missing-function-docstring
+
+"""Test the transpile cache."""
+
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+
+from qiskit import QuantumCircuit
+from qiskit.circuit import Parameter
+from qiskit_aer import AerSimulator
+
+from qiskit_neko import transpile_cache
+
+
+def ghz_circuit():
+    circuit = QuantumCircuit(3)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.cx(0, 2)
+    circuit.measure_all()
+    return circuit
+
+
+class TestTranspileCache(unittest.TestCase):
+    def setUp(self):
+        self.backend = AerSimulator()
+
+    def test_circuit_fingerprint_ignores_name(self):
+        first = ghz_circuit()
+        second = ghz_circuit()
+        self.assertNotEqual(first.name, second.name)
+        self.assertEqual(
+            transpile_cache.circuit_fingerprint(first),
+            transpile_cache.circuit_fingerprint(second),
+        )
+        second.x(0)
+        self.assertNotEqual(
+            transpile_cache.circuit_fingerprint(first),
+            transpile_cache.circuit_fingerprint(second),
+        )
+
+    def test_circuit_fingerprint_custom_instructions(self):
+        def circuit_with_custom(angle):
+            inner = QuantumCircuit(1)
+            inner.rx(angle, 0)
+            circuit = QuantumCircuit(2)
+            circuit.append(inner.to_instruction(), [1])
+            circuit.measure_all()
+            return circuit
+
+        self.assertEqual(
+            transpile_cache.circuit_fingerprint(circuit_with_custom(0.5)),
+            transpile_cache.circuit_fingerprint(circuit_with_custom(0.5)),
+        )
+        self.assertNotEqual(
+            transpile_cache.circuit_fingerprint(circuit_with_custom(0.5)),
+            transpile_cache.circuit_fingerprint(circuit_with_custom(0.25)),
+        )
+
+    def test_cache_hit(self):
+        cache = transpile_cache.TranspileCache()
+        first_circuit = ghz_circuit()
+        second_circuit = ghz_circuit()
+        first = cache.transpile(first_circuit, self.backend, seed_transpiler=42)
+        second = cache.transpile(second_circuit, self.backend, seed_transpiler=42)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+        self.assertIsNot(first, second)
+        self.assertEqual(first, second)
+        self.assertEqual(second.name, second_circuit.name)
+
+    def test_parameters_of_input_used(self):
+        def parameterized():
+            theta = Parameter("t")
+            circuit = QuantumCircuit(1)
+            circuit.rx(theta, 0)
+            circuit.rz(2 * theta, 0)
+            circuit.measure_all()
+            return circuit, theta
+
+        def check(cache):
+            circuit, theta = parameterized()
+            output = cache.transpile(circuit, self.backend, seed_transpiler=42)
+            self.assertEqual(1, cache.hits)
+            self.assertEqual([theta], list(output.parameters))
+            self.assertEqual(0, len(output.assign_parameters({theta: 0.5}).parameters))
+
+        cache = transpile_cache.TranspileCache()
+        cache.transpile(parameterized()[0], self.backend, seed_transpiler=42)
+        check(cache)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            transpile_cache.TranspileCache(cache_dir=cache_dir).transpile(
+                parameterized()[0], self.backend, seed_transpiler=42
+            )
+            check(transpile_cache.TranspileCache(cache_dir=cache_dir))
+
+    def test_cache_keyed_by_optimization_level(self):
+        cache = transpile_cache.TranspileCache()
+        cache.transpile(ghz_circuit(), self.backend, optimization_level=0, seed_transpiler=42)
+        cache.transpile(ghz_circuit(), self.backend, optimization_level=1, seed_transpiler=42)
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(cache.misses, 2)
+
+    def test_no_seed_bypasses_cache(self):
+        cache = transpile_cache.TranspileCache()
+        cache.transpile(ghz_circuit(), self.backend)
+        cache.transpile(ghz_circuit(), self.backend)
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(cache.misses, 0)
+
+    def test_lru_eviction(self):
+        cache = transpile_cache.TranspileCache(maxsize=1)
+        cache.transpile(ghz_circuit(), self.backend, optimization_level=0, seed_transpiler=42)
+        cache.transpile(ghz_circuit(), self.backend, optimization_level=1, seed_transpiler=42)
+        cache.transpile(ghz_circuit(), self.backend, optimization_level=0, seed_transpiler=42)
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(cache.misses, 3)
+
+    def test_list_of_circuits(self):
+        cache = transpile_cache.TranspileCache()
+        single = cache.transpile(ghz_circuit(), self.backend, seed_transpiler=42)
+        outputs = cache.transpile(
+            [ghz_circuit(), QuantumCircuit(1)], self.backend, seed_transpiler=42
+        )
+        self.assertEqual(len(outputs), 2)
+        self.assertEqual(outputs[0], single)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 2)
+
+    def test_disk_cache_shared(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first_cache = transpile_cache.TranspileCache(cache_dir=cache_dir)
+            first = first_cache.transpile(ghz_circuit(), self.backend, seed_transpiler=42)
+            second_cache = transpile_cache.TranspileCache(cache_dir=cache_dir)
+            second = second_cache.transpile(ghz_circuit(), self.backend, seed_transpiler=42)
+        self.assertEqual(second_cache.hits, 1)
+        self.assertEqual(first, second)
+
+    def test_circuit_fingerprint_stable_between_processes(self):
+        code = textwrap.dedent(
+            """
+            from qiskit import QuantumCircuit
+            from qiskit_neko import transpile_cache
+
+            inner = QuantumCircuit(2)
+            inner.h(0)
+            inner.cx(0, 1)
+            circuit = QuantumCircuit(3)
+            circuit.append(inner.to_gate(), [0, 2])
+            circuit.append(inner.to_instruction(), [1, 2])
+            circuit.measure_all()
+            print(transpile_cache.circuit_fingerprint(circuit))
+            """
+        )
+        fingerprints = []
+        for _ in range(2):
+            proc = subprocess.run(
+                [sys.executable, "-c", code], capture_output=True, text=True, check=False
+            )
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            fingerprints.append(proc.stdout.strip())
+        self.assertEqual(fingerprints[0], fingerprints[1])
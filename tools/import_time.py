@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2022.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Benchmark the import time of qiskit-neko modules.
+
+Each module is imported in a fresh interpreter using ``python -X importtime``
+several times and the fastest cumulative import time is reported. If a budget
+is specified the script exits non-zero when any module exceeds it.
+"""
+
+import argparse
+import subprocess
+import sys
+
+DEFAULT_MODULES = ["qiskit_neko", "qiskit_neko.tests.base"]
+
+
+def import_time(module):
+    """Return the cumulative import time of ``module`` in microseconds."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = [field.strip() for field in line[len("import time:") :].split("|")]
+        if fields[2] == module:
+            return int(fields[1])
+    raise ValueError(f"No import time found for {module}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="Number of runs per module")
+    parser.add_argument(
+        "-b", "--budget", type=float, default=None, help="Maximum import time in milliseconds"
+    )
+    args = parser.parse_args()
+    failed = False
+    for module in args.modules:
+        best = min(import_time(module) for _ in range(args.repeat)) / 1000
+        status = ""
+        if args.budget is not None and best > args.budget:
+            status = f" (exceeds budget of {args.budget} ms)"
+            failed = True
+        print(f"{module}: {best:.1f} ms{status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())